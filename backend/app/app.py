@@ -1,23 +1,139 @@
-import json
+from contextlib import asynccontextmanager
+from time import perf_counter
+from typing import Any, Callable, Literal, Optional
 
-from backend.app.dependencies import json_validator
-from fastapi import FastAPI, HTTPException
+from backend.app.batch import BatchFormatError, validate_batch
+from backend.app.dependencies import (document_parser, metrics, parallel_batch_validator, pattern_registry,
+                                      schema_cache, schema_registry, validation_executor)
+from backend.app.registry import RegistryFull, SchemaNotFound
+from backend.app.service import (BadRequest, InvalidRequest, compile_schema, json_response, register_schema,
+                                 run_measured, validate_body, validate_registered, validate_registered_source)
+from backend.app.validators.base import SchemaError
+from fastapi import FastAPI, Header, Query, Request, Response
+from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import BaseModel, Field
-from json_source_map import calculate
 
-app = FastAPI()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    parallel_batch_validator.shutdown()
+    validation_executor.shutdown()
 
-class JSONAndSchemaRequest(BaseModel):
-    json_data: str = Field(..., alias="json")
+
+app = FastAPI(lifespan=lifespan)
+
+
+@app.exception_handler(SchemaError)
+@app.exception_handler(BatchFormatError)
+@app.exception_handler(BadRequest)
+def bad_input_handler(request: Request, exc: ValueError):
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
+@app.exception_handler(InvalidRequest)
+def invalid_request_handler(request: Request, exc: InvalidRequest):
+    return JSONResponse(status_code=422, content={"detail": exc.errors})
+
+
+@app.exception_handler(SchemaNotFound)
+def schema_not_found_handler(request: Request, exc: SchemaNotFound):
+    return JSONResponse(status_code=404, content={"detail": f"Unknown schema id: {exc.args[0]}"})
+
+
+@app.exception_handler(RegistryFull)
+def registry_full_handler(request: Request, exc: RegistryFull):
+    return JSONResponse(status_code=507, content={"detail": str(exc)})
+
+
+async def execute_validation(size: int, endpoint: str, function: Callable[..., Any], *args) -> Any:
+    if not metrics.enabled or validation_executor.shares_state(size):
+        return await validation_executor.run(size, function, *args)
+    metrics.offloaded_requests.inc(1, endpoint)
+    result, recorded = await validation_executor.run(size, run_measured, function, *args)
+    metrics.merge(recorded)
+    return result
+
+
+class BatchRequest(BaseModel):
     schema_data: str = Field(..., alias="schema")
+    documents: str
+    format: Literal["ndjson", "json"] = "ndjson"
 
 @app.post("/validate")
-def validate(request: JSONAndSchemaRequest):
-    json_dict = json.loads(request.json_data)
-    schema_dict = json.loads(request.schema_data)
-    json_map = calculate(request.json_data)
-    return json_validator.validate(json_dict, schema_dict, "#", "", json_map)
+async def validate(request: Request, mode: Literal["full", "flag"] = "full",
+                   max_errors: Optional[int] = Query(None, ge=1), x_debug_trace: Optional[str] = Header(None),
+                   engine: Literal["recursive", "iterative"] = "recursive", schema_id: Optional[str] = None,
+                   profile: bool = False, memo: bool = False):
+    start = perf_counter() if metrics.enabled else None
+    body = await request.body()
+    if schema_id is not None and validation_executor.shares_state(len(body)):
+        result = await validation_executor.run(len(body), validate_registered, body, schema_id, mode, max_errors,
+                                               x_debug_trace, engine, profile, memo)
+    elif schema_id is not None:
+        result = await execute_validation(len(body), "validate", validate_registered_source, body,
+                                          schema_registry.source(schema_id), mode, max_errors, x_debug_trace, engine,
+                                          profile, memo)
+    else:
+        result = await execute_validation(len(body), "validate", validate_body, body, mode, max_errors,
+                                          x_debug_trace, engine, profile, memo)
+    response = json_response(result)
+    if start is not None:
+        metrics.document_bytes.observe(len(body), "validate")
+        metrics.request_seconds.observe(perf_counter() - start, "validate")
+    return response
+
+@app.post("/validate/batch")
+def validate_documents(request: BatchRequest, mode: Literal["full", "flag"] = "full",
+                       max_errors: Optional[int] = Query(None, ge=1)):
+    start = perf_counter() if metrics.enabled else None
+    compiled_schema = compile_schema(request.schema_data)
+    if parallel_batch_validator.should_handle(request.documents):
+        result = parallel_batch_validator.validate_batch(request.schema_data, request.documents, request.format,
+                                                         mode, max_errors)
+    else:
+        result = validate_batch(compiled_schema, request.documents, request.format, mode, max_errors,
+                                document_parser)
+    response = json_response(result)
+    if start is not None:
+        metrics.document_bytes.observe(len(request.documents), "validate_batch")
+        metrics.request_seconds.observe(perf_counter() - start, "validate_batch")
+    return response
+
+@app.post("/schemas", status_code=201)
+async def register(request: Request, response: Response):
+    body = await request.body()
+    schema_id, created = await validation_executor.run_local(len(body), register_schema, body)
+    if not created:
+        response.status_code = 200
+    return {"id": schema_id}
+
+@app.get("/schemas")
+def registered_schemas():
+    return schema_registry.stats()
+
+@app.get("/schemas/{schema_id}")
+def registered_schema(schema_id: str):
+    return schema_registry.describe(schema_id)
+
+@app.delete("/schemas/{schema_id}", status_code=204)
+def delete_schema(schema_id: str):
+    schema_registry.delete(schema_id)
+    return Response(status_code=204)
+
+@app.get("/schema-cache")
+def schema_cache_stats():
+    return schema_cache.stats()
+
+@app.get("/pattern-registry")
+def pattern_registry_stats():
+    return pattern_registry.stats()
+
+@app.get("/metrics")
+def metrics_text():
+    if not metrics.enabled:
+        return JSONResponse(status_code=404, content={"detail": "Metrics are disabled, set METRICS_ENABLED=1"})
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
 
 @app.get("/health")
 def health():
@@ -0,0 +1,137 @@
+import json
+import re
+from json.decoder import WHITESPACE
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from backend.app.parsing import DocumentParser
+from backend.app.validators.compiled import CompiledSchema
+
+_decoder = json.JSONDecoder()
+default_parser = DocumentParser()
+
+_STRING = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+_INSIDE = re.compile(r'(?:[^"\[\]{}]++|' + _STRING + r')*+')
+
+# A document's text and first line, plus its value when the splitter already decoded it.
+Piece = Union[Tuple[str, int], Tuple[str, int, Any]]
+
+
+def _container(depth: int) -> str:
+    inner = r'[^"\[\]{}]++|' + _STRING + ("|" + _container(depth - 1) if depth > 1 else "")
+    return r'[\[{](?:' + inner + r')*+[\]}]'
+
+
+# One array element, a string, a scalar or a container nested up to four levels, found without decoding it.
+_VALUE = re.compile(_STRING + "|" + _container(4) + r'|[^"\[\]{},\s]++')
+
+
+class BatchFormatError(ValueError):
+    pass
+
+
+def invalid_document(message: str, line: int, mode: str) -> Dict:
+    if mode == "flag":
+        return {"valid": False, "errors": []}
+    return {"valid": False, "errors": [{"message": message, "path": "", "line": line}]}
+
+
+def split_documents(documents: str, format: str, decode: bool = False) -> Iterator[Piece]:
+    if format == "ndjson":
+        for line_number, line in enumerate(documents.split("\n")):
+            if line.strip():
+                yield line, line_number
+    elif format == "json":
+        yield from _split_array(documents, decode)
+    else:
+        raise BatchFormatError(f"Unknown batch format: {format}")
+
+
+def _split_array(documents: str, decode: bool = False) -> Iterator[Piece]:
+    # With decode, elements come with their value so they are not parsed a second time,
+    # otherwise only their boundaries are scanned and no values are built.
+    position = WHITESPACE.match(documents, 0).end()
+    if not documents.startswith("[", position):
+        raise BatchFormatError("Documents must be a JSON array")
+    position = WHITESPACE.match(documents, position + 1).end()
+
+    line = 0
+    last_start = 0
+    closed = documents.startswith("]", position)
+    while not closed:
+        decoded: Tuple = ()
+        if decode:
+            try:
+                value, end = _decoder.raw_decode(documents, position)
+                decoded = (value,)
+            except ValueError:
+                pass
+        if not decoded:
+            # Invalid elements are still split off, and reported by their own parse like NDJSON lines.
+            end = _value_end(documents, position)
+            if end is None:
+                raise BatchFormatError(f"Documents are not valid JSON: expected a value at char {position}")
+
+        line += documents.count("\n", last_start, position)
+        last_start = position
+        yield (documents[position:end], line, *decoded)
+
+        position = WHITESPACE.match(documents, end).end()
+        if documents.startswith(",", position):
+            position = WHITESPACE.match(documents, position + 1).end()
+        elif documents.startswith("]", position):
+            closed = True
+        else:
+            raise BatchFormatError(f"Documents are not valid JSON: expected ',' or ']' at char {position}")
+
+    if WHITESPACE.match(documents, position + 1).end() != len(documents):
+        raise BatchFormatError(f"Documents are not valid JSON: extra data at char {position + 1}")
+
+
+def _value_end(documents: str, position: int) -> Optional[int]:
+    match = _VALUE.match(documents, position)
+    if match is not None:
+        return match.end()
+
+    # Containers nested deeper than _VALUE unrolls are matched by counting brackets.
+    end = position
+    depth = 0
+    while True:
+        char = documents[end:end + 1]
+        if char == "[" or char == "{":
+            depth += 1
+        elif (char == "]" or char == "}") and depth:
+            depth -= 1
+        else:
+            return None
+        end += 1
+        if not depth:
+            return end
+        end = _INSIDE.match(documents, end).end()
+
+
+def validate_documents(compiled_schema: CompiledSchema, pieces: Iterable[Piece], mode: str = "full",
+                       max_errors: Optional[int] = None, parser: Optional[DocumentParser] = None) -> List[Dict]:
+    parser = parser or default_parser
+    positions = mode != "flag"
+    results: List[Dict] = []
+    for text, first_line, *decoded in pieces:
+        if decoded:
+            document, json_map = decoded[0], parser.source_map(text, first_line, positions)
+        else:
+            try:
+                document, json_map = parser.parse(text, first_line, positions)
+            except ValueError as e:
+                results.append(invalid_document(f"Invalid JSON: {e}", first_line, mode))
+                continue
+        results.append(compiled_schema.validate(document, json_map, mode=mode, max_errors=max_errors))
+    return results
+
+
+def batch_result(results: List[Dict]) -> Dict:
+    return {"valid": all(result["valid"] for result in results), "results": results}
+
+
+def validate_batch(compiled_schema: CompiledSchema, documents: str, format: str = "ndjson", mode: str = "full",
+                   max_errors: Optional[int] = None, parser: Optional[DocumentParser] = None) -> Dict:
+    return batch_result(validate_documents(compiled_schema, split_documents(documents, format, decode=True), mode,
+                                           max_errors, parser))
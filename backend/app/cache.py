@@ -0,0 +1,59 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict
+
+from backend.app.validators.compiled import CompiledSchema
+
+
+class SchemaCache:
+    def __init__(self, json_validator, max_size: int = 256):
+        self.json_validator = json_validator
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, CompiledSchema]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(schema_text: str) -> str:
+        return hashlib.sha256(schema_text.encode("utf-8")).hexdigest()
+
+    def get(self, schema_text: str) -> CompiledSchema:
+        key = self.key(schema_text)
+
+        with self._lock:
+            compiled = self._entries.get(key)
+            if compiled is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return compiled
+            self.misses += 1
+
+        compiled = self.json_validator.compile(json.loads(schema_text))
+
+        with self._lock:
+            if self.max_size > 0:
+                self._entries[key] = compiled
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+
+        return compiled
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
@@ -1,21 +1,30 @@
 import logging
+import os
 
+from backend.app.cache import SchemaCache
+from backend.app.executor import ValidationExecutor
+from backend.app.metrics import ServiceMetrics, cache_collector
+from backend.app.parallel import ParallelBatchValidator
+from backend.app.parsing import DocumentParser
+from backend.app.registry import SchemaRegistry
 from backend.app.validators.arrays import ArrayValidator
 from backend.app.validators.logic import LogicValidator
 from backend.app.validators.main import JSONValidator
 from backend.app.validators.numbers import NumberValidator
 from backend.app.validators.objects import ObjectValidator
+from backend.app.validators.patterns import PatternRegistry
 from backend.app.validators.strings import StringValidator
 from backend.app.validators.types import TypeValidator
 
-logging.basicConfig(level=logging.DEBUG)
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
 
 json_validator = JSONValidator(None, None, None, None, None, None)
+pattern_registry = PatternRegistry(int(os.getenv("PATTERN_CACHE_SIZE", "1024")))
 
 type_validator = TypeValidator()
 object_validator = ObjectValidator(json_validator)
 array_validator = ArrayValidator(json_validator)
-string_validator = StringValidator()
+string_validator = StringValidator(pattern_registry)
 number_validator = NumberValidator()
 logic_validator = LogicValidator(json_validator)
 
@@ -26,3 +35,17 @@ json_validator.string_validator = string_validator
 json_validator.number_validator = number_validator
 json_validator.logic_validator = logic_validator
 
+schema_cache = SchemaCache(json_validator, int(os.getenv("SCHEMA_CACHE_SIZE", "256")))
+document_parser = DocumentParser(os.getenv("JSON_BACKEND", "auto"))
+schema_registry = SchemaRegistry(json_validator, int(os.getenv("SCHEMA_REGISTRY_SIZE", "100")))
+parallel_batch_validator = ParallelBatchValidator(int(os.getenv("BATCH_WORKERS", "0")),
+                                                  int(os.getenv("BATCH_CHUNK_SIZE", "1000")),
+                                                  int(os.getenv("BATCH_PARALLEL_MIN_SIZE", "1000000")))
+validation_executor = ValidationExecutor(os.getenv("VALIDATION_EXECUTOR", "thread"),
+                                         int(os.getenv("VALIDATION_WORKERS", "4")),
+                                         int(os.getenv("VALIDATION_INLINE_LIMIT", "65536")))
+validation_memo_size = int(os.getenv("VALIDATION_MEMO_SIZE", "4096"))
+metrics = ServiceMetrics(os.getenv("METRICS_ENABLED", "0") == "1", int(os.getenv("METRICS_KEYWORD_SAMPLE", "100")))
+metrics.add_collector(cache_collector("schema_cache", schema_cache))
+metrics.add_collector(cache_collector("pattern_registry", pattern_registry))
+metrics.add_collector(cache_collector("schema_registry", schema_registry))
@@ -0,0 +1,47 @@
+import asyncio
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+KINDS = ("thread", "process")
+
+
+class ValidationExecutor:
+    def __init__(self, kind: str = "thread", workers: int = 4, inline_limit: int = 64 * 1024):
+        if kind not in KINDS:
+            raise ValueError(f"Unknown executor kind: {kind}")
+        self.kind = kind
+        self.workers = workers
+        self.inline_limit = inline_limit
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    def executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.kind == "process":
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="validation")
+            return self._executor
+
+    def shares_state(self, size: int) -> bool:
+        return self.kind == "thread" or size < self.inline_limit
+
+    async def run(self, size: int, function: Callable[..., Any], *args) -> Any:
+        if size < self.inline_limit:
+            return function(*args)
+        return await asyncio.get_running_loop().run_in_executor(self.executor(), partial(function, *args))
+
+    async def run_local(self, size: int, function: Callable[..., Any], *args) -> Any:
+        # For work that must update state in this process, such as the schema registry.
+        if self.shares_state(size):
+            return await self.run(size, function, *args)
+        return await asyncio.to_thread(function, *args)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
@@ -0,0 +1,215 @@
+import bisect
+import threading
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from backend.app.tracing import Tracer, pop_started
+from backend.app.validators.paths import InstancePath
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216, 67108864)
+
+Labels = Tuple[str, ...]
+
+
+def format_labels(names: Tuple[str, ...], values: Labels, extra: str = "") -> str:
+    pairs = [f'{name}="{escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def drain(self) -> Dict[Labels, float]:
+        with self._lock:
+            values, self._values = self._values, {}
+        return values
+
+    def merge(self, values: Dict[Labels, float]) -> None:
+        for labels, value in values.items():
+            self.inc(value, *labels)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{format_labels(self.labels, labels)} {format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets: Tuple[float, ...], labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.buckets = buckets
+        self.labels = labels
+        # Per label set: a count per bucket (the last one is +Inf), the sum and the total count.
+        self._values: Dict[Labels, Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+            entry[0][index] += 1
+            entry[1][0] += value
+
+    def drain(self) -> Dict[Labels, Tuple[List[int], List[float]]]:
+        with self._lock:
+            values, self._values = self._values, {}
+        return values
+
+    def merge(self, values: Dict[Labels, Tuple[List[int], List[float]]]) -> None:
+        with self._lock:
+            for labels, (counts, total) in values.items():
+                entry = self._values.get(labels)
+                if entry is None:
+                    entry = self._values[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+                for index, count in enumerate(counts):
+                    entry[0][index] += count
+                entry[1][0] += total[0]
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, (counts, total) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip((*self.buckets, "+Inf"), counts):
+                    cumulative += count
+                    le = f'le="{bound}"'
+                    lines.append(f"{self.name}_bucket{format_labels(self.labels, labels, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{format_labels(self.labels, labels)} {format_value(total[0])}")
+                lines.append(f"{self.name}_count{format_labels(self.labels, labels)} {cumulative}")
+        return lines
+
+
+class MetricsTracer(Tracer):
+    def __init__(self):
+        self.counts: Dict[str, int] = {}
+        self.seconds: Dict[str, float] = {}
+        self._starts: List = []
+
+    def keyword_start(self, keyword: str, path: str, path_json: InstancePath) -> None:
+        self._starts.append(((keyword, path, id(path_json)), perf_counter()))
+
+    def keyword_end(self, keyword: str, path: str, path_json: InstancePath, valid: bool) -> None:
+        entry = pop_started(self._starts, (keyword, path, id(path_json)))
+        if entry is None:
+            return
+        elapsed = perf_counter() - entry[1]
+        self.counts[keyword] = self.counts.get(keyword, 0) + 1
+        self.seconds[keyword] = self.seconds.get(keyword, 0.0) + elapsed
+
+
+# A collector returns (name, type, help, [(labels, value)]) for values owned by other components, read at scrape time.
+Collector = Callable[[], Iterable[Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]]]
+
+
+GAUGE_STATS = ("size", "max_size")
+
+
+def cache_collector(name: str, component) -> Collector:
+    def collect():
+        stats = component.stats()
+        for key, value in stats.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            if key in GAUGE_STATS:
+                yield f"jsonschema_{name}_{key}", "gauge", f"{name} {key}.", [({}, value)]
+            else:
+                yield f"jsonschema_{name}_{key}_total", "counter", f"{name} {key}.", [({}, value)]
+        # The pattern registry counts compiles rather than misses, a compile is exactly a miss there.
+        misses = stats.get("misses", stats.get("compiles"))
+        if "hits" in stats and misses is not None:
+            lookups = stats["hits"] + misses
+            yield (f"jsonschema_{name}_hit_ratio", "gauge", f"{name} hit ratio since start.",
+                   [({}, stats["hits"] / lookups if lookups else 0.0)])
+    return collect
+
+
+class ServiceMetrics:
+    def __init__(self, enabled: bool = False, keyword_sample: int = 100):
+        self.enabled = enabled
+        self.keyword_sample = keyword_sample
+        self._requests = 0
+        self._lock = threading.Lock()
+        self._collectors: List[Collector] = []
+
+        self.request_seconds = Histogram("jsonschema_request_seconds", "Request latency by endpoint.",
+                                         LATENCY_BUCKETS, ("endpoint",))
+        self.stage_seconds = Histogram("jsonschema_stage_seconds",
+                                       "Time spent per request stage (parse, source_map, validation, serialization).",
+                                       LATENCY_BUCKETS, ("stage",))
+        self.document_bytes = Histogram("jsonschema_document_bytes", "Size of validated request bodies.",
+                                        SIZE_BUCKETS, ("endpoint",))
+        self.validations = Counter("jsonschema_validations_total", "Validated documents by result.", ("valid",))
+        self.offloaded_requests = Counter("jsonschema_offloaded_requests_total",
+                                          "Requests validated in a worker process, their stages are recorded there "
+                                          "and merged back.", ("endpoint",))
+        self.keyword_evaluations = Counter("jsonschema_keyword_evaluations_total",
+                                           "Keyword evaluations in sampled requests.", ("keyword",))
+        self.keyword_seconds = Counter("jsonschema_keyword_seconds_total",
+                                       "Inclusive keyword evaluation time in sampled requests.", ("keyword",))
+
+    def add_collector(self, collector: Collector) -> None:
+        self._collectors.append(collector)
+
+    def keyword_tracer(self) -> Optional[MetricsTracer]:
+        if not self.enabled or self.keyword_sample < 1:
+            return None
+        with self._lock:
+            self._requests += 1
+            if self._requests % self.keyword_sample:
+                return None
+        return MetricsTracer()
+
+    def record_keywords(self, tracer: MetricsTracer) -> None:
+        for keyword, count in tracer.counts.items():
+            self.keyword_evaluations.inc(count, keyword)
+            self.keyword_seconds.inc(tracer.seconds[keyword], keyword)
+
+    def metrics(self) -> Tuple:
+        return (self.request_seconds, self.stage_seconds, self.document_bytes, self.validations,
+                self.offloaded_requests, self.keyword_evaluations, self.keyword_seconds)
+
+    def drain(self) -> Dict[str, Dict]:
+        # Worker processes are never scraped, they hand what they recorded to the server process to merge.
+        return {metric.name: metric.drain() for metric in self.metrics()}
+
+    def merge(self, recorded: Dict[str, Dict]) -> None:
+        for metric in self.metrics():
+            metric.merge(recorded.get(metric.name, {}))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self.metrics():
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            for name, kind, help, samples in collector():
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    label_names = tuple(labels)
+                    lines.append(f"{name}{format_labels(label_names, tuple(labels.values()))} {format_value(value)}")
+        return "\n".join(lines) + "\n"
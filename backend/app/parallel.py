@@ -0,0 +1,52 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, List, Optional, Tuple
+
+from backend.app.batch import BatchFormatError, batch_result, split_documents, validate_documents
+
+
+def _validate_chunk(schema_text: str, pieces: List[Tuple[str, int]], mode: str, max_errors: Optional[int]) -> List[Dict]:
+    # Runs in a worker process, which compiles each schema once into its own cache.
+    from backend.app.dependencies import document_parser, schema_cache
+    return validate_documents(schema_cache.get(schema_text), pieces, mode, max_errors, document_parser)
+
+
+class ParallelBatchValidator:
+    def __init__(self, workers: int, chunk_size: int = 1000, min_size: int = 1_000_000):
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.min_size = min_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def should_handle(self, documents: str) -> bool:
+        return self.workers > 0 and len(documents) >= self.min_size
+
+    def executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def validate_batch(self, schema_text: str, documents: str, format: str = "ndjson", mode: str = "full",
+                       max_errors: Optional[int] = None) -> Dict:
+        # Documents are only scanned for their boundaries here, parsing happens in the workers,
+        # and each chunk is submitted as soon as it is split so workers start before the scan ends.
+        pieces = split_documents(documents, format)
+        executor = self.executor()
+        futures = []
+        try:
+            for chunk in iter(lambda: list(islice(pieces, self.chunk_size)), []):
+                futures.append(executor.submit(_validate_chunk, schema_text, chunk, mode, max_errors))
+        except BatchFormatError:
+            for future in futures:
+                future.cancel()
+            raise
+        return batch_result([result for future in futures for result in future.result()])
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
@@ -0,0 +1,42 @@
+import json
+from typing import Any, Callable, Dict, Tuple, Union
+
+from backend.app.source_map import LazySourceMap
+from backend.app.validators.context import NoSourceMap
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _loads_orjson(text: Union[str, bytes]) -> Any:
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        # orjson is stricter than the standard library (NaN, Infinity, integers above 64 bits),
+        # so rejected documents go through json.loads to keep the same accepted input and error messages.
+        return json.loads(text)
+
+
+BACKENDS: Dict[str, Callable[[Union[str, bytes]], Any]] = {"json": json.loads}
+if orjson is not None:
+    BACKENDS["orjson"] = _loads_orjson
+
+
+class DocumentParser:
+    def __init__(self, backend: str = "auto"):
+        if backend == "auto":
+            backend = "orjson" if "orjson" in BACKENDS else "json"
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown JSON backend: {backend}, available: {', '.join(BACKENDS)}")
+        self.backend = backend
+        self._loads = BACKENDS[backend]
+
+    def parse(self, text: str, first_line: int = 0, positions: bool = True) -> Tuple[Any, Any]:
+        return self._loads(text), self.source_map(text, first_line, positions)
+
+    @staticmethod
+    def source_map(text: str, first_line: int = 0, positions: bool = True) -> Any:
+        # Positions are indexed lazily from the same text, only once an error needs its line.
+        return LazySourceMap(text, first_line) if positions else NoSourceMap()
@@ -0,0 +1,92 @@
+import hashlib
+import json
+import threading
+from typing import Dict, Tuple
+
+from backend.app.validators.base import SchemaError
+from backend.app.validators.compiled import CompiledSchema
+
+
+class SchemaNotFound(KeyError):
+    pass
+
+
+class RegistryFull(ValueError):
+    pass
+
+
+class SchemaRegistry:
+    def __init__(self, json_validator, max_size: int = 100):
+        self.json_validator = json_validator
+        self.max_size = max_size
+        self._entries: Dict[str, Tuple[str, CompiledSchema]] = {}
+        self._uses: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def schema_id(schema: Dict) -> str:
+        # Hashing the canonical form gives the same ID regardless of key order and whitespace.
+        canonical = json.dumps(schema, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def register(self, schema_text: str) -> Tuple[str, bool]:
+        schema = json.loads(schema_text)
+        if not isinstance(schema, dict):
+            raise SchemaError("Schema must be a JSON object")
+        schema_id = self.schema_id(schema)
+
+        with self._lock:
+            if self._is_registered(schema_id):
+                return schema_id, False
+
+        compiled = self.json_validator.compile(schema)
+
+        with self._lock:
+            if self._is_registered(schema_id):
+                return schema_id, False
+            self._entries[schema_id] = (schema_text, compiled)
+            self._uses[schema_id] = 0
+        return schema_id, True
+
+    def _is_registered(self, schema_id: str) -> bool:
+        if schema_id in self._entries:
+            return True
+        if len(self._entries) >= self.max_size:
+            raise RegistryFull(f"Schema registry is full ({self.max_size} schemas), delete unused schemas first")
+        return False
+
+    def get(self, schema_id: str) -> CompiledSchema:
+        return self._use(schema_id)[1]
+
+    def source(self, schema_id: str) -> str:
+        return self._use(schema_id)[0]
+
+    def _use(self, schema_id: str) -> Tuple[str, CompiledSchema]:
+        with self._lock:
+            entry = self._entries.get(schema_id)
+            if entry is None:
+                raise SchemaNotFound(schema_id)
+            self._uses[schema_id] += 1
+            return entry
+
+    def describe(self, schema_id: str) -> Dict:
+        with self._lock:
+            entry = self._entries.get(schema_id)
+            if entry is None:
+                raise SchemaNotFound(schema_id)
+            return {"id": schema_id, "schema": entry[0], "uses": self._uses[schema_id],
+                    "diagnostics": entry[1].diagnostics}
+
+    def delete(self, schema_id: str) -> None:
+        with self._lock:
+            if self._entries.pop(schema_id, None) is None:
+                raise SchemaNotFound(schema_id)
+            del self._uses[schema_id]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ids": list(self._entries)
+            }
@@ -0,0 +1,155 @@
+import json
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field, ValidationError
+
+from backend.app.dependencies import document_parser, metrics, schema_cache, schema_registry, validation_memo_size
+from backend.app.tracing import LoggingTracer, ProfilingTracer, RecordingTracer, TeeTracer
+from backend.app.validators.compiled import CompiledSchema
+
+
+class JSONAndSchemaRequest(BaseModel):
+    json_data: str = Field(..., alias="json")
+    schema_data: str = Field(..., alias="schema")
+
+
+class BadRequest(ValueError):
+    pass
+
+
+class InvalidRequest(ValueError):
+    def __init__(self, errors: List[Dict]):
+        super().__init__(errors)
+        self.errors = errors
+
+
+def validate_body(body: bytes, mode: str = "full", max_errors: Optional[int] = None,
+                  debug_trace: Optional[str] = None, engine: str = "recursive", profile: bool = False,
+                  memo: bool = False) -> Dict:
+    try:
+        request = JSONAndSchemaRequest.model_validate_json(body)
+    except ValidationError as e:
+        errors = e.errors(include_url=False, include_context=False, include_input=False)
+        raise InvalidRequest([{**error, "loc": ("body",) + tuple(error["loc"])} for error in errors]) from None
+    return validate_request(request.json_data, request.schema_data, mode, max_errors, debug_trace, engine, profile,
+                            memo)
+
+
+def validate_request(json_text: str, schema_text: str, mode: str = "full", max_errors: Optional[int] = None,
+                     debug_trace: Optional[str] = None, engine: str = "recursive", profile: bool = False,
+                     memo: bool = False) -> Dict:
+    json_dict, json_map = parse_document(json_text, mode)
+    compiled_schema = compile_schema(schema_text)
+    return validate_parsed(compiled_schema, json_dict, json_map, mode, max_errors, debug_trace, engine, profile,
+                           memo)
+
+
+def validate_registered(body: bytes, schema_id: str, mode: str = "full", max_errors: Optional[int] = None,
+                        debug_trace: Optional[str] = None, engine: str = "recursive", profile: bool = False,
+                        memo: bool = False) -> Dict:
+    compiled_schema = schema_registry.get(schema_id)
+    json_dict, json_map = parse_document(decode_body(body, "document"), mode)
+    return validate_parsed(compiled_schema, json_dict, json_map, mode, max_errors, debug_trace, engine, profile,
+                           memo)
+
+
+def validate_registered_source(body: bytes, schema_text: str, mode: str = "full", max_errors: Optional[int] = None,
+                               debug_trace: Optional[str] = None, engine: str = "recursive", profile: bool = False,
+                               memo: bool = False) -> Dict:
+    # Worker processes have their own registry, so they get the stored schema text and compile it through their cache.
+    return validate_request(decode_body(body, "document"), schema_text, mode, max_errors, debug_trace, engine,
+                            profile, memo)
+
+
+def compile_schema(schema_text: str) -> CompiledSchema:
+    try:
+        return schema_cache.get(schema_text)
+    except json.JSONDecodeError as e:
+        raise BadRequest(f"Invalid JSON schema: {e}") from None
+
+
+def register_schema(body: bytes) -> Tuple[str, bool]:
+    try:
+        return schema_registry.register(decode_body(body, "schema"))
+    except json.JSONDecodeError as e:
+        raise BadRequest(f"Invalid JSON schema: {e}") from None
+
+
+def decode_body(body: bytes, name: str) -> str:
+    try:
+        return body.decode("utf-8")
+    except UnicodeDecodeError as e:
+        raise BadRequest(f"Invalid JSON {name}: {e}") from None
+
+
+def parse_document(json_text: str, mode: str = "full") -> Tuple[Any, Any]:
+    start = perf_counter() if metrics.enabled else None
+    try:
+        parsed = document_parser.parse(json_text, positions=mode != "flag")
+    except ValueError as e:
+        raise BadRequest(f"Invalid JSON document: {e}") from None
+    if start is not None:
+        metrics.stage_seconds.observe(perf_counter() - start, "parse")
+    return parsed
+
+
+def validate_parsed(compiled_schema: CompiledSchema, json_dict: Any, json_map, mode: str = "full",
+                    max_errors: Optional[int] = None, debug_trace: Optional[str] = None,
+                    engine: str = "recursive", profile: bool = False, memo: bool = False) -> Dict:
+    tracer = None
+    if debug_trace == "log":
+        tracer = LoggingTracer()
+    elif debug_trace:
+        tracer = RecordingTracer()
+    if profile:
+        profiler = ProfilingTracer()
+        tracer = TeeTracer(tracer, profiler) if tracer is not None else profiler
+    memo_size = validation_memo_size if memo else None
+    if not metrics.enabled:
+        return run_validation(compiled_schema, json_dict, json_map, tracer, mode, max_errors, engine, memo_size)
+
+    # Keyword timings are only sampled, and never mixed into an explicitly requested trace.
+    keyword_tracer = metrics.keyword_tracer() if tracer is None else None
+    start = perf_counter()
+    result = run_validation(compiled_schema, json_dict, json_map, tracer or keyword_tracer, mode, max_errors, engine,
+                            memo_size)
+    elapsed = perf_counter() - start
+    source_map_seconds = getattr(json_map, "build_seconds", 0.0)
+    metrics.stage_seconds.observe(source_map_seconds, "source_map")
+    metrics.stage_seconds.observe(elapsed - source_map_seconds, "validation")
+    metrics.validations.inc(1, str(result["valid"]).lower())
+    if keyword_tracer is not None:
+        metrics.record_keywords(keyword_tracer)
+    return result
+
+
+def run_validation(compiled_schema: CompiledSchema, json_dict: Any, json_map, tracer, mode: str,
+                   max_errors: Optional[int], engine: str, memo_size: Optional[int] = None) -> Dict:
+    result = compiled_schema.validate(json_dict, json_map, tracer=tracer, mode=mode,
+                                      max_errors=max_errors, engine=engine, memo_size=memo_size)
+    for active in tracer.tracers if isinstance(tracer, TeeTracer) else (tracer,):
+        if isinstance(active, RecordingTracer):
+            result["trace"] = active.report()
+        elif isinstance(active, ProfilingTracer):
+            result["profile"] = active.report()
+    return result
+
+
+def run_measured(function: Callable[..., Any], *args) -> Tuple[Any, Dict]:
+    # Runs in a worker process, which is never scraped, so what it records goes back with the result.
+    # Anything recorded before, such as values a forked worker inherited from the server, is dropped first.
+    metrics.drain()
+    result = function(*args)
+    return result, metrics.drain()
+
+
+def json_response(result: Any, status_code: int = 200) -> Response:
+    if not metrics.enabled:
+        return JSONResponse(result, status_code=status_code)
+    start = perf_counter()
+    response = JSONResponse(result, status_code=status_code)
+    metrics.stage_seconds.observe(perf_counter() - start, "serialization")
+    return response
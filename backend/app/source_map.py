@@ -0,0 +1,117 @@
+import re
+from array import array
+from bisect import bisect_left
+from json.decoder import scanstring
+from time import perf_counter
+from typing import Dict, Optional, Union
+
+from backend.app.validators.paths import InstancePath, from_pointer, segments
+
+_STRING = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+_TOKEN = re.compile(
+    r'[\s,]*(?:'
+    r'(?:(' + _STRING + r')\s*:\s*)?'                 # 1: optional object key
+    r'(?:([\[{])|(' + _STRING + r'|[^\s,\]}:]+))'      # 2: container start, 3: scalar
+    r'|([\]}]))'                                       # 4: container end
+)
+_NEWLINE = re.compile("\n")
+
+
+class OffsetIndex:
+    __slots__ = ("text", "value_starts", "key_starts", "ends", "newlines", "_children")
+
+    def __init__(self, text: str, value_starts: array, key_starts: array, ends: array, newlines: array):
+        self.text = text
+        self.value_starts = value_starts
+        self.key_starts = key_starts
+        self.ends = ends
+        self.newlines = newlines
+        self._children: Dict[int, object] = {}
+
+    @classmethod
+    def build(cls, text: str) -> "OffsetIndex":
+        typecode = "i" if len(text) < 2 ** 31 else "q"
+        value_starts = array(typecode)
+        key_starts = array(typecode)
+        ends = array(typecode)
+        open_containers = []
+
+        for match in _TOKEN.finditer(text):
+            kind = match.lastindex
+            if kind == 4:
+                ends[open_containers.pop()] = len(value_starts)
+                continue
+
+            index = len(value_starts)
+            value_starts.append(match.start(kind))
+            key_starts.append(match.start(1))
+            ends.append(index + 1)
+            if kind == 2:
+                open_containers.append(index)
+
+        newlines = array(typecode, map(re.Match.start, _NEWLINE.finditer(text)))
+        return cls(text, value_starts, key_starts, ends, newlines)
+
+    def line_at(self, offset: int) -> int:
+        return bisect_left(self.newlines, offset)
+
+    def line(self, path_json: Union[str, InstancePath]) -> int:
+        index = self.find(from_pointer(path_json) if isinstance(path_json, str) else path_json)
+        if index is None:
+            raise KeyError(path_json)
+        key_start = self.key_starts[index]
+        return self.line_at(key_start if key_start >= 0 else self.value_starts[index])
+
+    def find(self, path: InstancePath) -> Optional[int]:
+        if not self.value_starts:
+            return None
+
+        index = 0
+        for segment in segments(path):
+            children = self._child_index(index)
+            if isinstance(children, dict):
+                index = children.get(segment)
+            elif isinstance(segment, int) or segment.isdigit():
+                index = children[int(segment)] if int(segment) < len(children) else None
+            else:
+                index = None
+            if index is None:
+                return None
+        return index
+
+    def _child_index(self, index: int):
+        children = self._children.get(index)
+        if children is None:
+            child_indexes = []
+            child = index + 1
+            while child < self.ends[index]:
+                child_indexes.append(child)
+                child = self.ends[child]
+
+            if self.text[self.value_starts[index]] == "{":
+                children = {scanstring(self.text, self.key_starts[child] + 1)[0]: child for child in child_indexes}
+            else:
+                children = array(self.value_starts.typecode, child_indexes)
+            self._children[index] = children
+        return children
+
+
+class LazySourceMap:
+    __slots__ = ("text", "first_line", "build_seconds", "_index")
+
+    def __init__(self, text: str, first_line: int = 0):
+        self.text = text
+        self.first_line = first_line
+        self.build_seconds = 0.0
+        self._index = None
+
+    @property
+    def computed(self) -> bool:
+        return self._index is not None
+
+    def line(self, path_json: Union[str, InstancePath]) -> int:
+        if self._index is None:
+            start = perf_counter()
+            self._index = OffsetIndex.build(self.text)
+            self.build_seconds = perf_counter() - start
+        return self._index.line(path_json) + self.first_line
@@ -0,0 +1,142 @@
+import heapq
+import logging
+from time import perf_counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from backend.app.validators.paths import InstancePath, to_pointer
+
+
+class Tracer:
+    def node_start(self, path: str, path_json: InstancePath) -> None:
+        pass
+
+    def node_end(self, path: str, path_json: InstancePath, valid: bool) -> None:
+        pass
+
+    def keyword_start(self, keyword: str, path: str, path_json: InstancePath) -> None:
+        pass
+
+    def keyword_end(self, keyword: str, path: str, path_json: InstancePath, valid: bool) -> None:
+        pass
+
+
+class RecordingTracer(Tracer):
+    def __init__(self, max_events: int = 10000):
+        self.max_events = max_events
+        self.events: List[Dict] = []
+        self.dropped = 0
+
+    def _record(self, event: Dict) -> None:
+        if len(self.events) < self.max_events:
+            self.events.append(event)
+        else:
+            self.dropped += 1
+
+    def node_end(self, path: str, path_json: InstancePath, valid: bool) -> None:
+        self._record({"event": "schema", "path": path, "path_json": to_pointer(path_json), "valid": valid})
+
+    def keyword_end(self, keyword: str, path: str, path_json: InstancePath, valid: bool) -> None:
+        self._record({"event": "keyword", "keyword": keyword, "path": path, "path_json": to_pointer(path_json),
+                      "valid": valid})
+
+    def report(self) -> Dict:
+        return {"events": self.events, "dropped": self.dropped}
+
+
+class LoggingTracer(Tracer):
+    def __init__(self, logger: logging.Logger = logging.getLogger(__name__)):
+        self.logger = logger
+
+    def node_start(self, path: str, path_json: InstancePath) -> None:
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Validating %s against %s", to_pointer(path_json) or "/", path)
+
+    def keyword_end(self, keyword: str, path: str, path_json: InstancePath, valid: bool) -> None:
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("%s %s at %s: %s", path, keyword, to_pointer(path_json) or "/",
+                              "valid" if valid else "invalid")
+
+
+def pop_started(stack: List, key: Tuple) -> Optional[List]:
+    # A branch that stopped early (max_errors inside anyOf/oneOf) leaves starts without ends, skip over them.
+    while stack:
+        entry = stack.pop()
+        if entry[0] == key:
+            return entry
+    return None
+
+
+class ProfilingTracer(Tracer):
+    def __init__(self, top: int = 10):
+        self.top = top
+        self.schemas: Dict[str, Dict] = {}
+        self.keywords: Dict[str, Dict] = {}
+        self._nodes: List = []
+        self._keywords: List = []
+        self._start = perf_counter()
+
+    def node_start(self, path: str, path_json: InstancePath) -> None:
+        # [key, start, time spent in nested subschemas]
+        self._nodes.append([(path, id(path_json)), perf_counter(), 0.0])
+
+    def node_end(self, path: str, path_json: InstancePath, valid: bool) -> None:
+        entry = pop_started(self._nodes, (path, id(path_json)))
+        if entry is None:
+            return
+        elapsed = perf_counter() - entry[1]
+        if self._nodes:
+            self._nodes[-1][2] += elapsed
+        stats = self._schema(path)
+        stats["calls"] += 1
+        stats["seconds"] += elapsed
+        stats["self_seconds"] += elapsed - entry[2]
+
+    def keyword_start(self, keyword: str, path: str, path_json: InstancePath) -> None:
+        self._keywords.append([(keyword, path, id(path_json)), perf_counter()])
+
+    def keyword_end(self, keyword: str, path: str, path_json: InstancePath, valid: bool) -> None:
+        entry = pop_started(self._keywords, (keyword, path, id(path_json)))
+        if entry is None:
+            return
+        elapsed = perf_counter() - entry[1]
+        for stats in (self._schema(path)["keywords"].setdefault(keyword, {"calls": 0, "seconds": 0.0}),
+                      self.keywords.setdefault(keyword, {"calls": 0, "seconds": 0.0})):
+            stats["calls"] += 1
+            stats["seconds"] += elapsed
+
+    def _schema(self, path: str) -> Dict:
+        stats = self.schemas.get(path)
+        if stats is None:
+            stats = self.schemas[path] = {"calls": 0, "seconds": 0.0, "self_seconds": 0.0, "keywords": {}}
+        return stats
+
+    def hottest(self) -> Sequence[Dict]:
+        # Ranked by self time, inclusive time would always put the root first.
+        paths = heapq.nlargest(self.top, self.schemas, key=lambda path: self.schemas[path]["self_seconds"])
+        return [{"path": path, "calls": self.schemas[path]["calls"], "seconds": self.schemas[path]["seconds"],
+                 "self_seconds": self.schemas[path]["self_seconds"]} for path in paths]
+
+    def report(self) -> Dict:
+        return {"total_seconds": perf_counter() - self._start, "hottest": self.hottest(), "schemas": self.schemas,
+                "keywords": self.keywords}
+
+
+class TeeTracer(Tracer):
+    def __init__(self, *tracers: Tracer):
+        self.tracers = tracers
+
+    def node_start(self, path: str, path_json: InstancePath) -> None:
+        for tracer in self.tracers:
+            tracer.node_start(path, path_json)
+
+    def node_end(self, path: str, path_json: InstancePath, valid: bool) -> None:
+        for tracer in self.tracers:
+            tracer.node_end(path, path_json, valid)
+
+    def keyword_start(self, keyword: str, path: str, path_json: InstancePath) -> None:
+        for tracer in self.tracers:
+            tracer.keyword_start(keyword, path, path_json)
+
+    def keyword_end(self, keyword: str, path: str, path_json: InstancePath, valid: bool) -> None:
+        for tracer in self.tracers:
+            tracer.keyword_end(keyword, path, path_json, valid)
@@ -1,6 +1,11 @@
-from typing import TypedDict, Dict
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypedDict
 
 
 class Result(TypedDict):
     valid: bool
     errors: list[Dict]
+
+
+# A compiled keyword check appends ErrorRecords to the given list. Returning a truthy
+# value tells the compiled schema to skip the remaining checks of the same type.
+Check = Callable[[Any, Tuple, List[Any], Any], Optional[bool]]
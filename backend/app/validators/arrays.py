@@ -1,7 +1,7 @@
-import logging
-
-from backend.app.types import Result
+from backend.app.types import Check, Result
+from backend.app.validators.errors import ErrorRecord
 from backend.app.validators.types import Validator
+from backend.app.validators.vectorized import numeric_items_check
 from typing import Any, Dict, List
 
 
@@ -9,46 +9,58 @@ class ArrayValidator(Validator):
     def __init__(self, json_validator):
         self.json_validator = json_validator
 
-    def validate(self, data: Any, schema: Dict, path: str, path_json: str, json_map) -> Result:
-        logging.debug("Validating array")
-        logging.debug("Data:")
-        logging.debug(data)
-        logging.debug("Schema:")
-        logging.debug(schema)
-        logging.debug("Path json:")
-        logging.debug(path_json)
-        logging.debug("\n\n")
+    def compile_keywords(self, schema: Dict, path: str) -> Dict[str, Check]:
+        checks: Dict[str, Check] = {}
 
-        errors: List[Dict] = []
+        if "items" in schema:
+            item_schema = self.json_validator.compile(schema["items"], path+"/items")
+            evaluate_item = item_schema.evaluate
+            # Arrays of plain numbers are checked in one pass, any failure is reported per item as before.
+            all_numbers_valid = numeric_items_check(schema["items"])
 
-        if not isinstance(data, list):
-            errors.append({
-                "message": "Data is not an array",
-                "path": path,
-                "line": self.get_line(json_map, path_json)
-            })
-            return {"valid": False, "errors": errors}
+            def check_items(data, path_json, errors, ctx):
+                if all_numbers_valid is not None and ctx.tracer is None and all_numbers_valid(data):
+                    return
+                for index, item in enumerate(data):
+                    evaluate_item(item, (path_json, index), errors, ctx)
 
-        if "items" in schema:
-            item_schema = schema["items"]
+            def walk_items(data, path_json, errors, ctx):
+                if item_schema.leaf:
+                    check_items(data, path_json, errors, ctx)
+                    return
+                for index, item in enumerate(data):
+                    yield item_schema, item, (path_json, index), errors
+            check_items.walk = walk_items
+            checks["items"] = check_items
 
-            for index, item in enumerate(data):
-                result = self.json_validator.validate(data=item, schema=item_schema, path=path+"/items", path_json=path_json+f"/{index}", json_map=json_map)
-                if not result["valid"]:
-                    errors.extend(result["errors"])
+        if "minItems" in schema:
+            min_items = schema["minItems"]
 
-        if "minItems" in schema and len(data) < schema["minItems"]:
-            errors.append({
-                "message": f"Array length ({len(data)}) is smaller than minItems ({schema['minItems']})",
-                "path": path+"/minItems",
-                "line": self.get_line(json_map, path_json)
-            })
+            def check_min_items(data, path_json, errors, ctx):
+                if len(data) < min_items:
+                    errors.append(ErrorRecord(path+"/minItems", path_json,
+                                              "Array length ({}) is smaller than minItems ({})", (len(data), min_items)))
+            checks["minItems"] = check_min_items
+
+        if "maxItems" in schema:
+            max_items = schema["maxItems"]
+
+            def check_max_items(data, path_json, errors, ctx):
+                if len(data) > max_items:
+                    errors.append(ErrorRecord(path+"/maxItems", path_json,
+                                              "Array length ({}) is bigger than maxItems ({})", (len(data), max_items)))
+            checks["maxItems"] = check_max_items
 
-        if "maxItems" in schema and len(data) > schema["maxItems"]:
-            errors.append({
-                "message": f"Array length ({len(data)}) is bigger than maxItems ({schema['maxItems']})",
-                "path": path+"/maxItems",
+        return checks
+
+    def validate(self, data: Any, schema: Dict, path: str, path_json: str, json_map) -> Result:
+        if not isinstance(data, list):
+            errors: List[Dict] = [{
+                "message": "Data is not an array",
+                "path": path,
                 "line": self.get_line(json_map, path_json)
-            })
+            }]
+            return {"valid": False, "errors": errors}
 
-        return {"valid": not errors, "errors": errors}
\ No newline at end of file
+        checks = self.json_validator.compile_validator_keywords(self, schema, path)
+        return self.run_checks(checks, data, path_json, json_map)
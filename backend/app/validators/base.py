@@ -1,7 +1,13 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from typing import Any, Dict, List
 
-from backend.app.types import Result
+from backend.app.types import Check, Result
+from backend.app.validators.context import ValidationContext
+from backend.app.validators.errors import ErrorRecord, render_errors
+
+
+class SchemaError(ValueError):
+    pass
 
 
 class Validator(ABC):
@@ -10,7 +16,17 @@ class Validator(ABC):
     def validate(self, data: Any, schema: Dict, path: str, path_json: str, json_map) -> Result:
         pass
 
+    def compile_keywords(self, schema: Dict, path: str) -> Dict[str, Check]:
+        return {}
+
+    def run_checks(self, checks: Dict[str, Check], data: Any, path_json: str, json_map) -> Result:
+        errors: List[ErrorRecord] = []
+        ctx = ValidationContext(json_map)
+        for check in checks.values():
+            if check(data, path_json, errors, ctx):
+                break
+        return {"valid": not errors, "errors": render_errors(errors, lambda error_path: self.get_line(json_map, error_path))}
+
     @staticmethod
     def get_line(json_map, path_json):
-        location = json_map[path_json]
-        return location.key_start.line if location.key_start else location.value_start.line
\ No newline at end of file
+        return json_map.line(path_json)
@@ -0,0 +1,211 @@
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from backend.app.types import Check, Result
+from backend.app.validators.base import Validator
+from backend.app.validators.context import (LimitedErrors, NoSourceMap, StopValidation, ValidationContext,
+                                            ValidationMemo)
+from backend.app.validators.errors import ErrorRecord, render_errors
+from backend.app.validators.paths import InstancePath, from_pointer
+
+MODES = ("full", "flag")
+ENGINES = ("recursive", "iterative")
+
+# (keyword, check, walk): walk is set for keywords that apply subschemas and yields them instead of recursing.
+Step = Tuple[str, Check, Optional[Any]]
+
+
+class CompiledSchema:
+    __slots__ = ("schema", "path", "type_checks", "typed_checks", "logic_checks", "dispatcher", "typed_steps",
+                 "logic_steps", "leaf", "diagnostics")
+
+    def __init__(self, schema: Dict, path: str, dispatcher):
+        self.schema = schema
+        self.path = path
+        self.dispatcher = dispatcher
+        # Unsatisfiable parts found while compiling, set on the root schema.
+        self.diagnostics: List[Dict[str, str]] = []
+        self.build({}, {}, {})
+
+    def build(self, type_checks: Dict[str, Check], typed_checks: Dict[type, Dict[str, Check]],
+              logic_checks: Dict[str, Check]) -> None:
+        self.type_checks = type_checks
+        self.typed_checks = typed_checks
+        self.logic_checks = logic_checks
+        self.typed_steps = {data_type: self._steps(checks) for data_type, checks in typed_checks.items()}
+        self.logic_steps = self._steps(logic_checks)
+        self.leaf = not any(walk for steps in (*self.typed_steps.values(), self.logic_steps) for _, _, walk in steps)
+
+    @staticmethod
+    def _steps(checks: Dict[str, Check]) -> Tuple[Step, ...]:
+        return tuple((keyword, check, getattr(check, "walk", None)) for keyword, check in checks.items())
+
+    def validate(self, data: Any, json_map, path_json: str = "", tracer=None, mode: str = "full",
+                 max_errors: Optional[int] = None, engine: str = "recursive", memo_size: Optional[int] = None) -> Result:
+        if mode not in MODES:
+            raise ValueError(f"Unknown validation mode: {mode}")
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown validation engine: {engine}")
+        if max_errors is not None and max_errors < 1:
+            raise ValueError("max_errors must be at least 1")
+        if memo_size is not None and memo_size < 1:
+            raise ValueError("memo_size must be at least 1")
+        memo = ValidationMemo(memo_size) if memo_size is not None else None
+
+        if mode == "flag":
+            errors: List[ErrorRecord] = LimitedErrors(1)
+            ctx = ValidationContext(NoSourceMap(), tracer, branch_limit=1, memo=memo)
+        else:
+            errors = [] if max_errors is None else LimitedErrors(max_errors)
+            ctx = ValidationContext(json_map, tracer, memo=memo)
+
+        run = self.evaluate if engine == "recursive" else self.iterate
+        try:
+            run(data, from_pointer(path_json), errors, ctx)
+        except StopValidation as stop:
+            if stop.errors is not errors:
+                raise
+
+        if mode == "flag":
+            result = {"valid": not errors, "errors": []}
+        else:
+            result = {"valid": not errors,
+                      "errors": render_errors(errors[:max_errors],
+                                              lambda error_path: Validator.get_line(json_map, error_path))}
+        if memo is not None:
+            result["memo"] = memo.stats()
+        return result
+
+    def evaluate(self, data: Any, path_json: InstancePath, errors: List[ErrorRecord], ctx: ValidationContext) -> None:
+        if ctx.tracer is not None:
+            self._evaluate_traced(data, path_json, errors, ctx)
+            return
+
+        if self.type_checks:
+            mark = len(errors)
+            for check in self.type_checks.values():
+                check(data, path_json, errors, ctx)
+            if len(errors) > mark:
+                return
+
+        if self.typed_checks:
+            data_type = type(data)
+            checks = self.typed_checks.get(data_type)
+            if checks is None and data_type not in self.dispatcher:
+                checks = self.typed_checks.get(self.dispatcher.resolve_type(data_type))
+            if checks:
+                for check in checks.values():
+                    if check(data, path_json, errors, ctx):
+                        break
+
+        for check in self.logic_checks.values():
+            check(data, path_json, errors, ctx)
+
+    def _evaluate_traced(self, data: Any, path_json: InstancePath, errors: List[ErrorRecord], ctx: ValidationContext) -> None:
+        tracer = ctx.tracer
+        tracer.node_start(self.path, path_json)
+        start = len(errors)
+
+        for keyword, check in self.type_checks.items():
+            self._run_traced(keyword, check, data, path_json, errors, ctx)
+
+        if len(errors) == start:
+            data_type = type(data)
+            checks = self.typed_checks.get(data_type)
+            if checks is None and data_type not in self.dispatcher:
+                checks = self.typed_checks.get(self.dispatcher.resolve_type(data_type))
+            if checks:
+                for keyword, check in checks.items():
+                    if self._run_traced(keyword, check, data, path_json, errors, ctx):
+                        break
+
+            for keyword, check in self.logic_checks.items():
+                self._run_traced(keyword, check, data, path_json, errors, ctx)
+
+        tracer.node_end(self.path, path_json, len(errors) == start)
+
+    def _run_traced(self, keyword: str, check: Check, data: Any, path_json: InstancePath, errors: List[ErrorRecord], ctx: ValidationContext):
+        ctx.tracer.keyword_start(keyword, self.path, path_json)
+        mark = len(errors)
+        halt = check(data, path_json, errors, ctx)
+        ctx.tracer.keyword_end(keyword, self.path, path_json, len(errors) == mark)
+        return halt
+
+    def iterate(self, data: Any, path_json: InstancePath, errors: List[ErrorRecord], ctx: ValidationContext) -> None:
+        # Same results as evaluate, but subschemas are walked from an explicit stack instead of the Python call stack.
+        stack = [(self.walk(data, path_json, errors, ctx), errors)]
+        while stack:
+            try:
+                node, node_data, node_path, node_errors = next(stack[-1][0])
+                if node.leaf:
+                    node.evaluate(node_data, node_path, node_errors, ctx)
+                else:
+                    stack.append((node.walk(node_data, node_path, node_errors, ctx), node_errors))
+            except StopIteration:
+                stack.pop()
+            except StopValidation as stop:
+                while stack and stack[-1][1] is stop.errors:
+                    stack.pop()[0].close()
+                if not stack:
+                    raise
+
+    def walk(self, data: Any, path_json: InstancePath, errors: List[ErrorRecord], ctx: ValidationContext) -> Iterator:
+        if ctx.tracer is not None:
+            yield from self._walk_traced(data, path_json, errors, ctx)
+            return
+
+        if self.type_checks:
+            mark = len(errors)
+            for check in self.type_checks.values():
+                check(data, path_json, errors, ctx)
+            if len(errors) > mark:
+                return
+
+        if self.typed_steps:
+            for _, check, walk in self._typed_steps_for(data):
+                if walk is not None:
+                    yield from walk(data, path_json, errors, ctx)
+                elif check(data, path_json, errors, ctx):
+                    break
+
+        for _, check, walk in self.logic_steps:
+            if walk is not None:
+                yield from walk(data, path_json, errors, ctx)
+            else:
+                check(data, path_json, errors, ctx)
+
+    def _walk_traced(self, data: Any, path_json: InstancePath, errors: List[ErrorRecord], ctx: ValidationContext) -> Iterator:
+        tracer = ctx.tracer
+        tracer.node_start(self.path, path_json)
+        start = len(errors)
+
+        for keyword, check in self.type_checks.items():
+            self._run_traced(keyword, check, data, path_json, errors, ctx)
+
+        if len(errors) == start:
+            for keyword, check, walk in self._typed_steps_for(data):
+                if walk is not None:
+                    yield from self._walk_keyword_traced(keyword, walk, data, path_json, errors, ctx)
+                elif self._run_traced(keyword, check, data, path_json, errors, ctx):
+                    break
+
+            for keyword, check, walk in self.logic_steps:
+                if walk is not None:
+                    yield from self._walk_keyword_traced(keyword, walk, data, path_json, errors, ctx)
+                else:
+                    self._run_traced(keyword, check, data, path_json, errors, ctx)
+
+        tracer.node_end(self.path, path_json, len(errors) == start)
+
+    def _walk_keyword_traced(self, keyword: str, walk, data: Any, path_json: InstancePath, errors: List[ErrorRecord],
+                             ctx: ValidationContext) -> Iterator:
+        ctx.tracer.keyword_start(keyword, self.path, path_json)
+        mark = len(errors)
+        yield from walk(data, path_json, errors, ctx)
+        ctx.tracer.keyword_end(keyword, self.path, path_json, len(errors) == mark)
+
+    def _typed_steps_for(self, data: Any) -> Tuple[Step, ...]:
+        data_type = type(data)
+        steps = self.typed_steps.get(data_type)
+        if steps is None and data_type not in self.dispatcher:
+            steps = self.typed_steps.get(self.dispatcher.resolve_type(data_type))
+        return steps or ()
@@ -0,0 +1,74 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.app.validators.errors import ErrorRecord
+
+
+class StopValidation(Exception):
+    def __init__(self, errors: List[ErrorRecord]):
+        super().__init__()
+        self.errors = errors
+
+
+class LimitedErrors(list):
+    __slots__ = ("limit",)
+
+    def __init__(self, limit: int):
+        super().__init__()
+        self.limit = limit
+
+    def append(self, error: ErrorRecord) -> None:
+        super().append(error)
+        if len(self) >= self.limit:
+            raise StopValidation(self)
+
+    def extend(self, errors) -> None:
+        super().extend(errors)
+        if len(self) >= self.limit:
+            raise StopValidation(self)
+
+
+class NoSourceMap:
+    @staticmethod
+    def line(path_json: str) -> None:
+        return None
+
+
+class ValidationMemo:
+    __slots__ = ("max_size", "hits", "misses", "_entries")
+
+    def __init__(self, max_size: int = 4096):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        # The key is made of ids, so the entry keeps the node, data and path alive to stop the ids from being reused.
+        self._entries: Dict[Tuple[int, int, int], Tuple[Any, Any, Any, List[ErrorRecord]]] = {}
+
+    def get(self, node, data: Any, path_json) -> Optional[List[ErrorRecord]]:
+        entry = self._entries.get((id(node), id(data), id(path_json)))
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[3]
+
+    def put(self, node, data: Any, path_json, errors: List[ErrorRecord]) -> None:
+        if len(self._entries) >= self.max_size:
+            del self._entries[next(iter(self._entries))]
+        self._entries[(id(node), id(data), id(path_json))] = (node, data, path_json, errors)
+
+    def stats(self) -> Dict:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "max_size": self.max_size}
+
+
+class ValidationContext:
+    __slots__ = ("json_map", "tracer", "branch_limit", "memo")
+
+    def __init__(self, json_map, tracer=None, branch_limit: Optional[int] = None,
+                 memo: Optional[ValidationMemo] = None):
+        self.json_map = json_map
+        self.tracer = tracer
+        self.branch_limit = branch_limit
+        self.memo = memo
+
+    def new_errors(self) -> List[ErrorRecord]:
+        return [] if self.branch_limit is None else LimitedErrors(self.branch_limit)
@@ -1,18 +1,39 @@
-from typing import Any, Callable, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 from backend.app.validators.base import Validator
 
+ValidatorFactory = Union[Validator, Callable[[], Validator], None]
+
+
 class ValidatorDispatcher:
     def __init__(self):
-        self._strategies: List[Tuple[Callable[[Any], bool], Union[Validator, Callable[[], Validator]]]] = []
+        self._table: Dict[type, ValidatorFactory] = {}
+
+    def register(self, data_types: Tuple[type, ...], validator: ValidatorFactory):
+        for data_type in data_types:
+            self._table[data_type] = validator
+
+    def __contains__(self, data_type: type) -> bool:
+        return data_type in self._table
+
+    @property
+    def data_types(self) -> Tuple[type, ...]:
+        return tuple(self._table)
+
+    def resolve_type(self, data_type: type) -> Optional[type]:
+        # Exact types are looked up directly, subclasses (e.g. OrderedDict) fall back to their closest registered base.
+        for base in data_type.__mro__:
+            if base in self._table:
+                return base
+        return None
 
-    def register(self, condition: Callable[[Any], bool], validator: Union[Validator, Callable[[], Validator]]):
-        self._strategies.append((condition, validator))
+    def validator_for(self, data_type: Optional[type]) -> Optional[Validator]:
+        validator = self._table.get(data_type)
+        if validator is None or isinstance(validator, Validator):
+            return validator
+        return validator()
 
     def get_validator(self, data: Any) -> Optional[Validator]:
-        for condition, validator in self._strategies:
-            if condition(data):
-                if isinstance(validator, Validator):
-                    return validator
-                elif callable(validator):
-                    return validator()
-        return None
\ No newline at end of file
+        data_type = type(data)
+        if data_type not in self._table:
+            data_type = self.resolve_type(data_type)
+        return self.validator_for(data_type)
@@ -0,0 +1,44 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from backend.app.validators.paths import InstancePath
+
+MAX_VALUE_LENGTH = 100
+
+
+def truncate(value: Any, limit: int = MAX_VALUE_LENGTH) -> str:
+    text = str(value)
+    if len(text) > limit:
+        return f"{text[:limit]}... ({len(text)} characters)"
+    return text
+
+
+class ErrorRecord:
+    # Messages and lines are rendered only for errors that end up in the response.
+    __slots__ = ("path", "path_json", "template", "values", "details")
+
+    def __init__(self, path: str, path_json: InstancePath, template: str, values: Tuple = (),
+                 details: Optional[List["ErrorRecord"]] = None):
+        self.path = path
+        self.path_json = path_json
+        self.template = template
+        self.values = values
+        self.details = details
+
+    @property
+    def message(self) -> str:
+        if not self.values:
+            return self.template
+        return self.template.format(*map(truncate, self.values))
+
+    def render(self, get_line: Callable[[InstancePath], Optional[int]]) -> Dict:
+        error = {"message": self.message, "path": self.path, "line": get_line(self.path_json)}
+        if self.details is not None:
+            error["details"] = render_errors(self.details, get_line)
+        return error
+
+    def __repr__(self) -> str:
+        return f"ErrorRecord({self.path!r}, {self.message!r})"
+
+
+def render_errors(errors: List[ErrorRecord], get_line: Callable[[InstancePath], Optional[int]]) -> List[Dict]:
+    return [error.render(get_line) for error in errors]
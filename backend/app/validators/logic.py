@@ -1,139 +1,413 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Sequence, Tuple
 
-from backend.app.types import Result
+from backend.app.types import Check, Result
 from backend.app.validators.base import Validator
+from backend.app.validators.context import StopValidation, ValidationContext
+from backend.app.validators.errors import ErrorRecord
+from backend.app.validators.optimizer import (finite_only, flatten_all_of, is_trivial, is_unsatisfiable,
+                                              keywords)
+from backend.app.validators.paths import InstancePath
+from backend.app.validators.types import TypeValidator
 
 
 class LogicValidator(Validator):
     def __init__(self, json_validator):
         self.json_validator = json_validator
 
-    def validate(self, data: Any, schema: Dict, path: str, path_json: str, json_map) -> Result:
-        errors: List[Dict] = []
+    def compile_keywords(self, schema: Dict, path: str) -> Dict[str, Check]:
+        checks: Dict[str, Check] = {}
+
+        if "$ref" in schema:
+            ref_schema = self.json_validator.compile_ref(schema["$ref"], path + "/$ref")
+            evaluate_ref = ref_schema.evaluate
+
+            def check_ref(data, path_json, errors, ctx):
+                if ctx.memo is None:
+                    evaluate_ref(data, path_json, errors, ctx)
+                else:
+                    errors.extend(self.evaluate_branch(ref_schema, data, path_json, ctx))
+
+            def walk_ref(data, path_json, errors, ctx):
+                if ctx.memo is None:
+                    yield ref_schema, data, path_json, errors
+                else:
+                    errors.extend((yield from self.walk_branch(ref_schema, data, path_json, ctx)))
+            check_ref.walk = walk_ref
+            checks["$ref"] = check_ref
 
         if "allOf" in schema:
-            subschemas = schema["allOf"]
+            all_of_schemas = tuple(
+                self.json_validator.compile(subschema, path + f"/allOf/{index}")
+                for index, subschema in enumerate(schema["allOf"])
+            )
+            all_of = tuple(subschema.evaluate for subschema in all_of_schemas)
 
-            for index, subschema in enumerate(subschemas):
-                result = self.json_validator.validate(
-                    data=data,
-                    schema=subschema,
-                    path=path + f"/allOf/{index}",
-                    path_json=path_json,
-                    json_map=json_map
-                )
+            def check_all_of(data, path_json, errors, ctx):
+                for evaluate in all_of:
+                    evaluate(data, path_json, errors, ctx)
 
-                if not result["valid"]:
-                    errors.extend(result["errors"])
+            def walk_all_of(data, path_json, errors, ctx):
+                for subschema in all_of_schemas:
+                    yield subschema, data, path_json, errors
+            check_all_of.walk = walk_all_of
+            checks["allOf"] = check_all_of
 
         if "anyOf" in schema:
-            subschemas = schema["anyOf"]
-            any_valid = False
-            anyof_errors : List[Dict] = []
-
-            for index, subschema in enumerate(subschemas):
-                result = self.json_validator.validate(
-                    data=data,
-                    schema=subschema,
-                    path=path + f"/anyOf/{index}",
-                    path_json=path_json,
-                    json_map=json_map)
-
-                if result["valid"]:
-                    any_valid = True
-                    break
-                else:
-                    anyof_errors.extend(result["errors"])
+            any_of_schemas = tuple(
+                self.json_validator.compile(subschema, path + f"/anyOf/{index}")
+                for index, subschema in enumerate(schema["anyOf"])
+            )
+            any_of_discriminator = self.discriminator(schema["anyOf"])
+
+            def check_any_of(data, path_json, errors, ctx):
+                if any_of_discriminator is not None:
+                    branch = self.select_branch(any_of_discriminator, data)
+                    if branch is not None and not self.evaluate_branch(any_of_schemas[branch], data, path_json, ctx):
+                        return
 
-            if not any_valid:
-                errors.append({
-                    "message": "Data does not match anyOf schemas",
-                    "path": path + "/anyOf",
-                    "line": self.get_line(json_map, path_json),
-                    "details": anyof_errors
-                })
+                anyof_errors: List[ErrorRecord] = []
+                for subschema in any_of_schemas:
+                    branch_errors = self.evaluate_branch(subschema, data, path_json, ctx)
+                    if not branch_errors:
+                        return
+                    anyof_errors.extend(branch_errors)
+
+                errors.append(ErrorRecord(path + "/anyOf", path_json,
+                                          "Data does not match anyOf schemas", (), anyof_errors))
+
+            def walk_any_of(data, path_json, errors, ctx):
+                if any_of_discriminator is not None:
+                    branch = self.select_branch(any_of_discriminator, data)
+                    if branch is not None:
+                        branch_errors = yield from self.walk_branch(any_of_schemas[branch], data, path_json, ctx)
+                        if not branch_errors:
+                            return
+
+                anyof_errors: List[ErrorRecord] = []
+                for subschema in any_of_schemas:
+                    branch_errors = yield from self.walk_branch(subschema, data, path_json, ctx)
+                    if not branch_errors:
+                        return
+                    anyof_errors.extend(branch_errors)
+
+                errors.append(ErrorRecord(path + "/anyOf", path_json,
+                                          "Data does not match anyOf schemas", (), anyof_errors))
+            check_any_of.walk = walk_any_of
+            checks["anyOf"] = check_any_of
 
         if "oneOf" in schema:
-            subschemas = schema["oneOf"]
+            one_of_schemas = tuple(
+                self.json_validator.compile(subschema, path + f"/oneOf/{index}")
+                for index, subschema in enumerate(schema["oneOf"])
+            )
+            one_of_discriminator = self.discriminator(schema["oneOf"])
+
+            def check_one_of(data, path_json, errors, ctx):
+                if one_of_discriminator is not None:
+                    branch = self.select_branch(one_of_discriminator, data)
+                    if branch is not None and not self.evaluate_branch(one_of_schemas[branch], data, path_json, ctx):
+                        return
+
+                one_valid = False
+                oneof_errors: List[ErrorRecord] = []
+
+                for subschema in one_of_schemas:
+                    branch_errors = self.evaluate_branch(subschema, data, path_json, ctx)
+                    if not branch_errors:
+                        if one_valid:
+                            errors.append(ErrorRecord(path + "/oneOf", path_json,
+                                                      "Data matches more than one oneOf schema"))
+                            return
+                        one_valid = True
+                    else:
+                        oneof_errors.extend(branch_errors)
+
+                if not one_valid:
+                    errors.append(ErrorRecord(path + "/oneOf", path_json,
+                                              "Data does not match oneOf schemas", (), oneof_errors))
+
+            def walk_one_of(data, path_json, errors, ctx):
+                if one_of_discriminator is not None:
+                    branch = self.select_branch(one_of_discriminator, data)
+                    if branch is not None:
+                        branch_errors = yield from self.walk_branch(one_of_schemas[branch], data, path_json, ctx)
+                        if not branch_errors:
+                            return
+
+                one_valid = False
+                oneof_errors: List[ErrorRecord] = []
+
+                for subschema in one_of_schemas:
+                    branch_errors = yield from self.walk_branch(subschema, data, path_json, ctx)
+                    if not branch_errors:
+                        if one_valid:
+                            errors.append(ErrorRecord(path + "/oneOf", path_json,
+                                                      "Data matches more than one oneOf schema"))
+                            return
+                        one_valid = True
+                    else:
+                        oneof_errors.extend(branch_errors)
+
+                if not one_valid:
+                    errors.append(ErrorRecord(path + "/oneOf", path_json,
+                                              "Data does not match oneOf schemas", (), oneof_errors))
+            check_one_of.walk = walk_one_of
+            checks["oneOf"] = check_one_of
+
+        if "not" in schema:
+            not_schema = self.json_validator.compile(schema["not"], path + "/not")
+
+            def check_not(data, path_json, errors, ctx):
+                if not self.evaluate_branch(not_schema, data, path_json, ctx):
+                    errors.append(ErrorRecord(path + "/not", path_json, "Data matches not schema"))
+
+            def walk_not(data, path_json, errors, ctx):
+                if not (yield from self.walk_branch(not_schema, data, path_json, ctx)):
+                    errors.append(ErrorRecord(path + "/not", path_json, "Data matches not schema"))
+            check_not.walk = walk_not
+            checks["not"] = check_not
+
+        if "if" in schema:
+            if_schema = self.json_validator.compile(schema["if"], path + "/if")
+            then_schema = self.json_validator.compile(schema["then"], path + "/then") if schema.get("then") else None
+            else_schema = self.json_validator.compile(schema["else"], path + "/else") if schema.get("else") else None
+            evaluate_then = then_schema.evaluate if then_schema else None
+            evaluate_else = else_schema.evaluate if else_schema else None
+
+            def check_if(data, path_json, errors, ctx):
+                if_errors = self.evaluate_branch(if_schema, data, path_json, ctx)
+
+                if not if_errors and evaluate_then:
+                    evaluate_then(data, path_json, errors, ctx)
+                elif if_errors and evaluate_else:
+                    evaluate_else(data, path_json, errors, ctx)
+
+            def walk_if(data, path_json, errors, ctx):
+                if_errors = yield from self.walk_branch(if_schema, data, path_json, ctx)
+
+                if not if_errors and then_schema:
+                    yield then_schema, data, path_json, errors
+                elif if_errors and else_schema:
+                    yield else_schema, data, path_json, errors
+            check_if.walk = walk_if
+            checks["if"] = check_if
+
+        self.optimize(schema, path, checks)
+        return checks
+
+    def optimize(self, schema: Dict, path: str, checks: Dict[str, Check]) -> None:
+        # Replaces checks with cheaper equivalents, subschemas are compiled at their original paths so the errors
+        # are unchanged. Compiling them again returns the nodes built above.
+        compile = self.json_validator.compile
+
+        if "allOf" in checks:
+            flat = tuple(compile(subschema, subschema_path)
+                         for subschema, subschema_path in flatten_all_of(schema["allOf"], path))
+            if [node.path for node in flat] != [path + f"/allOf/{index}" for index in range(len(schema["allOf"]))]:
+                checks["allOf"] = finite_only(self.all_of_check(flat), checks["allOf"])
+
+        if "anyOf" in checks:
+            if any(map(is_trivial, schema["anyOf"])):
+                checks["anyOf"] = finite_only(self.valid_check(), checks["anyOf"])
+            elif self.discriminator(schema["anyOf"]) is None:
+                possible = self.possible_branches(schema["anyOf"], path + "/anyOf")
+                if possible:
+                    checks["anyOf"] = finite_only(self.any_of_check(possible, checks["anyOf"]), checks["anyOf"])
+
+        if "oneOf" in checks and self.discriminator(schema["oneOf"]) is None:
+            possible = self.possible_branches(schema["oneOf"], path + "/oneOf")
+            if possible:
+                checks["oneOf"] = finite_only(self.one_of_check(possible, path, checks["oneOf"]), checks["oneOf"])
+
+        if "not" in checks:
+            not_schema = schema["not"]
+            if is_trivial(not_schema):
+                checks["not"] = finite_only(self.invalid_check(path + "/not", "Data matches not schema"), checks["not"])
+            elif is_unsatisfiable(not_schema):
+                checks["not"] = finite_only(self.valid_check(), checks["not"])
+            elif keywords(not_schema) == {"not"}:
+                # not: {not: X} fails exactly when X fails.
+                inner = compile(not_schema["not"], path + "/not/not")
+                checks["not"] = finite_only(self.double_not_check(inner, path), checks["not"])
+
+        if "if" in checks and (is_trivial(schema["if"]) or is_unsatisfiable(schema["if"])):
+            # The outcome of if is known, only then or else is applied.
+            keyword = "then" if is_trivial(schema["if"]) else "else"
+            branches = (compile(schema[keyword], path + "/" + keyword),) if schema.get(keyword) else ()
+            checks["if"] = finite_only(self.all_of_check(branches), checks["if"])
+
+    def possible_branches(self, branches: List[Any], path: str) -> Tuple:
+        # Branches that can never match are left out of the first pass and only evaluated by the original check,
+        # when no possible branch matched and the error details need them.
+        satisfiable = [index for index, branch in enumerate(branches) if not is_unsatisfiable(branch)]
+        if not satisfiable or len(satisfiable) == len(branches):
+            return ()
+        return tuple(self.json_validator.compile(branches[index], path + f"/{index}") for index in satisfiable)
+
+    @staticmethod
+    def all_of_check(nodes: Tuple) -> Check:
+        def check(data, path_json, errors, ctx):
+            for node in nodes:
+                node.evaluate(data, path_json, errors, ctx)
+
+        def walk(data, path_json, errors, ctx):
+            for node in nodes:
+                yield node, data, path_json, errors
+        check.walk = walk
+        return check
+
+    @staticmethod
+    def valid_check() -> Check:
+        def check(data, path_json, errors, ctx):
+            pass
+
+        def walk(data, path_json, errors, ctx):
+            yield from ()
+        check.walk = walk
+        return check
+
+    @staticmethod
+    def invalid_check(path: str, message: str) -> Check:
+        def check(data, path_json, errors, ctx):
+            errors.append(ErrorRecord(path, path_json, message))
+
+        def walk(data, path_json, errors, ctx):
+            check(data, path_json, errors, ctx)
+            yield from ()
+        check.walk = walk
+        return check
+
+    def double_not_check(self, inner, path: str) -> Check:
+        def check(data, path_json, errors, ctx):
+            if self.evaluate_branch(inner, data, path_json, ctx):
+                errors.append(ErrorRecord(path + "/not", path_json, "Data matches not schema"))
+
+        def walk(data, path_json, errors, ctx):
+            if (yield from self.walk_branch(inner, data, path_json, ctx)):
+                errors.append(ErrorRecord(path + "/not", path_json, "Data matches not schema"))
+        check.walk = walk
+        return check
+
+    def any_of_check(self, possible: Tuple, original: Check) -> Check:
+        def check(data, path_json, errors, ctx):
+            for node in possible:
+                if not self.evaluate_branch(node, data, path_json, ctx):
+                    return
+            original(data, path_json, errors, ctx)
+
+        def walk(data, path_json, errors, ctx):
+            for node in possible:
+                if not (yield from self.walk_branch(node, data, path_json, ctx)):
+                    return
+            yield from original.walk(data, path_json, errors, ctx)
+        check.walk = walk
+        return check
+
+    def one_of_check(self, possible: Tuple, path: str, original: Check) -> Check:
+        def check(data, path_json, errors, ctx):
             one_valid = False
-            more_than_one_valid = False
-            oneof_errors: List[Dict] = []
-
-            for index, subschema in enumerate(subschemas):
-                result = self.json_validator.validate(
-                    data=data,
-                    schema=subschema,
-                    path=path + f"/oneOf/{index}",
-                    path_json=path_json,
-                    json_map=json_map)
-
-                if result["valid"] and not one_valid:
+            for node in possible:
+                if not self.evaluate_branch(node, data, path_json, ctx):
+                    if one_valid:
+                        errors.append(ErrorRecord(path + "/oneOf", path_json, "Data matches more than one oneOf schema"))
+                        return
                     one_valid = True
-                elif result["valid"] and one_valid:
-                    more_than_one_valid = True
-                    break
-                else:
-                    oneof_errors.extend(result["errors"])
+            if not one_valid:
+                original(data, path_json, errors, ctx)
 
+        def walk(data, path_json, errors, ctx):
+            one_valid = False
+            for node in possible:
+                if not (yield from self.walk_branch(node, data, path_json, ctx)):
+                    if one_valid:
+                        errors.append(ErrorRecord(path + "/oneOf", path_json, "Data matches more than one oneOf schema"))
+                        return
+                    one_valid = True
             if not one_valid:
-                errors.append({
-                    "message": "Data does not match oneOf schemas",
-                    "path": path + "/oneOf",
-                    "line": self.get_line(json_map, path_json),
-                    "details": oneof_errors
-                })
-            if more_than_one_valid:
-                errors.append({
-                    "message": "Data matches more than one oneOf schema",
-                    "path": path + "/oneOf",
-                    "line": self.get_line(json_map, path_json),
-                })
+                yield from original.walk(data, path_json, errors, ctx)
+        check.walk = walk
+        return check
 
+    @staticmethod
+    def discriminator(branches: Sequence[Any]) -> Optional[Tuple[str, Dict[Hashable, int]]]:
+        # A property every branch pins to its own const/enum values decides the only branch that can match:
+        # the others fail on that property. Only a match is taken from the table, a branch that still fails
+        # (or an unknown value) falls back to trying every branch, so the error details stay the same.
+        if len(branches) < 2 or not all(isinstance(branch, dict) for branch in branches):
+            return None
+        properties = branches[0].get("properties")
+        if not isinstance(properties, dict):
+            return None
 
-        if "not" in schema:
-            result = self.json_validator.validate(
-                data=data,
-                schema=schema["not"],
-                path=path + "/not",
-                path_json=path_json,
-                json_map=json_map)
-
-            if result["valid"]:
-                errors.append({
-                    "message": "Data matches not schema",
-                    "path": path + "/not",
-                    "line": self.get_line(json_map, path_json),
-                })
+        for name in properties:
+            table: Dict[Hashable, int] = {}
+            for index, branch in enumerate(branches):
+                values = LogicValidator.pinned_values(branch.get("properties"), name)
+                if values is None or any(key in table for key in values):
+                    break
+                table.update((key, index) for key in values)
+            else:
+                return name, table
+        return None
 
-        if "if" in schema:
-            if_schema = schema["if"]
-            then_schema = schema.get("then")
-            else_schema = schema.get("else")
-
-            if_result = self.json_validator.validate(
-                data = data,
-                schema=if_schema,
-                path=path + "/if",
-                path_json=path_json,
-                json_map=json_map)
-
-            if if_result["valid"] and then_schema:
-                then_result = self.json_validator.validate(
-                    data = data,
-                    schema=then_schema,
-                    path=path + "/then",
-                    path_json=path_json,
-                    json_map=json_map)
-                if not then_result["valid"]:
-                    errors.extend(then_result["errors"])
-            elif not if_result["valid"] and else_schema:
-                else_result = self.json_validator.validate(
-                    data = data,
-                    schema=else_schema,
-                    path=path + "/else",
-                    path_json=path_json,
-                    json_map=json_map)
-                if not else_result["valid"]:
-                    errors.extend(else_result["errors"])
-
-        return {"valid": not errors, "errors": errors}
\ No newline at end of file
+    @staticmethod
+    def pinned_values(properties: Any, name: str) -> Optional[Tuple[Hashable, ...]]:
+        subschema = properties.get(name) if isinstance(properties, dict) else None
+        if not isinstance(subschema, dict) or ("const" not in subschema and "enum" not in subschema):
+            return None
+        try:
+            if "enum" in subschema:
+                keys = tuple(TypeValidator.enum_key(item) for item in subschema["enum"])
+            if "const" in subschema:
+                const_key = TypeValidator.enum_key(subschema["const"])
+                keys = (const_key,) if "enum" not in subschema or const_key in keys else ()
+        except TypeError:
+            return None
+        return keys
+
+    @staticmethod
+    def select_branch(discriminator: Tuple[str, Dict[Hashable, int]], data: Any) -> Optional[int]:
+        name, table = discriminator
+        if type(data) is not dict or name not in data:
+            return None
+        try:
+            return table.get(TypeValidator.enum_key(data[name]))
+        except TypeError:
+            return None
+
+    @staticmethod
+    def evaluate_branch(node, data: Any, path_json: InstancePath, ctx: ValidationContext) -> List[ErrorRecord]:
+        memo = ctx.memo
+        if memo is not None:
+            cached = memo.get(node, data, path_json)
+            if cached is not None:
+                return cached
+
+        branch_errors = ctx.new_errors()
+        try:
+            node.evaluate(data, path_json, branch_errors, ctx)
+        except StopValidation as stop:
+            if stop.errors is not branch_errors:
+                raise
+        if memo is not None:
+            memo.put(node, data, path_json, branch_errors)
+        return branch_errors
+
+    @staticmethod
+    def walk_branch(node, data: Any, path_json: InstancePath, ctx: ValidationContext) -> Iterator:
+        # Iterative counterpart of evaluate_branch, used with "yield from" so the branch errors come back as its result.
+        memo = ctx.memo
+        if memo is not None:
+            cached = memo.get(node, data, path_json)
+            if cached is not None:
+                return cached
+
+        branch_errors = ctx.new_errors()
+        yield node, data, path_json, branch_errors
+        if memo is not None:
+            memo.put(node, data, path_json, branch_errors)
+        return branch_errors
+
+    def validate(self, data: Any, schema: Dict, path: str, path_json: str, json_map) -> Result:
+        checks = self.json_validator.compile_validator_keywords(self, schema, path)
+        return self.run_checks(checks, data, path_json, json_map)
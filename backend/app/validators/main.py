@@ -1,8 +1,13 @@
-from typing import Any, Dict, List
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
 
-from backend.app.types import Result
-from backend.app.validators.base import Validator
+from backend.app.types import Check, Result
+from backend.app.validators.base import SchemaError, Validator
+from backend.app.validators.compiled import CompiledSchema
 from backend.app.validators.dispatcher import ValidatorDispatcher
+from backend.app.validators.optimizer import diagnose
+from backend.app.validators.refs import CompileSession
 
 
 class JSONValidator(Validator):
@@ -16,29 +21,77 @@ class JSONValidator(Validator):
         self.logic_validator = logic_validator
 
         self.dispatcher = ValidatorDispatcher()
-        self.dispatcher.register(lambda d: isinstance(d, dict), lambda: self.object_validator)
-        self.dispatcher.register(lambda d: isinstance(d, list), lambda: self.array_validator)
-        self.dispatcher.register(lambda d: isinstance(d, str), lambda: self.string_validator)
-        self.dispatcher.register(
-            lambda d: isinstance(d, (int, float)) and not isinstance(d, bool), 
-            lambda: self.number_validator
-        )
+        self.dispatcher.register((dict,), lambda: self.object_validator)
+        self.dispatcher.register((list,), lambda: self.array_validator)
+        self.dispatcher.register((str,), lambda: self.string_validator)
+        self.dispatcher.register((int, float), lambda: self.number_validator)
+        self.dispatcher.register((bool, type(None)), None)
+        self._compiling = threading.local()
 
+    def compile(self, schema: Dict, path: str = "#") -> CompiledSchema:
+        if getattr(self._compiling, "session", None) is not None:
+            return self._compile(schema, path)
 
-    def validate(self, data: Any, schema: Dict, path: str, path_json: str, json_map) -> Result:
+        with self._session(schema) as session:
+            compiled = self._compile(schema, path)
+        compiled.diagnostics = session.diagnostics
+        return compiled
 
-        type_result = self.type_validator.validate(data, schema, path, path_json, json_map)
-        if not type_result["valid"]:
-            return type_result
+    def compile_validator_keywords(self, validator: Validator, schema: Dict, path: str) -> Dict[str, Check]:
+        # Only one validator's keywords, for its own validate(), with $ref resolved against this schema.
+        if getattr(self._compiling, "session", None) is not None:
+            return validator.compile_keywords(schema, path)
 
-        base_result = {"valid": True, "errors": []}
+        with self._session(schema):
+            return validator.compile_keywords(schema, path)
 
-        strategy_validator = self.dispatcher.get_validator(data)
-        if strategy_validator:
-            base_result = strategy_validator.validate(data, schema, path, path_json, json_map)
+    @contextmanager
+    def _session(self, schema: Dict) -> Iterator[CompileSession]:
+        session = self._compiling.session = CompileSession(schema)
+        try:
+            yield session
+            session.check_cycles()
+        finally:
+            self._compiling.session = None
 
-        logic_result = self.logic_validator.validate(data, schema, path, path_json, json_map)
+    def compile_ref(self, ref: str, path: str) -> CompiledSchema:
+        target_path, target = self._compiling.session.resolve(ref, path)
+        return self._compile(target, target_path, via_ref=True)
 
-        errors: List[Dict] = base_result["errors"] + logic_result["errors"]
+    def _compile(self, schema: Dict, path: str, via_ref: bool = False) -> CompiledSchema:
+        if not isinstance(schema, dict):
+            raise SchemaError(f"Schema at {path} must be an object")
+        session = self._compiling.session
+        session.link(path, via_ref)
+        compiled = session.nodes.get(path)
+        if compiled is not None:
+            return compiled
 
-        return {"valid": not errors, "errors": errors}
\ No newline at end of file
+        # Registered before its keywords are compiled so recursive references resolve to this node.
+        compiled = session.nodes[path] = CompiledSchema(schema, path, self.dispatcher)
+        session.diagnostics.extend({"path": path, "message": message} for message in diagnose(schema))
+        session.building.append(path)
+        try:
+            type_checks = self.type_validator.compile_keywords(schema, path)
+
+            compiled_keywords = {}
+            typed_checks = {}
+            for data_type in self.dispatcher.data_types:
+                validator = self.dispatcher.validator_for(data_type)
+                if validator is None:
+                    continue
+                if validator not in compiled_keywords:
+                    compiled_keywords[validator] = validator.compile_keywords(schema, path)
+                if compiled_keywords[validator]:
+                    typed_checks[data_type] = compiled_keywords[validator]
+
+            logic_checks = self.logic_validator.compile_keywords(schema, path)
+        finally:
+            session.building.pop()
+
+        compiled.build(type_checks, typed_checks, logic_checks)
+        return compiled
+
+    def validate(self, data: Any, schema: Dict, path: str, path_json: str, json_map, mode: str = "full",
+                 max_errors: Optional[int] = None) -> Result:
+        return self.compile(schema, path).validate(data, json_map, path_json, mode=mode, max_errors=max_errors)
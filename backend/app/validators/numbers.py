@@ -1,66 +1,74 @@
-import logging
-
-from backend.app.types import Result
+from backend.app.types import Check, Result
+from backend.app.validators.errors import ErrorRecord
 from backend.app.validators.types import Validator
 from typing import Any, Dict, List
 
 import math
 
 class NumberValidator(Validator):
-    def validate(self, data: Any, schema: Dict, path: str, path_json: str, json_map) -> Result:
-        logging.debug("Validating number")
-        logging.debug("Data:")
-        logging.debug(data)
-        logging.debug("Schema:")
-        logging.debug(schema)
-        logging.debug("Path json:")
-        logging.debug(path_json)
-        logging.debug("\n\n")
+    def compile_keywords(self, schema: Dict, path: str) -> Dict[str, Check]:
+        checks: Dict[str, Check] = {}
 
-        errors: List[Dict] = []
+        def check_finite(data, path_json, errors, ctx):
+            if not math.isfinite(data):
+                errors.append(ErrorRecord(path, path_json, "Data is not a valid finite number"))
+                return True
+        checks["number"] = check_finite
 
+        if "minimum" in schema:
+            minimum = schema["minimum"]
 
-        if not isinstance(data, (int, float)) or isinstance(data, bool) or not math.isfinite(data):
-            errors.append({
-                "message": "Data is not a valid finite number",
-                "path": path,
-                "line": self.get_line(json_map, path_json)
-            })
-            return {"valid": False, "errors": errors}
+            def check_minimum(data, path_json, errors, ctx):
+                if data < minimum:
+                    errors.append(ErrorRecord(path+"/minimum", path_json,
+                                              "Number ({}) is smaller than minimum ({})", (data, minimum)))
+            checks["minimum"] = check_minimum
 
-        if "minimum" in schema and data < schema["minimum"]:
-            errors.append({
-                "message": f"Number ({data}) is smaller than minimum ({schema['minimum']})",
-                "path": path+"/minimum",
-                "line": self.get_line(json_map, path_json)
-            })
+        if "maximum" in schema:
+            maximum = schema["maximum"]
 
-        if "maximum" in schema and data > schema["maximum"]:
-            errors.append({
-                "message": f"Number ({data}) is bigger than maximum ({schema['maximum']})",
-                "path": path+"/maximum",
-                "line": self.get_line(json_map, path_json)
-            })
+            def check_maximum(data, path_json, errors, ctx):
+                if data > maximum:
+                    errors.append(ErrorRecord(path+"/maximum", path_json,
+                                              "Number ({}) is bigger than maximum ({})", (data, maximum)))
+            checks["maximum"] = check_maximum
 
-        if "exclusiveMinimum" in schema and data <= schema["exclusiveMinimum"]:
-            errors.append({
-                "message": f"Number ({data}) is smaller or equal than exclusiveMinimum ({schema['exclusiveMinimum']})",
-                "path": path+"/exclusiveMinimum",
-                "line": self.get_line(json_map, path_json)
-            })
+        if "exclusiveMinimum" in schema:
+            exclusive_minimum = schema["exclusiveMinimum"]
 
-        if "exclusiveMaximum" in schema and data >= schema["exclusiveMaximum"]:
-            errors.append({
-                "message": f"Number ({data}) is bigger or equal than exclusiveMaximum ({schema['exclusiveMaximum']})",
-                "path": path+"/exclusiveMaximum",
-                "line": self.get_line(json_map, path_json)
-            })
+            def check_exclusive_minimum(data, path_json, errors, ctx):
+                if data <= exclusive_minimum:
+                    errors.append(ErrorRecord(path+"/exclusiveMinimum", path_json,
+                                              "Number ({}) is smaller or equal than exclusiveMinimum ({})", (data, exclusive_minimum)))
+            checks["exclusiveMinimum"] = check_exclusive_minimum
 
-        if "multipleOf" in schema and data % schema["multipleOf"] != 0:
-            errors.append({
-                "message": f"Number ({data}) is not a multipleOf ({schema['multipleOf']})",
-                "path": path+"/multipleOf",
+        if "exclusiveMaximum" in schema:
+            exclusive_maximum = schema["exclusiveMaximum"]
+
+            def check_exclusive_maximum(data, path_json, errors, ctx):
+                if data >= exclusive_maximum:
+                    errors.append(ErrorRecord(path+"/exclusiveMaximum", path_json,
+                                              "Number ({}) is bigger or equal than exclusiveMaximum ({})", (data, exclusive_maximum)))
+            checks["exclusiveMaximum"] = check_exclusive_maximum
+
+        if "multipleOf" in schema:
+            multiple_of = schema["multipleOf"]
+
+            def check_multiple_of(data, path_json, errors, ctx):
+                if data % multiple_of != 0:
+                    errors.append(ErrorRecord(path+"/multipleOf", path_json,
+                                              "Number ({}) is not a multipleOf ({})", (data, multiple_of)))
+            checks["multipleOf"] = check_multiple_of
+
+        return checks
+
+    def validate(self, data: Any, schema: Dict, path: str, path_json: str, json_map) -> Result:
+        if not isinstance(data, (int, float)) or isinstance(data, bool):
+            errors: List[Dict] = [{
+                "message": "Data is not a valid finite number",
+                "path": path,
                 "line": self.get_line(json_map, path_json)
-            })
+            }]
+            return {"valid": False, "errors": errors}
 
-        return {"valid": not errors, "errors": errors}
\ No newline at end of file
+        return self.run_checks(self.compile_keywords(schema, path), data, path_json, json_map)
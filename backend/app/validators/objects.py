@@ -1,6 +1,6 @@
-import logging
-
-from backend.app.types import Result
+from backend.app.types import Check, Result
+from backend.app.validators.errors import ErrorRecord
+from backend.app.validators.paths import escape
 from backend.app.validators.types import Validator
 from typing import Any, Dict, List
 
@@ -10,69 +10,96 @@ class ObjectValidator(Validator):
     def __init__(self, json_validator):
         self.json_validator = json_validator
 
-    def validate(self, data: Any, schema: Dict, path: str, path_json: str, json_map) -> Result:
-        logging.debug("Validating object")
-        logging.debug("Data:")
-        logging.debug(data)
-        logging.debug("Schema:")
-        logging.debug(schema)
-        logging.debug("Path json:")
-        logging.debug(path_json)
-        logging.debug("\n\n")
+    def compile_keywords(self, schema: Dict, path: str) -> Dict[str, Check]:
+        checks: Dict[str, Check] = {}
 
-        errors: List[Dict] = []
+        if "minProperties" in schema:
+            min_properties = schema["minProperties"]
 
+            def check_min_properties(data, path_json, errors, ctx):
+                if len(data) < min_properties:
+                    errors.append(ErrorRecord(path+"/minProperties", path_json,
+                                              "Object has fewer properties ({}) than minProperties ({})", (len(data), min_properties)))
+            checks["minProperties"] = check_min_properties
 
-        if not isinstance(data, dict):
-            errors.append({
-                "message": "Data is not an object",
-                "path": path,
-                "line": self.get_line(json_map, path_json)
-            })
-            return {"valid": False, "errors": errors}
+        if "maxProperties" in schema:
+            max_properties = schema["maxProperties"]
 
-        if "minProperties" in schema and len(data) < schema["minProperties"]:
-            errors.append({
-                "message": f"Object has fewer properties ({len(data)}) than minProperties ({schema['minProperties']})",
-                "path": path+"/minProperties",
-                "line": self.get_line(json_map, path_json)
-            })
+            def check_max_properties(data, path_json, errors, ctx):
+                if len(data) > max_properties:
+                    errors.append(ErrorRecord(path+"/maxProperties", path_json,
+                                              "Object has more properties ({}) than maxProperties ({})", (len(data), max_properties)))
+            checks["maxProperties"] = check_max_properties
 
-        if "maxProperties" in schema and len(data) > schema["maxProperties"]:
-            errors.append({
-                "message": f"Object has more properties ({len(data)}) than maxProperties ({schema['maxProperties']})",
-                "path": path+"/maxProperties",
-                "line": self.get_line(json_map, path_json)
-            })
+        if schema.get("required"):
+            required = tuple(schema["required"])
 
-        for key in schema.get("required", []):
-            if key not in data:
-                errors.append({
-                    "message": f"Missing required property: {key}",
-                    "path": path+'/required',
-                    "line": self.get_line(json_map, path_json)
-                })
+            def check_required(data, path_json, errors, ctx):
+                for key in required:
+                    if key not in data:
+                        errors.append(ErrorRecord(path+"/required", path_json, "Missing required property: {}", (key,)))
+            checks["required"] = check_required
 
         properties = schema.get("properties", {})
-        for key, subschema in properties.items():
-            if key in data:
-                result = self.json_validator.validate(data[key], subschema, path+f"/properties/{key}", path_json+f"/{key}", json_map)
-                errors += result["errors"]
+        if properties:
+            property_schemas = tuple(
+                (key, self.json_validator.compile(subschema, path+f"/properties/{escape(key)}"))
+                for key, subschema in properties.items()
+            )
+            compiled_properties = tuple((key, property_schema.evaluate) for key, property_schema in property_schemas)
+
+            def check_properties(data, path_json, errors, ctx):
+                for key, evaluate_property in compiled_properties:
+                    if key in data:
+                        evaluate_property(data[key], (path_json, key), errors, ctx)
+
+            def walk_properties(data, path_json, errors, ctx):
+                for key, property_schema in property_schemas:
+                    if key in data:
+                        if property_schema.leaf:
+                            property_schema.evaluate(data[key], (path_json, key), errors, ctx)
+                        else:
+                            yield property_schema, data[key], (path_json, key), errors
+            check_properties.walk = walk_properties
+            checks["properties"] = check_properties
 
         additional_properties = schema.get("additionalProperties", True)
-        if additional_properties is not True:
-            extra_keys = [key for key in data if key not in properties]
-            
-            if additional_properties is False:
-                for key in extra_keys:
-                    errors.append({
-                        "message": f"Additional property '{key}' is not allowed",
-                        "path": path+"/additionalProperties",
-                        "line": self.get_line(json_map, path_json+f"/{key}")
-                    })
-            elif isinstance(additional_properties, dict):
-                for key in extra_keys:
-                    result = self.json_validator.validate(data[key], additional_properties, path+"/additionalProperties", path_json+f"/{key}", json_map)
-                    errors += result["errors"]
-
-        return {"valid": not errors, "errors": errors}
\ No newline at end of file
+        if additional_properties is False:
+            def check_no_additional_properties(data, path_json, errors, ctx):
+                for key in data:
+                    if key not in properties:
+                        errors.append(ErrorRecord(path+"/additionalProperties", (path_json, key),
+                                                  "Additional property '{}' is not allowed", (key,)))
+            checks["additionalProperties"] = check_no_additional_properties
+        elif isinstance(additional_properties, dict):
+            additional_schema = self.json_validator.compile(additional_properties, path+"/additionalProperties")
+            evaluate_additional = additional_schema.evaluate
+
+            def check_additional_properties(data, path_json, errors, ctx):
+                for key in data:
+                    if key not in properties:
+                        evaluate_additional(data[key], (path_json, key), errors, ctx)
+
+            def walk_additional_properties(data, path_json, errors, ctx):
+                if additional_schema.leaf:
+                    check_additional_properties(data, path_json, errors, ctx)
+                    return
+                for key in data:
+                    if key not in properties:
+                        yield additional_schema, data[key], (path_json, key), errors
+            check_additional_properties.walk = walk_additional_properties
+            checks["additionalProperties"] = check_additional_properties
+
+        return checks
+
+    def validate(self, data: Any, schema: Dict, path: str, path_json: str, json_map) -> Result:
+        if not isinstance(data, dict):
+            errors: List[Dict] = [{
+                "message": "Data is not an object",
+                "path": path,
+                "line": self.get_line(json_map, path_json)
+            }]
+            return {"valid": False, "errors": errors}
+
+        checks = self.json_validator.compile_validator_keywords(self, schema, path)
+        return self.run_checks(checks, data, path_json, json_map)
@@ -0,0 +1,141 @@
+import math
+from typing import Any, Dict, Iterator, List, Tuple
+
+from backend.app.types import Check
+from backend.app.validators.types import TypeValidator
+
+# Every keyword that compiles to a check. Anything else ($defs, title, then/else without if, ...) never fails.
+KEYWORDS = frozenset((
+    "type", "enum", "const",
+    "properties", "required", "additionalProperties", "minProperties", "maxProperties",
+    "items", "minItems", "maxItems",
+    "minLength", "maxLength", "pattern",
+    "minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum", "multipleOf",
+    "allOf", "anyOf", "oneOf", "not", "if", "$ref"
+))
+
+# Bounds that only constrain one kind of data, with the JSON types that kind covers.
+BOUNDS = (
+    ("minLength", "maxLength", ("string",)),
+    ("minItems", "maxItems", ("array",)),
+    ("minProperties", "maxProperties", ("object",))
+)
+NUMBER_TYPES = ("integer", "number")
+
+
+def keywords(schema: Any) -> frozenset:
+    return KEYWORDS.intersection(schema) if isinstance(schema, dict) else frozenset()
+
+
+def is_trivial(schema: Any) -> bool:
+    # Valid for every finite value: no keywords, or only an allOf of such schemas.
+    used = keywords(schema)
+    if not used:
+        return isinstance(schema, dict)
+    return used == {"allOf"} and isinstance(schema["allOf"], list) and all(map(is_trivial, schema["allOf"]))
+
+
+def is_unsatisfiable(schema: Any) -> bool:
+    # Conservative: True only if no value at all can be valid. $ref targets are not followed.
+    if not isinstance(schema, dict):
+        return False
+    if schema.get("enum") == [] or schema.get("type") == []:
+        return True
+    if "not" in schema and is_trivial(schema["not"]):
+        return True
+    if "const" in schema and isinstance(schema.get("enum"), list) and not const_in_enum(schema):
+        return True
+    for keyword in ("anyOf", "oneOf"):
+        if isinstance(schema.get(keyword), list) and all(map(is_unsatisfiable, schema[keyword])):
+            return True
+    if isinstance(schema.get("allOf"), list) and any(map(is_unsatisfiable, schema["allOf"])):
+        return True
+
+    types = declared_types(schema)
+    if types:
+        return any(types.issubset(kinds) for kinds, _ in contradictions(schema))
+    return False
+
+
+def declared_types(schema: Dict) -> frozenset:
+    schema_type = schema.get("type")
+    if isinstance(schema_type, str):
+        return frozenset((schema_type,))
+    if isinstance(schema_type, list) and all(isinstance(t, str) for t in schema_type):
+        return frozenset(schema_type)
+    return frozenset()
+
+
+def const_in_enum(schema: Dict) -> bool:
+    try:
+        return TypeValidator.enum_key(schema["const"]) in {TypeValidator.enum_key(item) for item in schema["enum"]}
+    except TypeError:
+        return True
+
+
+def contradictions(schema: Dict) -> List[Tuple[Tuple[str, ...], str]]:
+    found = []
+    for low_keyword, high_keyword, kinds in BOUNDS:
+        low, high = schema.get(low_keyword), schema.get(high_keyword)
+        if is_number(low) and is_number(high) and low > high:
+            found.append((kinds, f"{low_keyword} ({low}) is greater than {high_keyword} ({high})"))
+
+    lows = [(schema[k], k, k == "exclusiveMinimum") for k in ("minimum", "exclusiveMinimum") if is_number(schema.get(k))]
+    highs = [(schema[k], k, k == "exclusiveMaximum") for k in ("maximum", "exclusiveMaximum") if is_number(schema.get(k))]
+    for low, low_keyword, low_exclusive in lows:
+        for high, high_keyword, high_exclusive in highs:
+            if low > high or (low == high and (low_exclusive or high_exclusive)):
+                found.append((NUMBER_TYPES, f"{low_keyword} ({low}) and {high_keyword} ({high}) leave no valid number"))
+    return found
+
+
+def is_number(value: Any) -> bool:
+    return type(value) in (int, float) and math.isfinite(value)
+
+
+def diagnose(schema: Any) -> List[str]:
+    if not isinstance(schema, dict):
+        return []
+    messages = [message for _, message in contradictions(schema)]
+    if schema.get("enum") == []:
+        messages.append("enum is empty, no value can match")
+    if schema.get("type") == []:
+        messages.append("type is an empty list, no value can match")
+    if "const" in schema and isinstance(schema.get("enum"), list) and not const_in_enum(schema):
+        messages.append("const is not one of the enum values")
+    if "not" in schema and is_trivial(schema["not"]):
+        messages.append("not applies a schema that accepts everything, no value can match")
+    if not messages and is_unsatisfiable(schema):
+        messages.append("no value can match this schema")
+    return messages
+
+
+def flatten_all_of(subschemas: List[Any], path: str) -> Iterator[Tuple[Any, str]]:
+    # Nested allOf-only schemas are inlined and trivial ones dropped, each kept schema keeps its original path.
+    for index, subschema in enumerate(subschemas):
+        subschema_path = path + f"/allOf/{index}"
+        if is_trivial(subschema):
+            continue
+        if keywords(subschema) == {"allOf"} and isinstance(subschema["allOf"], list):
+            yield from flatten_all_of(subschema["allOf"], subschema_path)
+        else:
+            yield subschema, subschema_path
+
+
+def finite_only(optimized: Check, original: Check) -> Check:
+    # Every subschema also rejects NaN and infinities on its own, so a skipped subschema only changes the errors
+    # for those values: they keep taking the original check.
+    optimized_walk, original_walk = optimized.walk, original.walk
+
+    def check(data, path_json, errors, ctx):
+        if type(data) is float and not math.isfinite(data):
+            return original(data, path_json, errors, ctx)
+        return optimized(data, path_json, errors, ctx)
+
+    def walk(data, path_json, errors, ctx):
+        if type(data) is float and not math.isfinite(data):
+            yield from original_walk(data, path_json, errors, ctx)
+        else:
+            yield from optimized_walk(data, path_json, errors, ctx)
+    check.walk = walk
+    return check
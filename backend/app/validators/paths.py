@@ -0,0 +1,34 @@
+from typing import List, Tuple, Union
+
+# Instance locations are linked (parent, segment) tuples, rendered to JSON Pointers only when needed.
+InstancePath = Tuple
+ROOT: InstancePath = ()
+
+
+def escape(segment: Union[str, int]) -> str:
+    return str(segment).replace("~", "~0").replace("/", "~1")
+
+
+def unescape(segment: str) -> str:
+    return segment.replace("~1", "/").replace("~0", "~")
+
+
+def segments(path: InstancePath) -> List[Union[str, int]]:
+    result = []
+    while path:
+        path, segment = path
+        result.append(segment)
+    result.reverse()
+    return result
+
+
+def to_pointer(path: InstancePath) -> str:
+    return "".join("/" + escape(segment) for segment in segments(path))
+
+
+def from_pointer(pointer: str) -> InstancePath:
+    path = ROOT
+    if pointer:
+        for segment in pointer.split("/")[1:]:
+            path = (path, unescape(segment))
+    return path
@@ -0,0 +1,55 @@
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict
+
+from backend.app.validators.base import SchemaError
+
+
+class PatternRegistry:
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self.compiles = 0
+        self.hits = 0
+        self.evictions = 0
+        self.searches = 0
+        self.failures = 0
+        self._patterns: "OrderedDict[str, re.Pattern]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def compile(self, pattern: str, path: str) -> re.Pattern:
+        if not isinstance(pattern, str):
+            raise SchemaError(f"Pattern at {path} must be a string")
+
+        with self._lock:
+            compiled = self._patterns.get(pattern)
+            if compiled is not None:
+                self._patterns.move_to_end(pattern)
+                self.hits += 1
+                return compiled
+
+        try:
+            compiled = re.compile(pattern)
+        except re.error as e:
+            raise SchemaError(f"Invalid pattern at {path}: {e}") from e
+
+        with self._lock:
+            self.compiles += 1
+            if self.max_size > 0:
+                self._patterns[pattern] = compiled
+                while len(self._patterns) > self.max_size:
+                    self._patterns.popitem(last=False)
+                    self.evictions += 1
+        return compiled
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "size": len(self._patterns),
+                "max_size": self.max_size,
+                "compiles": self.compiles,
+                "hits": self.hits,
+                "evictions": self.evictions,
+                "searches": self.searches,
+                "failures": self.failures
+            }
@@ -0,0 +1,65 @@
+from typing import Any, Dict, List, Tuple
+from urllib.parse import unquote
+
+from backend.app.validators.base import SchemaError
+from backend.app.validators.paths import escape, unescape
+
+# Keywords whose subschemas are applied to a child of the instance, every other applicator works in place.
+DESCENDING_KEYWORDS = ("items", "properties", "additionalProperties")
+
+
+class CompileSession:
+    def __init__(self, root: Dict):
+        self.root = root
+        self.nodes: Dict[str, Any] = {}
+        self.building: List[str] = []
+        self.in_place: Dict[str, List[str]] = {}
+        self.diagnostics: List[Dict[str, str]] = []
+
+    def resolve(self, ref: Any, path: str) -> Tuple[str, Dict]:
+        if not isinstance(ref, str) or not ref.startswith("#"):
+            raise SchemaError(f"Unsupported $ref at {path}: {ref!r}, only local references (#...) are supported")
+
+        target = self.root
+        target_path = "#"
+        pointer = unquote(ref[1:])
+        for segment in pointer.split("/")[1:] if pointer else ():
+            segment = unescape(segment)
+            if isinstance(target, dict) and segment in target:
+                target = target[segment]
+            elif isinstance(target, list) and segment.isdigit() and int(segment) < len(target):
+                target = target[int(segment)]
+            else:
+                raise SchemaError(f"Unresolvable $ref at {path}: {ref}")
+            target_path += "/" + escape(segment)
+
+        if not isinstance(target, dict):
+            raise SchemaError(f"$ref at {path} does not point to a schema: {ref}")
+        return target_path, target
+
+    def link(self, path: str, via_ref: bool = False) -> None:
+        if not self.building:
+            return
+        parent = self.building[-1]
+        if via_ref or path[len(parent) + 1:].split("/", 1)[0] not in DESCENDING_KEYWORDS:
+            self.in_place.setdefault(parent, []).append(path)
+
+    def check_cycles(self) -> None:
+        # A cycle of in-place applicators would re-validate the same instance forever.
+        state: Dict[str, bool] = {}
+        for start in self.in_place:
+            if start in state:
+                continue
+            state[start] = False
+            stack = [(start, iter(self.in_place.get(start, ())))]
+            while stack:
+                path, targets = stack[-1]
+                target = next(targets, None)
+                if target is None:
+                    state[path] = True
+                    stack.pop()
+                elif target not in state:
+                    state[target] = False
+                    stack.append((target, iter(self.in_place.get(target, ()))))
+                elif not state[target]:
+                    raise SchemaError(f"Circular $ref at {path}: {target} is applied to the same instance without end")
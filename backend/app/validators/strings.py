@@ -1,55 +1,57 @@
-import logging
-
-from backend.app.types import Result
+from backend.app.types import Check, Result
+from backend.app.validators.errors import ErrorRecord
 from backend.app.validators.types import Validator
+from backend.app.validators.patterns import PatternRegistry
 from typing import Any, Dict, List
-import re
 
 
 class StringValidator(Validator):
-    def validate(self, data: Any, schema: Dict, path: str, path_json: str, json_map)  -> Result:
-        logging.debug("Validating string")
-        logging.debug("Data:")
-        logging.debug(data)
-        logging.debug("Schema:")
-        logging.debug(schema)
-        logging.debug("Path json:")
-        logging.debug(path_json)
-        logging.debug("\n\n")
+    def __init__(self, pattern_registry: PatternRegistry = None):
+        self.pattern_registry = pattern_registry or PatternRegistry()
+
+    def compile_keywords(self, schema: Dict, path: str) -> Dict[str, Check]:
+        checks: Dict[str, Check] = {}
+
+        if "minLength" in schema:
+            min_length = schema["minLength"]
+
+            def check_min_length(data, path_json, errors, ctx):
+                if len(data) < min_length:
+                    errors.append(ErrorRecord(path+"/minLength", path_json,
+                                              "String length ({}) < minLength ({})", (len(data), min_length)))
+            checks["minLength"] = check_min_length
+
+        if "maxLength" in schema:
+            max_length = schema["maxLength"]
+
+            def check_max_length(data, path_json, errors, ctx):
+                if len(data) > max_length:
+                    errors.append(ErrorRecord(path+"/maxLength", path_json,
+                                              "String length ({}) > maxLength ({})", (len(data), max_length)))
+            checks["maxLength"] = check_max_length
+
+        if "pattern" in schema:
+            pattern = schema["pattern"]
+            search = self.pattern_registry.compile(pattern, path + "/pattern").search
+            registry = self.pattern_registry
 
-        errors: List[Dict] = []
+            def check_pattern(data, path_json, errors, ctx):
+                registry.searches += 1
+                if not search(data):
+                    registry.failures += 1
+                    errors.append(ErrorRecord(path + "/pattern", path_json,
+                                              "String '{}' does not match pattern {}", (data, pattern)))
+            checks["pattern"] = check_pattern
 
+        return checks
+
+    def validate(self, data: Any, schema: Dict, path: str, path_json: str, json_map)  -> Result:
         if not isinstance(data, str):
-            errors.append({
+            errors: List[Dict] = [{
                 "message": "Data is not a string",
                 "path": path,
                 "line": self.get_line(json_map, path_json)
-            })
-            logging.info("\nData is not a string\n")
+            }]
             return {"valid": False, "errors": errors}
 
-        if "minLength" in schema and len(data) < schema["minLength"]:
-            errors.append({
-                "message": f"String length ({len(data)}) < minLength ({schema['minLength']})",
-                "path": path+"/minLength",
-                "line": self.get_line(json_map, path_json)
-            })
-            logging.info(f"\nString length ({len(data)}) < minLength ({schema['minLength']})\n")
-
-        if "maxLength" in schema and len(data) > schema["maxLength"]:
-            errors.append({
-                "message": f"String length ({len(data)}) > maxLength ({schema['maxLength']})",
-                "path": path+"/maxLength",
-                "line": self.get_line(json_map, path_json)
-            })
-            logging.info(f"\nString length ({len(data)}) > maxLength ({schema['maxLength']})\n")
-
-        if "pattern" in schema and isinstance(data, str) and not re.search(schema["pattern"], data):
-            errors.append({
-                "message": f"String '{data}' does not match pattern {schema['pattern']}",
-                "path": path + "/pattern",
-                "line": self.get_line(json_map, path_json)
-            })
-            logging.info(f"\nString '{data}' does not match pattern {schema['pattern']}\n")
-
-        return {"valid": not errors, "errors": errors}
\ No newline at end of file
+        return self.run_checks(self.compile_keywords(schema, path), data, path_json, json_map)
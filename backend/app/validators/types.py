@@ -1,9 +1,20 @@
-import logging
 import math
-from typing import Any, Dict, List
+from typing import Any, Dict, Hashable
 
-from backend.app.types import Result
+from backend.app.types import Check, Result
 from backend.app.validators.base import Validator
+from backend.app.validators.errors import ErrorRecord
+
+JSON_TYPES = {
+    "string": (str,),
+    "number": (int, float),
+    "integer": (int,),
+    "object": (dict,),
+    "array": (list,),
+    "boolean": (bool,),
+    "null": (type(None),),
+}
+KNOWN_TYPES = frozenset(data_type for data_types in JSON_TYPES.values() for data_type in data_types)
 
 
 class TypeValidator(Validator):
@@ -36,43 +47,61 @@ class TypeValidator(Validator):
 
         return False
 
-    def validate(self, data: Any, schema: Dict, path: str, path_json: str, json_map) -> Result:
-        logging.debug("Validating type")
-        logging.debug("Data:")
-        logging.debug(data)
-        logging.debug("Schema:")
-        logging.debug(schema)
-        logging.debug("Path json:")
-        logging.debug(path_json)
-        logging.debug("\n\n")
+    @staticmethod
+    def freeze(value: Any) -> Hashable:
+        if isinstance(value, dict):
+            return frozenset((key, TypeValidator.freeze(item)) for key, item in value.items())
+        if isinstance(value, list):
+            return tuple(TypeValidator.freeze(item) for item in value)
+        return value
 
-        errors: List[Dict] = []
+    @staticmethod
+    def enum_key(value: Any) -> Hashable:
+        # Only the outermost type is compared strictly, nested values compare with == like before.
+        return type(value), TypeValidator.freeze(value)
+
+    def compile_keywords(self, schema: Dict, path: str) -> Dict[str, Check]:
+        checks: Dict[str, Check] = {}
 
         if "type" in schema:
             if isinstance(schema["type"], list):
-                allowed_types = schema["type"]
+                allowed_types = tuple(schema["type"])
             else:
-                allowed_types = [schema["type"]]
-            if not any(self.matches_type(data, t) for t in allowed_types):
-                errors.append({
-                    "message": "Data does not match any of the allowed types",
-                    "path": path+"/type",
-                    "line": self.get_line(json_map, path_json)
-                })
+                allowed_types = (schema["type"],)
+            # float is only ever allowed through "number", which also requires a finite value.
+            exact_types = frozenset(data_type for t in allowed_types if isinstance(t, str) for data_type in JSON_TYPES.get(t, ()))
+            matches_type = self.matches_type
+
+            def check_type(data, path_json, errors, ctx):
+                data_type = type(data)
+                if data_type in exact_types:
+                    if data_type is not float or math.isfinite(data):
+                        return
+                elif data_type not in KNOWN_TYPES and any(matches_type(data, t) for t in allowed_types):
+                    return
+                errors.append(ErrorRecord(path+"/type", path_json, "Data does not match any of the allowed types"))
+            checks["type"] = check_type
+
         if "enum" in schema:
-            if not any(item == data and type(item) is type(data) for item in schema["enum"]):
-                errors.append({
-                    "message": "Data does not match any of the enum values",
-                    "path": path+"/enum",
-                    "line": self.get_line(json_map, path_json)
-                })
+            enum_types = frozenset(type(item) for item in schema["enum"])
+            enum_index = frozenset(self.enum_key(item) for item in schema["enum"])
+            enum_key = self.enum_key
+
+            def check_enum(data, path_json, errors, ctx):
+                if type(data) not in enum_types or enum_key(data) not in enum_index:
+                    errors.append(ErrorRecord(path+"/enum", path_json, "Data does not match any of the enum values"))
+            checks["enum"] = check_enum
 
         if "const" in schema:
-            if not (data == schema["const"] and type(data) is type(schema["const"])):
-                errors.append({
-                    "message": "Data does not match the const value",
-                    "path": path+"/const",
-                    "line": self.get_line(json_map, path_json)
-                })
-
-        return {"valid": not errors, "errors": errors}
\ No newline at end of file
+            const = schema["const"]
+            const_type = type(const)
+
+            def check_const(data, path_json, errors, ctx):
+                if type(data) is not const_type or data != const:
+                    errors.append(ErrorRecord(path+"/const", path_json, "Data does not match the const value"))
+            checks["const"] = check_const
+
+        return checks
+
+    def validate(self, data: Any, schema: Dict, path: str, path_json: str, json_map) -> Result:
+        return self.run_checks(self.compile_keywords(schema, path), data, path_json, json_map)
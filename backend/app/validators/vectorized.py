@@ -0,0 +1,80 @@
+import math
+import operator
+import sys
+from itertools import repeat
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.app.validators.optimizer import declared_types, is_number, keywords
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+NUMERIC_KEYWORDS = frozenset(("type", "minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum", "multipleOf"))
+# Below this size the per-item checks are as fast as the batch scan.
+MIN_ITEMS = 16
+# Converting to an array only pays off for larger float arrays.
+NUMPY_MIN_ITEMS = 1024
+FLOAT_MAX = sys.float_info.max
+# float64 holds every integer up to 2**53, so bounds beyond that compare differently than in Python.
+EXACT_INT = 2 ** 53
+
+
+def numeric_items_check(schema: Any, use_numpy: bool = True) -> Optional[Callable[[List], bool]]:
+    # For items schemas made only of numeric keywords, returns a check telling whether every item is valid.
+    # It never reports errors: a False answer sends the array through the per-item checks.
+    used = keywords(schema)
+    if not used or not used <= NUMERIC_KEYWORDS:
+        return None
+    types = declared_types(schema) if "type" in schema else frozenset(("number",))
+    if not types or not types <= {"number", "integer"}:
+        return None
+    allowed = frozenset((int, float)) if "number" in types else frozenset((int,))
+
+    bounds: Dict[str, Any] = {keyword: schema[keyword] for keyword in used if keyword != "type"}
+    if not all(map(is_number, bounds.values())) or bounds.get("multipleOf", 1) == 0:
+        return None
+    minimum, maximum = bounds.get("minimum"), bounds.get("maximum")
+    exclusive_minimum, exclusive_maximum = bounds.get("exclusiveMinimum"), bounds.get("exclusiveMaximum")
+    multiple_of = bounds.get("multipleOf")
+    use_numpy = use_numpy and numpy is not None and all(
+        type(value) is float or abs(value) <= EXACT_INT for value in bounds.values())
+
+    def in_bounds(low, high) -> bool:
+        return not ((minimum is not None and low < minimum)
+                    or (exclusive_minimum is not None and low <= exclusive_minimum)
+                    or (maximum is not None and high > maximum)
+                    or (exclusive_maximum is not None and high >= exclusive_maximum))
+
+    def all_valid_numpy(data: List) -> bool:
+        values = numpy.array(data, dtype=numpy.float64)
+        if not numpy.isfinite(values).all() or not in_bounds(float(values.min()), float(values.max())):
+            return False
+        # numpy.remainder follows Python's float % (sign of the divisor), so zero remainders match exactly.
+        return multiple_of is None or not numpy.remainder(values, multiple_of).any()
+
+    def all_valid(data: List) -> bool:
+        if len(data) < MIN_ITEMS:
+            return False
+        item_types = set(map(type, data))
+        if not item_types <= allowed:
+            return False
+        if use_numpy and len(data) >= NUMPY_MIN_ITEMS and item_types == {float}:
+            return all_valid_numpy(data)
+
+        try:
+            # NaN and infinities make the sum non-finite, so does an overflow, which only costs the slow path.
+            if float in item_types and not math.isfinite(sum(data)):
+                return False
+            low, high = min(data), max(data)
+            # Integers too large for a float fail the finite check per item, leave them to it.
+            if int in item_types and (low < -FLOAT_MAX or high > FLOAT_MAX):
+                return False
+            if not in_bounds(low, high):
+                return False
+            return multiple_of is None or not any(map(operator.mod, data, repeat(multiple_of)))
+        except (OverflowError, TypeError):
+            return False
+
+    return all_valid
@@ -0,0 +1,84 @@
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+from typing import Dict, Iterable, List, Optional
+
+from backend.benchmarks.workloads import Workload, workloads
+
+
+def measure(workload: Workload, repeat: int = 5, min_time: float = 0.2) -> Dict:
+    name, setup = workload
+    function = setup()
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    times = [total / number for total in timer.repeat(repeat=repeat, number=number)]
+    return {"min": min(times), "median": statistics.median(times), "number": number, "repeat": repeat}
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(selected: Iterable[Workload], repeat: int = 5, min_time: float = 0.2) -> Dict:
+    results = {}
+    for workload in selected:
+        results[workload[0]] = measure(workload, repeat, min_time)
+        print(f"{workload[0]:<45} {results[workload[0]]['median'] * 1e3:>12.4f} ms", file=sys.stderr)
+    return {
+        "meta": {"commit": git_commit(), "python": platform.python_version(), "platform": platform.platform()},
+        "results": results
+    }
+
+
+def compare(baseline: Dict, current: Dict, threshold: float = 1.2) -> List[str]:
+    regressions = []
+    for name, result in current["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            print(f"{name:<45} {'new':>12}")
+            continue
+        ratio = result["median"] / previous["median"]
+        flag = "REGRESSION" if ratio > threshold else ""
+        print(f"{name:<45} {previous['median'] * 1e3:>12.4f} {result['median'] * 1e3:>12.4f} {ratio:>7.2f}x {flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the validators, parsing and /validate.")
+    parser.add_argument("--scale", choices=("full", "quick"), default="full")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per repeat")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=1.2, help="median ratio reported as a regression")
+    args = parser.parse_args(argv)
+
+    selected = [workload for workload in workloads(args.scale) if args.filter in workload[0]]
+    current = run(selected, args.repeat, args.min_time)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(current, file, indent=2)
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(json.load(file), current, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) above {args.threshold}x", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+import importlib.util
+import json
+import logging
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from backend.app.dependencies import json_validator
+from backend.app.parsing import BACKENDS, DocumentParser
+from backend.app.service import validate_body
+from backend.app.source_map import OffsetIndex
+from backend.app.validators.context import NoSourceMap, ValidationContext
+from backend.app.validators.errors import ErrorRecord
+from backend.app.validators.numbers import NumberValidator
+from backend.app.validators.patterns import PatternRegistry
+from backend.app.validators.strings import StringValidator
+from backend.app.validators.types import TypeValidator
+
+# A workload is a name plus a setup function returning the callable that gets timed.
+Workload = Tuple[str, Callable[[], Callable[[], Any]]]
+
+SIZES = {
+    "full": {"width": (10, 100, 1000), "depth": (5, 50, 200), "length": (100, 10_000, 1_000_000), "enum": (10, 1000),
+             "fanout": (2, 16, 64), "document": (100, 10_000)},
+    "quick": {"width": (10,), "depth": (5,), "length": (100,), "enum": (10,), "fanout": (2,), "document": (100,)},
+}
+
+
+def wide_object(width: int) -> Tuple[Dict, Dict]:
+    schema = {
+        "type": "object",
+        "properties": {f"p{i}": {"type": "integer", "minimum": 0} for i in range(width)},
+        "required": [f"p{i}" for i in range(0, width, 2)],
+        "additionalProperties": False
+    }
+    return schema, {f"p{i}": i for i in range(width)}
+
+
+def deep_document(depth: int) -> Tuple[Dict, Any]:
+    schema: Dict = {"type": "string", "minLength": 1}
+    data: Any = "leaf"
+    for level in range(depth):
+        if level % 2:
+            schema, data = {"type": "array", "items": schema, "minItems": 1}, [data]
+        else:
+            schema, data = {"type": "object", "properties": {"child": schema}, "required": ["child"]}, {"child": data}
+    return schema, data
+
+
+def long_array(length: int) -> Tuple[Dict, List]:
+    schema = {"type": "array", "items": {"type": "number", "minimum": 0, "multipleOf": 0.5}, "maxItems": length}
+    return schema, [index * 0.5 for index in range(length)]
+
+
+def records(count: int) -> Tuple[Dict, List]:
+    schema = {
+        "type": "array",
+        "items": {
+            "type": "object",
+            "required": ["id", "name", "tags"],
+            "properties": {
+                "id": {"type": "integer", "minimum": 1},
+                "name": {"type": "string", "minLength": 1, "pattern": "^item"},
+                "price": {"type": ["number", "null"], "exclusiveMinimum": 0},
+                "tags": {"type": "array", "items": {"enum": ["a", "b", "c"]}, "maxItems": 3},
+                "status": {"oneOf": [{"const": "active"}, {"const": "archived"}]}
+            }
+        }
+    }
+    data = [{"id": i + 1, "name": f"item {i}", "price": i * 1.5 or None, "tags": ["a", "b"], "status": "active"}
+            for i in range(count)]
+    return schema, data
+
+
+def fanout(keyword: str, branches: int) -> Tuple[Dict, List]:
+    schema = {"items": {keyword: [{"type": "object", "required": [f"k{i}"]} for i in range(branches)]}}
+    # Each item matches only the last branch, so every branch is evaluated.
+    return schema, [{f"k{branches - 1}": index} for index in range(100)]
+
+
+def run_checks(checks: Dict, values: List) -> Callable[[], None]:
+    ctx = ValidationContext(NoSourceMap())
+    checks = tuple(checks.values())
+
+    def run():
+        errors: List[ErrorRecord] = []
+        for value in values:
+            for check in checks:
+                check(value, (), errors, ctx)
+    return run
+
+
+def compiled(schema: Dict, data: Any, engine: str = "recursive") -> Callable[[], Any]:
+    compiled_schema = json_validator.compile(schema)
+    return lambda: compiled_schema.validate(data, NoSourceMap(), engine=engine)
+
+
+def workloads(scale: str = "full") -> Iterator[Workload]:
+    sizes = SIZES[scale]
+
+    for size in sizes["enum"]:
+        enum = [{"id": i} if i % 3 else f"value {i}" for i in range(size)]
+        yield (f"validators.types.enum[{size}]",
+               lambda enum=enum: run_checks(TypeValidator().compile_keywords({"enum": enum}, "#"), enum[::-1] + [None]))
+    yield ("validators.types.type",
+           lambda: run_checks(TypeValidator().compile_keywords({"type": ["integer", "string"]}, "#"),
+                              list(range(500)) + ["a"] * 500))
+    yield ("validators.strings.pattern",
+           lambda: run_checks(StringValidator(PatternRegistry()).compile_keywords(
+               {"pattern": "^[a-z]+@[a-z]+\\.com$", "minLength": 5, "maxLength": 50}, "#"),
+               [f"user{i % 10 and 'x'}@example.com" for i in range(1000)]))
+    yield ("validators.numbers.range",
+           lambda: run_checks(NumberValidator().compile_keywords(
+               {"minimum": 0, "maximum": 1000, "exclusiveMaximum": 999, "multipleOf": 0.5}, "#"),
+               [index * 0.5 for index in range(1000)]))
+    for width in sizes["width"]:
+        schema, data = wide_object(width)
+        yield (f"validators.objects.width[{width}]",
+               lambda schema=schema, data=data: run_checks(
+                   json_validator.object_validator.compile_keywords(schema, "#"), [data]))
+    for length in sizes["length"]:
+        schema, data = long_array(length)
+        yield (f"validators.arrays.length[{length}]",
+               lambda schema=schema, data=data: run_checks(
+                   json_validator.array_validator.compile_keywords(schema, "#"), [data]))
+    for branches in sizes["fanout"]:
+        for keyword in ("anyOf", "oneOf"):
+            schema, data = fanout(keyword, branches)
+            yield (f"validators.logic.{keyword}[{branches}]",
+                   lambda schema=schema, data=data: run_checks(
+                       json_validator.logic_validator.compile_keywords(schema["items"], "#/items"), data))
+
+    for depth in sizes["depth"]:
+        schema, data = deep_document(depth)
+        for engine in ("recursive", "iterative"):
+            yield (f"json_validator.depth[{depth}].{engine}",
+                   lambda schema=schema, data=data, engine=engine: compiled(schema, data, engine))
+    for count in sizes["document"]:
+        schema, data = records(count)
+        yield f"json_validator.records[{count}]", lambda schema=schema, data=data: compiled(schema, data)
+        yield f"json_validator.compile[{count}]", lambda schema=schema: lambda: json_validator.compile(schema)
+
+    for count in sizes["document"]:
+        text = json.dumps(records(count)[1], indent=2)
+        for backend in BACKENDS:
+            yield (f"parse.document[{count}].{backend}",
+                   lambda text=text, backend=backend: lambda: DocumentParser(backend).parse(text))
+        yield f"parse.source_map[{count}]", lambda text=text: lambda: OffsetIndex.build(text)
+
+    for count in sizes["document"]:
+        schema, data = records(count)
+        data[-1]["id"] = 0
+        body = json.dumps({"schema": json.dumps(schema), "json": json.dumps(data, indent=2)}).encode()
+        yield f"e2e.service[{count}]", lambda body=body: lambda: validate_body(body)
+        if importlib.util.find_spec("httpx") is not None:
+            yield f"e2e.http[{count}]", lambda body=body: http_validate(body)
+
+
+def http_validate(body: bytes) -> Callable[[], Any]:
+    from fastapi.testclient import TestClient
+    from backend.app.app import app
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    client = TestClient(app)
+    return lambda: client.post("/validate", content=body)
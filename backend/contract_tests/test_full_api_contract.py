@@ -221,5 +221,41 @@ def test_complex_mixed_scenario():
     assert "enum" in errors_str
     assert "oneOf" in errors_str
 
+def test_batch_validation():
+    schema = {"type": "object", "required": ["id"], "properties": {"id": {"type": "integer"}}}
+    documents = "\n".join(json.dumps(d) for d in [{"id": 1}, {"id": "x"}, {}])
+
+    resp = requests.post(API_URL + "/batch", json={"schema": json.dumps(schema), "documents": documents})
+    assert resp.status_code == 200
+    result = resp.json()
+    assert result["valid"] is False
+    assert [r["valid"] for r in result["results"]] == [True, False, False]
+    assert "Missing required property: id" in result["results"][2]["errors"][0]["message"]
+
+    resp = requests.post(API_URL + "/batch", json={"schema": json.dumps(schema), "documents": json.dumps([{"id": 1}]), "format": "json"})
+    assert resp.json() == {"valid": True, "results": [{"valid": True, "errors": []}]}
+
+def test_schema_registry():
+    schemas_url = API_URL.replace("/validate", "/schemas")
+    schema = {"type": "object", "required": ["id"]}
+
+    resp = requests.post(schemas_url, data=json.dumps(schema))
+    assert resp.status_code in (200, 201)
+    schema_id = resp.json()["id"]
+    assert requests.post(schemas_url, data=json.dumps(schema, indent=2)).json()["id"] == schema_id
+
+    resp = requests.post(API_URL, params={"schema_id": schema_id}, data='{\n"name": "x"\n}')
+    assert resp.json()["errors"][0]["message"] == "Missing required property: id"
+    assert requests.get(f"{schemas_url}/{schema_id}").json()["id"] == schema_id
+
+    assert requests.delete(f"{schemas_url}/{schema_id}").status_code == 204
+    assert requests.post(API_URL, params={"schema_id": schema_id}, data="{}").status_code == 404
+
+def test_metrics():
+    resp = requests.get(API_URL.replace("/validate", "/metrics"))
+    assert resp.status_code in (200, 404)
+    if resp.status_code == 200:
+        assert "# TYPE jsonschema_stage_seconds histogram" in resp.text
+
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
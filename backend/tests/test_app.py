@@ -0,0 +1,80 @@
+import json
+import multiprocessing
+import unittest
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from backend.app.app import app
+from backend.app.dependencies import metrics
+from backend.app.executor import ValidationExecutor
+from backend.app.metrics import ServiceMetrics
+
+
+class TestSchemaRegistryEndpoints(unittest.TestCase):
+    def setUp(self):
+        # Nothing runs inline, so registration and validation by id would both reach a worker process.
+        self.executor = ValidationExecutor("process", workers=1, inline_limit=0)
+        self.addCleanup(self.executor.shutdown)
+        patcher = patch("backend.app.app.validation_executor", self.executor)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = TestClient(app)
+
+    def test_process_executor(self):
+        schema = '{"items": {"type": "integer"}}'
+        response = self.client.post("/schemas", content=schema)
+        self.assertEqual(response.status_code, 201)
+        schema_id = response.json()["id"]
+        self.addCleanup(self.client.delete, f"/schemas/{schema_id}")
+
+        self.assertIn(schema_id, self.client.get("/schemas").json()["ids"])
+        self.assertEqual(self.client.get(f"/schemas/{schema_id}").json()["schema"], schema)
+
+        response = self.client.post("/validate", params={"schema_id": schema_id}, content='[\n1,\n"a"\n]')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["errors"][0]["line"], 2)
+        self.assertEqual(self.client.get(f"/schemas/{schema_id}").json()["uses"], 1)
+
+        self.assertEqual(self.client.delete(f"/schemas/{schema_id}").status_code, 204)
+        response = self.client.post("/validate", params={"schema_id": schema_id}, content="[1]")
+        self.assertEqual(response.status_code, 404)
+
+    def test_invalid_schemas(self):
+        for schema in ("{", "5", json.dumps([1, 2])):
+            self.assertEqual(self.client.post("/schemas", content=schema).status_code, 400)
+
+
+class TestOffloadedMetrics(unittest.TestCase):
+    def setUp(self):
+        if multiprocessing.get_start_method() != "fork":
+            self.skipTest("workers only inherit the patched metrics when forked")
+        self.metrics = ServiceMetrics(enabled=True, keyword_sample=1)
+        patched = ("request_seconds", "stage_seconds", "document_bytes", "validations", "offloaded_requests",
+                   "keyword_evaluations", "keyword_seconds", "keyword_tracer", "record_keywords")
+        patcher = patch.multiple(metrics, enabled=True, **{name: getattr(self.metrics, name) for name in patched})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # Created after metrics are patched, so a forked worker records into its copy of the same metrics.
+        self.executor = ValidationExecutor("process", workers=1, inline_limit=0)
+        self.addCleanup(self.executor.shutdown)
+        patcher = patch("backend.app.app.validation_executor", self.executor)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = TestClient(app)
+
+    def test_worker_stages_are_merged(self):
+        payload = {"schema": '{"items": {"type": "integer"}}', "json": '[1, "a"]'}
+        response = self.client.post("/validate", json=payload)
+        self.assertEqual(response.status_code, 200)
+
+        text = self.metrics.render()
+        self.assertIn('jsonschema_offloaded_requests_total{endpoint="validate"} 1\n', text)
+        for stage in ("parse", "source_map", "validation", "serialization"):
+            self.assertIn(f'jsonschema_stage_seconds_count{{stage="{stage}"}} 1\n', text)
+        self.assertIn('jsonschema_validations_total{valid="false"} 1\n', text)
+        self.assertIn('jsonschema_keyword_evaluations_total{keyword="items"} 1\n', text)
+
+
+if __name__ == "__main__":
+    unittest.main()
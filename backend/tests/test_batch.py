@@ -0,0 +1,83 @@
+import json
+import unittest
+
+from fastapi.testclient import TestClient
+
+from backend.app.app import app
+from backend.app.batch import BatchFormatError, split_documents, validate_batch
+from backend.app.dependencies import json_validator
+
+
+class TestValidateBatch(unittest.TestCase):
+    def setUp(self):
+        self.compiled = json_validator.compile({"type": "object", "properties": {"id": {"type": "integer"}}})
+
+    def test_ndjson(self):
+        documents = '{"id": 1}\n\n{"id": "x"}\n{"id": \n'
+        result = validate_batch(self.compiled, documents)
+
+        self.assertFalse(result["valid"])
+        self.assertEqual([r["valid"] for r in result["results"]], [True, False, False])
+        self.assertEqual(result["results"][1]["errors"][0]["line"], 2)
+        self.assertEqual(result["results"][1]["errors"][0]["path"], "#/properties/id/type")
+        self.assertIn("Invalid JSON", result["results"][2]["errors"][0]["message"])
+        self.assertEqual(result["results"][2]["errors"][0]["line"], 3)
+
+    def test_json_array(self):
+        documents = '[\n  {"id": 1},\n  {"id": 2.5},\n  []\n]'
+        result = validate_batch(self.compiled, documents, format="json")
+
+        self.assertEqual([r["valid"] for r in result["results"]], [True, False, False])
+        self.assertEqual(result["results"][1]["errors"][0]["line"], 2)
+        self.assertEqual(result["results"][2]["errors"][0]["line"], 3)
+
+    def test_all_valid(self):
+        result = validate_batch(self.compiled, '{"id": 1}\n{"id": 2}')
+        self.assertTrue(result["valid"])
+
+    def test_flag_mode(self):
+        result = validate_batch(self.compiled, '{"id": "x"}\n{"id": ', mode="flag")
+        self.assertEqual(result["results"], [{"valid": False, "errors": []}, {"valid": False, "errors": []}])
+
+    def test_invalid_json_array(self):
+        with self.assertRaises(BatchFormatError):
+            validate_batch(self.compiled, '{"id": 1}', format="json")
+        for documents in ('[{"id": 1}', '[{"id": 1},]', '[{"id": 1}] 2', '[{"id": 1} {"id": 2}]', '["a]', '[[[[[[1]]]]]'):
+            with self.assertRaises(BatchFormatError):
+                validate_batch(self.compiled, documents, format="json")
+
+    def test_invalid_json_array_element(self):
+        result = validate_batch(self.compiled, '[{"id": 1},\n{"id": 01},\ntru]', format="json")
+
+        self.assertEqual([r["valid"] for r in result["results"]], [True, False, False])
+        self.assertIn("Invalid JSON", result["results"][1]["errors"][0]["message"])
+        self.assertEqual(result["results"][2]["errors"][0]["line"], 2)
+
+    def test_split_json_array(self):
+        documents = ' [ {"id": [1,\n2]} ,\n"a" ,3\n]\n'
+        self.assertEqual(list(split_documents(documents, "json")), [('{"id": [1,\n2]}', 0), ('"a"', 2), ("3", 2)])
+        self.assertEqual(list(split_documents(" [ ] ", "json")), [])
+        self.assertEqual(list(split_documents(documents, "json", decode=True)),
+                         [('{"id": [1,\n2]}', 0, {"id": [1, 2]}), ('"a"', 2, "a"), ("3", 2, 3)])
+
+    def test_split_nested_json_array(self):
+        elements = [[[[[[1, "]"]]]]], {"a": [[{"b": [[["x", "{"]]]}]]}, "[", [], {}]
+        documents = json.dumps(elements, indent=2)
+        self.assertEqual([json.loads(text) for text, _ in split_documents(documents, "json")], elements)
+
+
+class TestBatchEndpoint(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(app)
+
+    def test_invalid_schema(self):
+        response = self.client.post("/validate/batch", json={"schema": '{"type":', "documents": "1"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Invalid JSON schema", response.json()["detail"])
+
+        response = self.client.post("/validate/batch", json={"schema": '{"pattern": "("}', "documents": '"a"'})
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
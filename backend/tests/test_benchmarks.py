@@ -0,0 +1,30 @@
+import unittest
+
+from backend.benchmarks.run import compare, run
+from backend.benchmarks.workloads import workloads
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_every_workload_runs(self):
+        for name, setup in workloads("quick"):
+            if name.startswith("e2e.http"):
+                continue
+            with self.subTest(name=name):
+                setup()()
+
+    def test_run_and_compare(self):
+        selected = [workload for workload in workloads("quick") if workload[0] == "validators.types.type"]
+        current = run(selected, repeat=1, min_time=0.01)
+        result = current["results"]["validators.types.type"]
+        self.assertGreater(result["median"], 0)
+        self.assertIn("python", current["meta"])
+
+        faster = {"results": {"validators.types.type": {"median": result["median"] * 2}}}
+        slower = {"results": {"validators.types.type": {"median": result["median"] / 2}}}
+        self.assertEqual(compare(faster, current), [])
+        self.assertEqual(compare(slower, current), ["validators.types.type"])
+        self.assertEqual(compare({"results": {}}, current), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
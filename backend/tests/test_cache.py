@@ -0,0 +1,53 @@
+import unittest
+from unittest.mock import Mock
+
+from backend.app.cache import SchemaCache
+from backend.app.validators.main import JSONValidator
+
+
+class TestSchemaCache(unittest.TestCase):
+    def setUp(self):
+        self.json_validator = Mock(spec=JSONValidator)
+        self.json_validator.compile.side_effect = lambda schema: Mock(schema=schema)
+        self.cache = SchemaCache(self.json_validator, max_size=2)
+
+    def test_hit_reuses_compiled_schema(self):
+        first = self.cache.get('{"type": "string"}')
+        second = self.cache.get('{"type": "string"}')
+
+        self.assertIs(first, second)
+        self.json_validator.compile.assert_called_once_with({"type": "string"})
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        self.assertEqual(self.cache.stats()["misses"], 1)
+
+    def test_evicts_least_recently_used(self):
+        self.cache.get('{"minimum": 1}')
+        self.cache.get('{"minimum": 2}')
+        self.cache.get('{"minimum": 1}')
+        self.cache.get('{"minimum": 3}')
+
+        stats = self.cache.stats()
+        self.assertEqual(stats["size"], 2)
+        self.assertEqual(stats["evictions"], 1)
+
+        self.cache.get('{"minimum": 1}')
+        self.assertEqual(self.cache.stats()["hits"], 2)
+        self.cache.get('{"minimum": 2}')
+        self.assertEqual(self.cache.stats()["misses"], 4)
+
+    def test_zero_size_disables_caching(self):
+        cache = SchemaCache(self.json_validator, max_size=0)
+        cache.get("{}")
+        cache.get("{}")
+
+        self.assertEqual(self.json_validator.compile.call_count, 2)
+        self.assertEqual(cache.stats()["size"], 0)
+
+    def test_invalid_schema_text_is_not_cached(self):
+        with self.assertRaises(ValueError):
+            self.cache.get("{not json")
+        self.assertEqual(self.cache.stats()["size"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import asyncio
+import threading
+import unittest
+
+from backend.app.executor import ValidationExecutor
+
+
+def current_thread_name(*args):
+    return threading.current_thread().name, args
+
+
+class TestValidationExecutor(unittest.TestCase):
+    def setUp(self):
+        self.executor = ValidationExecutor("thread", workers=1, inline_limit=100)
+        self.addCleanup(self.executor.shutdown)
+
+    def test_small_payload_runs_inline(self):
+        name, args = asyncio.run(self.executor.run(99, current_thread_name, 1, 2))
+        self.assertEqual(name, threading.current_thread().name)
+        self.assertEqual(args, (1, 2))
+
+    def test_large_payload_runs_in_executor(self):
+        name, args = asyncio.run(self.executor.run(100, current_thread_name, "body"))
+        self.assertTrue(name.startswith("validation"))
+        self.assertEqual(args, ("body",))
+
+    def test_process_executor(self):
+        executor = ValidationExecutor("process", workers=1, inline_limit=0)
+        self.addCleanup(executor.shutdown)
+        name, args = asyncio.run(executor.run(1, current_thread_name, "body"))
+        self.assertEqual(args, ("body",))
+
+    def test_run_local_stays_in_process(self):
+        executor = ValidationExecutor("process", workers=1, inline_limit=100)
+        self.addCleanup(executor.shutdown)
+        self.assertTrue(executor.shares_state(99))
+        self.assertFalse(executor.shares_state(100))
+        self.assertTrue(self.executor.shares_state(100))
+
+        name, args = asyncio.run(executor.run_local(100, current_thread_name, "body"))
+        self.assertNotEqual(name, threading.current_thread().name)
+        self.assertIsNone(executor._executor)
+
+    def test_unknown_kind(self):
+        with self.assertRaises(ValueError):
+            ValidationExecutor("fiber")
+
+
+if __name__ == "__main__":
+    unittest.main()
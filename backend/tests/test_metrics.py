@@ -0,0 +1,111 @@
+import json
+import unittest
+from unittest.mock import patch
+
+from backend.app.cache import SchemaCache
+from backend.app.dependencies import json_validator, metrics
+from backend.app.metrics import Counter, Histogram, ServiceMetrics, cache_collector
+from backend.app.service import validate_body
+
+
+def body(schema, document) -> bytes:
+    return json.dumps({"schema": schema, "json": document}).encode()
+
+
+class TestHistogram(unittest.TestCase):
+    def test_buckets_are_cumulative(self):
+        histogram = Histogram("latency", "Latency.", (0.1, 1.0), ("stage",))
+        histogram.observe(0.05, "parse")
+        histogram.observe(0.5, "parse")
+        histogram.observe(5, "parse")
+
+        lines = histogram.render()
+        self.assertEqual(lines[:2], ["# HELP latency Latency.", "# TYPE latency histogram"])
+        self.assertIn('latency_bucket{stage="parse",le="0.1"} 1', lines)
+        self.assertIn('latency_bucket{stage="parse",le="1.0"} 2', lines)
+        self.assertIn('latency_bucket{stage="parse",le="+Inf"} 3', lines)
+        self.assertIn('latency_sum{stage="parse"} 5.55', lines)
+        self.assertIn('latency_count{stage="parse"} 3', lines)
+
+    def test_label_escaping(self):
+        counter = Counter("evaluations", "Evaluations.", ("keyword",))
+        counter.inc(2, 'a"b\\')
+        self.assertEqual(counter.render()[-1], 'evaluations{keyword="a\\"b\\\\"} 2')
+
+
+    def test_drain_and_merge(self):
+        histogram = Histogram("latency", "Latency.", (0.1, 1.0), ("stage",))
+        histogram.observe(0.05, "parse")
+        histogram.observe(5, "parse")
+        merged = Histogram("latency", "Latency.", (0.1, 1.0), ("stage",))
+        merged.observe(0.5, "parse")
+
+        merged.merge(histogram.drain())
+        self.assertIn('latency_count{stage="parse"} 3', merged.render())
+        self.assertIn('latency_bucket{stage="parse",le="1.0"} 2', merged.render())
+        self.assertEqual(histogram.render()[2:], [])
+
+
+class TestServiceMetrics(unittest.TestCase):
+    def test_keyword_sampling(self):
+        service_metrics = ServiceMetrics(enabled=True, keyword_sample=3)
+        sampled = [service_metrics.keyword_tracer() is not None for _ in range(6)]
+        self.assertEqual(sampled, [False, False, True, False, False, True])
+
+        self.assertIsNone(ServiceMetrics(enabled=False, keyword_sample=1).keyword_tracer())
+        self.assertIsNone(ServiceMetrics(enabled=True, keyword_sample=0).keyword_tracer())
+
+    def test_drain_and_merge(self):
+        worker = ServiceMetrics(enabled=True)
+        worker.stage_seconds.observe(0.01, "parse")
+        worker.validations.inc(1, "true")
+        server = ServiceMetrics(enabled=True)
+
+        server.merge(worker.drain())
+        text = server.render()
+        self.assertIn('jsonschema_stage_seconds_count{stage="parse"} 1\n', text)
+        self.assertIn('jsonschema_validations_total{valid="true"} 1\n', text)
+        self.assertNotIn("jsonschema_validations_total{", worker.render())
+
+    def test_cache_collector(self):
+        cache = SchemaCache(json_validator, 4)
+        cache.get('{"type": "integer"}')
+        cache.get('{"type": "integer"}')
+        service_metrics = ServiceMetrics(enabled=True)
+        service_metrics.add_collector(cache_collector("schema_cache", cache))
+
+        text = service_metrics.render()
+        self.assertIn("jsonschema_schema_cache_hits_total 1\n", text)
+        self.assertIn("jsonschema_schema_cache_size 1\n", text)
+        self.assertIn("jsonschema_schema_cache_hit_ratio 0.5\n", text)
+
+
+class TestValidationMetrics(unittest.TestCase):
+    def setUp(self):
+        self.metrics = ServiceMetrics(enabled=True, keyword_sample=1)
+        patcher = patch.multiple(metrics, enabled=True, stage_seconds=self.metrics.stage_seconds,
+                                 validations=self.metrics.validations, keyword_tracer=self.metrics.keyword_tracer,
+                                 record_keywords=self.metrics.record_keywords)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_stages_and_keywords(self):
+        result = validate_body(body('{"items": {"type": "integer", "minimum": 0}}', '[\n1,\n"a"\n]'))
+        self.assertFalse(result["valid"])
+
+        text = self.metrics.render()
+        for stage in ("parse", "source_map", "validation"):
+            self.assertIn(f'jsonschema_stage_seconds_count{{stage="{stage}"}} 1\n', text)
+        self.assertIn('jsonschema_validations_total{valid="false"} 1\n', text)
+        self.assertIn('jsonschema_keyword_evaluations_total{keyword="items"} 1\n', text)
+        self.assertIn('jsonschema_keyword_evaluations_total{keyword="minimum"} 1\n', text)
+
+    def test_debug_trace_is_not_sampled(self):
+        result = validate_body(body('{"type": "integer"}', "1"), debug_trace="1")
+        self.assertIn("trace", result)
+        self.assertNotIn("jsonschema_keyword_evaluations_total{", self.metrics.render())
+
+    def test_disabled(self):
+        with patch.object(metrics, "enabled", False):
+            validate_body(body('{"type": "integer"}', "1"))
+        self.assertNotIn("jsonschema_stage_seconds_count", self.metrics.render())
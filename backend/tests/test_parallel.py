@@ -0,0 +1,46 @@
+import json
+import unittest
+
+from backend.app.batch import BatchFormatError, validate_batch
+from backend.app.dependencies import json_validator
+from backend.app.parallel import ParallelBatchValidator
+
+
+class TestParallelBatchValidator(unittest.TestCase):
+    def setUp(self):
+        self.schema = {"type": "object", "required": ["id"], "properties": {"id": {"type": "integer", "minimum": 0}}}
+        self.schema_text = json.dumps(self.schema)
+        self.validator = ParallelBatchValidator(workers=2, chunk_size=7, min_size=0)
+        self.addCleanup(self.validator.shutdown)
+
+    def test_matches_in_process_ndjson(self):
+        documents = "\n".join(json.dumps({"id": i - 10} if i % 5 else {}) for i in range(40)) + "\n{bad"
+
+        result = self.validator.validate_batch(self.schema_text, documents)
+        self.assertEqual(result, validate_batch(json_validator.compile(self.schema), documents))
+        self.assertEqual(len(result["results"]), 41)
+
+    def test_matches_in_process_json_array(self):
+        documents = json.dumps([{"id": i} if i % 3 else {"id": "x"} for i in range(30)], indent=2)
+
+        result = self.validator.validate_batch(self.schema_text, documents, format="json", max_errors=1)
+        self.assertEqual(result, validate_batch(json_validator.compile(self.schema), documents, format="json", max_errors=1))
+        self.assertEqual(result["results"][3]["errors"][0]["line"], 11)
+
+    def test_json_array_errors(self):
+        documents = "[" + ",".join(['{"id": 1}'] * 20 + ['{"id": 01}']) + "]"
+        result = self.validator.validate_batch(self.schema_text, documents, format="json")
+        self.assertEqual(result, validate_batch(json_validator.compile(self.schema), documents, format="json"))
+        self.assertFalse(result["results"][20]["valid"])
+
+        with self.assertRaises(BatchFormatError):
+            self.validator.validate_batch(self.schema_text, documents[:-1] + ",]", format="json")
+
+    def test_should_handle(self):
+        self.assertTrue(self.validator.should_handle("{}"))
+        self.assertFalse(ParallelBatchValidator(workers=0, min_size=0).should_handle("{}"))
+        self.assertFalse(ParallelBatchValidator(workers=2, min_size=10).should_handle("{}"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import math
+import unittest
+
+from backend.app.parsing import BACKENDS, DocumentParser
+from backend.app.source_map import LazySourceMap
+from backend.app.validators.context import NoSourceMap
+
+
+class TestDocumentParser(unittest.TestCase):
+    def test_value_and_positions(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                value, json_map = DocumentParser(backend).parse('{\n"a": [1,\n2]\n}', first_line=3)
+
+                self.assertEqual(value, {"a": [1, 2]})
+                self.assertIsInstance(json_map, LazySourceMap)
+                self.assertFalse(json_map.computed)
+                self.assertEqual(json_map.line("/a/1"), 5)
+
+    def test_without_positions(self):
+        value, json_map = DocumentParser().parse("[1]", positions=False)
+        self.assertEqual(value, [1])
+        self.assertIsInstance(json_map, NoSourceMap)
+
+    def test_accepts_the_same_documents_as_json(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                parser = DocumentParser(backend)
+                self.assertTrue(math.isnan(parser.parse("NaN")[0]))
+                self.assertEqual(parser.parse(str(2 ** 70))[0], 2 ** 70)
+                with self.assertRaisesRegex(ValueError, "Expecting value"):
+                    parser.parse("[1,]")
+
+    def test_backend_selection(self):
+        self.assertIn(DocumentParser().backend, BACKENDS)
+        self.assertEqual(DocumentParser("json").backend, "json")
+        with self.assertRaises(ValueError):
+            DocumentParser("yaml")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+from unittest.mock import Mock
+
+from backend.app.registry import RegistryFull, SchemaNotFound, SchemaRegistry
+from backend.app.validators.base import SchemaError
+from backend.app.validators.main import JSONValidator
+
+
+class TestSchemaRegistry(unittest.TestCase):
+    def setUp(self):
+        self.json_validator = Mock(spec=JSONValidator)
+        self.json_validator.compile.side_effect = lambda schema: Mock(schema=schema, diagnostics=[])
+        self.registry = SchemaRegistry(self.json_validator, max_size=2)
+
+    def test_id_is_stable_across_formatting(self):
+        schema_id, created = self.registry.register('{"type": "string", "minLength": 1}')
+        same_id, created_again = self.registry.register('{\n  "minLength": 1,\n  "type": "string"\n}')
+
+        self.assertEqual(schema_id, same_id)
+        self.assertTrue(created)
+        self.assertFalse(created_again)
+        self.json_validator.compile.assert_called_once_with({"type": "string", "minLength": 1})
+
+    def test_get_returns_prepared_schema(self):
+        schema_id, _ = self.registry.register('{"type": "string"}')
+
+        self.assertIs(self.registry.get(schema_id), self.registry.get(schema_id))
+        self.assertEqual(self.registry.describe(schema_id),
+                         {"id": schema_id, "schema": '{"type": "string"}', "uses": 2, "diagnostics": []})
+
+    def test_describe_reports_diagnostics(self):
+        diagnostics = [{"path": "#/properties/a", "message": "minLength (3) is greater than maxLength (1)"}]
+        self.json_validator.compile.side_effect = lambda schema: Mock(schema=schema, diagnostics=diagnostics)
+        schema_id, _ = self.registry.register('{"properties": {"a": {"minLength": 3, "maxLength": 1}}}')
+        self.assertEqual(self.registry.describe(schema_id)["diagnostics"], diagnostics)
+
+    def test_source_counts_uses(self):
+        schema_id, _ = self.registry.register('{"type": "string"}')
+
+        self.assertEqual(self.registry.source(schema_id), '{"type": "string"}')
+        self.assertEqual(self.registry.describe(schema_id)["uses"], 1)
+        with self.assertRaises(SchemaNotFound):
+            self.registry.source("missing")
+
+    def test_rejects_non_object_schema(self):
+        for schema_text in ("5", "[1, 2]", '"string"', "null"):
+            with self.assertRaises(SchemaError):
+                self.registry.register(schema_text)
+        self.json_validator.compile.assert_not_called()
+        self.assertEqual(self.registry.stats()["size"], 0)
+
+    def test_delete(self):
+        schema_id, _ = self.registry.register('{"type": "string"}')
+        self.registry.delete(schema_id)
+
+        for operation in (self.registry.get, self.registry.describe, self.registry.delete):
+            with self.assertRaises(SchemaNotFound):
+                operation(schema_id)
+
+    def test_size_cap(self):
+        first, _ = self.registry.register('{"minimum": 1}')
+        self.registry.register('{"minimum": 2}')
+
+        with self.assertRaises(RegistryFull):
+            self.registry.register('{"minimum": 3}')
+        self.assertEqual(self.registry.register('{"minimum": 1}'), (first, False))
+
+        self.registry.delete(first)
+        self.registry.register('{"minimum": 3}')
+        self.assertEqual(self.registry.stats()["size"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
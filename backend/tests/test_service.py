@@ -0,0 +1,100 @@
+import json
+import unittest
+
+from backend.app.dependencies import schema_registry
+from backend.app.registry import SchemaNotFound
+from backend.app.service import (BadRequest, InvalidRequest, register_schema, validate_body, validate_registered,
+                                 validate_request)
+from backend.app.validators.base import SchemaError
+
+
+def body(schema, document) -> bytes:
+    return json.dumps({"schema": schema, "json": document}).encode()
+
+
+class TestValidateBody(unittest.TestCase):
+    def test_valid(self):
+        result = validate_body(body('{"type": "integer"}', "1"))
+        self.assertEqual(result, {"valid": True, "errors": []})
+
+    def test_errors_have_lines(self):
+        result = validate_body(body('{"items": {"type": "integer"}}', '[\n1,\n"a"\n]'))
+        self.assertFalse(result["valid"])
+        self.assertEqual(result["errors"][0]["line"], 2)
+
+    def test_keys_with_special_characters(self):
+        schema = '{"properties": {"a/b": {"properties": {"~c": {"type": "integer"}}}}}'
+        result = validate_body(body(schema, '{\n"a/b": {\n"~c": "x"\n}\n}'))
+        self.assertEqual(result["errors"][0]["line"], 2)
+
+        result = validate_body(body(schema, '{"a/b": {"~c": 1}}'), debug_trace="1")
+        self.assertIn("/a~1b/~0c", [event["path_json"] for event in result["trace"]["events"]])
+        self.assertIn("#/properties/a~1b/properties/~0c", [event["path"] for event in result["trace"]["events"]])
+
+    def test_iterative_engine(self):
+        document = '[\n1,\n"a"\n]'
+        expected = validate_body(body('{"items": {"type": "integer"}}', document))
+        self.assertEqual(validate_body(body('{"items": {"type": "integer"}}', document), engine="iterative"), expected)
+
+    def test_profile(self):
+        plain = validate_body(body('{"items": {"type": "integer"}}', '[1, "a"]'))
+        result = validate_body(body('{"items": {"type": "integer"}}', '[1, "a"]'), profile=True)
+        self.assertEqual(result.pop("profile")["schemas"]["#/items"]["calls"], 2)
+        self.assertEqual(result, plain)
+
+        result = validate_body(body('{"type": "integer"}', "1"), debug_trace="1", profile=True)
+        self.assertIn("trace", result)
+        self.assertEqual(result["profile"]["keywords"]["type"]["calls"], 1)
+
+    def test_memo(self):
+        schema = '{"$defs": {"a": {"minimum": 0}}, "allOf": [{"$ref": "#/$defs/a"}], "not": {"$ref": "#/$defs/a"}}'
+        result = validate_body(body(schema, "1"), memo=True)
+        self.assertEqual(result.pop("memo")["hits"], 1)
+        self.assertEqual(result, validate_body(body(schema, "1")))
+
+    def test_trace(self):
+        result = validate_body(body('{"type": "integer"}', "1"), debug_trace="1")
+        self.assertEqual(result["trace"]["events"][-1]["event"], "schema")
+
+    def test_invalid_envelope(self):
+        with self.assertRaises(InvalidRequest) as context:
+            validate_body(b'{"schema": "{}"}')
+        self.assertEqual(context.exception.errors[0]["loc"], ("body", "json"))
+
+    def test_invalid_document_and_schema(self):
+        with self.assertRaises(BadRequest):
+            validate_body(body("{}", "[1"))
+        with self.assertRaises(BadRequest):
+            validate_body(body("{", "1"))
+        with self.assertRaises(SchemaError):
+            validate_body(body('{"pattern": "("}', '"a"'))
+
+    def test_non_object_subschemas(self):
+        cases = [('{"items": 5}', '{"a": 1}', "#/items"), ('{"properties": {"a": 3}}', '{"b": 1}', "#/properties/a"),
+                 ('{"anyOf": [{"type": "string"}, 7]}', '"x"', "#/anyOf/1"), ("[1]", "1", "#"), ("5", "1", "#")]
+        for schema, document, path in cases:
+            with self.subTest(schema=schema), self.assertRaises(SchemaError) as context:
+                validate_request(document, schema)
+            self.assertEqual(str(context.exception), f"Schema at {path} must be an object")
+
+
+class TestValidateRegistered(unittest.TestCase):
+    def test_validate_by_id(self):
+        schema_id, _ = register_schema(b'{"items": {"type": "integer"}}')
+        self.addCleanup(schema_registry.delete, schema_id)
+
+        result = validate_registered(b'[\n1,\n"a"\n]', schema_id)
+        self.assertEqual(result["errors"][0]["line"], 2)
+        self.assertEqual(validate_registered(b"[1]", schema_id, mode="flag"), {"valid": True, "errors": []})
+
+    def test_errors(self):
+        with self.assertRaises(SchemaNotFound):
+            validate_registered(b"1", "missing")
+        with self.assertRaises(BadRequest):
+            register_schema(b"{")
+        with self.assertRaises(SchemaError):
+            register_schema(b'{"$ref": "#/missing"}')
+
+
+if __name__ == "__main__":
+    unittest.main()
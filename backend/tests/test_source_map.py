@@ -0,0 +1,69 @@
+import json
+import unittest
+from unittest.mock import patch
+
+from backend.app.source_map import LazySourceMap, OffsetIndex
+
+
+class TestOffsetIndex(unittest.TestCase):
+    def setUp(self):
+        self.text = json.dumps({
+            "name": "a",
+            "items": [1, {"id": 2, "tags": ["x", "y"]}],
+            "a/b": {"c": None},
+            "esc\"aped": "s,]}:"
+        }, indent=2)
+        self.index = OffsetIndex.build(self.text)
+
+    def test_root(self):
+        self.assertEqual(self.index.line(""), 0)
+
+    def test_object_members_report_key_line(self):
+        self.assertEqual(self.index.line("/name"), 1)
+        self.assertEqual(self.index.line("/items"), 2)
+
+    def test_array_items(self):
+        self.assertEqual(self.index.line("/items/0"), 3)
+        self.assertEqual(self.index.line("/items/1"), 4)
+        self.assertEqual(self.index.line("/items/1/tags/1"), 8)
+
+    def test_keys_with_special_characters(self):
+        self.assertEqual(self.index.line("/a~1b/c"), 13)
+        self.assertEqual(self.index.line('/esc"aped'), 15)
+        with self.assertRaises(KeyError):
+            self.index.line("/a/b/c")
+
+    def test_instance_path_frames(self):
+        self.assertEqual(self.index.line(((((), "items"), 1), "tags")), 6)
+        self.assertEqual(self.index.line((((), "a/b"), "c")), 13)
+        self.assertEqual(self.index.line(()), 0)
+
+    def test_unknown_path(self):
+        for path_json in ("/missing", "/items/5", "/items/x", "/name/0"):
+            with self.assertRaises(KeyError):
+                self.index.line(path_json)
+
+    def test_compact_document(self):
+        index = OffsetIndex.build('[1,[2,3],{"a":[]},4]')
+        self.assertEqual(list(index.value_starts), [0, 1, 3, 4, 6, 9, 14, 18])
+        self.assertEqual(list(index.ends), [8, 2, 5, 4, 5, 7, 7, 8])
+        self.assertEqual(index.line("/3"), 0)
+
+
+class TestLazySourceMap(unittest.TestCase):
+    def test_not_computed_until_first_lookup(self):
+        with patch.object(OffsetIndex, "build") as build:
+            json_map = LazySourceMap('{"a": 1}')
+            self.assertFalse(json_map.computed)
+            build.assert_not_called()
+
+    def test_computed_once(self):
+        json_map = LazySourceMap('{\n  "a": [\n    1,\n    2\n  ]\n}')
+        with patch.object(OffsetIndex, "build", wraps=OffsetIndex.build) as build:
+            self.assertEqual(json_map.line("/a"), 1)
+            self.assertEqual(json_map.line("/a/1"), 3)
+            build.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+
+from backend.app.dependencies import json_validator
+from backend.app.source_map import LazySourceMap
+from backend.app.tracing import ProfilingTracer, RecordingTracer
+
+
+class TestRecordingTracer(unittest.TestCase):
+    def test_records_keyword_and_schema_events(self):
+        compiled = json_validator.compile({"type": "array", "items": {"minimum": 2}})
+        tracer = RecordingTracer()
+        result = compiled.validate([1, 3], LazySourceMap("[1, 3]"), tracer=tracer)
+
+        self.assertFalse(result["valid"])
+        keywords = [(e["keyword"], e["path_json"], e["valid"]) for e in tracer.events if e["event"] == "keyword"]
+        self.assertIn(("minimum", "/0", False), keywords)
+        self.assertIn(("minimum", "/1", True), keywords)
+        self.assertEqual(keywords[-1], ("items", "", False))
+        self.assertEqual(tracer.events[-1], {"event": "schema", "path": "#", "path_json": "", "valid": False})
+
+    def test_traced_result_matches_untraced(self):
+        compiled = json_validator.compile({"anyOf": [{"type": "string"}, {"maximum": 1}], "not": {"const": 5}})
+        for data in (5, 0, "x", 3):
+            text = str(data) if not isinstance(data, str) else f'"{data}"'
+            self.assertEqual(compiled.validate(data, LazySourceMap(text), tracer=RecordingTracer()),
+                             compiled.validate(data, LazySourceMap(text)))
+
+    def test_drops_events_over_limit(self):
+        compiled = json_validator.compile({"items": {"type": "integer"}})
+        tracer = RecordingTracer(max_events=3)
+        compiled.validate([1, 2, 3], LazySourceMap("[1, 2, 3]"), tracer=tracer)
+
+        self.assertEqual(len(tracer.events), 3)
+        self.assertEqual(tracer.report()["dropped"], 8)
+
+
+class TestProfilingTracer(unittest.TestCase):
+    schema = {"properties": {"tags": {"items": {"anyOf": [{"type": "integer"}, {"pattern": "^a"}]}}}}
+    document = '{"tags": [1, "ab", "b"]}'
+
+    def test_counts_per_schema_and_keyword(self):
+        compiled = json_validator.compile(self.schema)
+        for engine in ("recursive", "iterative"):
+            with self.subTest(engine=engine):
+                tracer = ProfilingTracer()
+                compiled.validate({"tags": [1, "ab", "b"]}, LazySourceMap(self.document), tracer=tracer, engine=engine)
+                report = tracer.report()
+
+                self.assertEqual(report["schemas"]["#/properties/tags/items"]["calls"], 3)
+                branch = report["schemas"]["#/properties/tags/items/anyOf/1"]
+                self.assertEqual(branch["calls"], 2)
+                self.assertEqual(branch["keywords"]["pattern"]["calls"], 2)
+                self.assertEqual(report["keywords"]["anyOf"]["calls"], 3)
+                root = report["schemas"]["#"]
+                self.assertLessEqual(root["self_seconds"], root["seconds"])
+
+    def test_hottest_is_bounded_and_sorted(self):
+        compiled = json_validator.compile(self.schema)
+        tracer = ProfilingTracer(top=2)
+        compiled.validate({"tags": [1, "ab", "b"]}, LazySourceMap(self.document), tracer=tracer)
+
+        hottest = tracer.report()["hottest"]
+        self.assertEqual(len(hottest), 2)
+        self.assertGreaterEqual(hottest[0]["self_seconds"], hottest[1]["self_seconds"])
+
+    def test_unbalanced_branch_is_skipped(self):
+        compiled = json_validator.compile({"anyOf": [{"items": {"type": "string"}}, {"type": "array"}]})
+        tracer = ProfilingTracer()
+        result = compiled.validate([1, 2], LazySourceMap("[1, 2]"), tracer=tracer, max_errors=1)
+
+        self.assertTrue(result["valid"])
+        self.assertEqual(tracer.report()["schemas"]["#"]["calls"], 1)
+        self.assertEqual(tracer._nodes, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,16 +1,16 @@
 import unittest
-from unittest.mock import Mock, MagicMock
-from backend.app.validators.arrays import ArrayValidator
-from backend.app.validators.main import JSONValidator
+from unittest.mock import patch
+from backend.app.dependencies import json_validator
+from backend.app.validators.base import Validator
 
 
 class TestArrayValidator(unittest.TestCase):
     def setUp(self):
-        self.json_validator = Mock(spec=JSONValidator)
-        self.json_validator.validate.return_value = {"valid": True, "errors": []}
+        patcher = patch.object(Validator, "get_line", return_value=1)
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
-        self.validator = ArrayValidator(json_validator=self.json_validator)
-        self.validator.get_line = MagicMock(return_value=1)
+        self.validator = json_validator.array_validator
         self.path = "#"
         self.path_json = ""
         self.json_map = {}
@@ -34,12 +34,11 @@ class TestArrayValidator(unittest.TestCase):
         schema = {"items": { "type": "string" }}
         data = [7]
 
-        self.json_validator.validate.return_value = {"valid": False, "errors": [{"message": "Mock error"}]}
-        
         result = self.validator.validate(data, schema, self.path, self.path_json, self.json_map)
         self.assertFalse(result["valid"])
         self.assertEqual(len(result["errors"]), 1)
-        self.assertEqual(result["errors"][0]["message"], "Mock error")
+        self.assertEqual(result["errors"][0]["message"], "Data does not match any of the allowed types")
+        self.assertEqual(result["errors"][0]["path"], self.path + "/items/type")
 
     def test_minItems_violation(self):
         schema = {"minItems" : 3}
@@ -0,0 +1,264 @@
+import inspect
+import sys
+import unittest
+from collections import OrderedDict
+from unittest.mock import Mock, patch
+
+from backend.app.tracing import RecordingTracer, Tracer
+from backend.app.validators.arrays import ArrayValidator
+from backend.app.validators.base import Validator
+from backend.app.validators.compiled import ENGINES
+from backend.app.validators.logic import LogicValidator
+from backend.app.validators.main import JSONValidator
+from backend.app.validators.numbers import NumberValidator
+from backend.app.validators.objects import ObjectValidator
+from backend.app.validators.strings import StringValidator
+from backend.app.validators.types import TypeValidator
+
+
+class TestCompiledSchema(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.object(Validator, "get_line", return_value=1)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.json_validator = JSONValidator(None, None, None, None, None, None)
+        self.json_validator.type_validator = TypeValidator()
+        self.json_validator.object_validator = ObjectValidator(self.json_validator)
+        self.json_validator.array_validator = ArrayValidator(self.json_validator)
+        self.json_validator.string_validator = StringValidator()
+        self.json_validator.number_validator = NumberValidator()
+        self.json_validator.logic_validator = LogicValidator(self.json_validator)
+        self.json_map = {}
+
+    def assertSameAsValidate(self, schema, data):
+        expected = self.json_validator.validate(data, schema, "#", "", self.json_map)
+        compiled = self.json_validator.compile(schema)
+        result = compiled.validate(data, self.json_map)
+        self.assertEqual(result, expected)
+        self.assertEqual(compiled.validate(data, self.json_map, engine="iterative"), expected)
+        for engine in ENGINES:
+            memoized = compiled.validate(data, self.json_map, engine=engine, memo_size=2)
+            self.assertIn("memo", memoized)
+            self.assertEqual({**memoized, "memo": None}, {**expected, "memo": None})
+        return result
+
+    def test_only_present_keywords_are_compiled(self):
+        compiled = self.json_validator.compile({"type": "string", "minLength": 2})
+        self.assertEqual(len(compiled.type_checks), 1)
+        self.assertEqual(list(compiled.typed_checks), [str, int, float])
+        self.assertIs(compiled.typed_checks[int], compiled.typed_checks[float])
+        self.assertEqual(compiled.logic_checks, {})
+
+    def test_compiled_schema_is_reusable(self):
+        compiled = self.json_validator.compile({"type": "array", "items": {"type": "integer", "minimum": 0}})
+        self.assertTrue(compiled.validate([1, 2, 3], self.json_map)["valid"])
+        result = compiled.validate([1, -1, "a"], self.json_map)
+        self.assertFalse(result["valid"])
+        self.assertEqual([e["path"] for e in result["errors"]], ["#/items/minimum", "#/items/type"])
+        self.assertTrue(compiled.validate([], self.json_map)["valid"])
+
+    def test_lines_are_only_resolved_for_reported_errors(self):
+        schema = {"items": {"anyOf": [{"type": "string"}, {"minimum": 0}], "not": {"const": 1}}}
+        result = self.json_validator.compile(schema).validate([-1, 2, 3, 1], self.json_map, max_errors=1)
+
+        self.assertEqual(len(result["errors"]), 1)
+        self.assertEqual(Validator.get_line.call_count, 3)
+
+    def test_exact_type_dispatch(self):
+        schema = {"type": ["integer", "object"], "minimum": 2, "minProperties": 1}
+        for data in (True, 1, 3, 1.5, float("nan"), {}, {"a": 1}, None):
+            self.assertSameAsValidate(schema, data)
+        self.assertSameAsValidate({"type": "number", "maximum": 1}, float("inf"))
+
+    def test_subclassed_containers(self):
+        schema = {"type": "object", "required": ["a"]}
+        self.assertSameAsValidate(schema, OrderedDict(b=1))
+
+    def test_type_failure_skips_remaining_checks(self):
+        result = self.assertSameAsValidate({"type": "string", "minLength": 5, "not": {"type": "integer"}}, 3)
+        self.assertEqual(len(result["errors"]), 1)
+
+    def test_objects(self):
+        schema = {
+            "type": "object",
+            "required": ["id", "name"],
+            "properties": {"id": {"type": "integer"}, "tags": {"items": {"type": "string"}}},
+            "additionalProperties": {"type": "string", "maxLength": 2},
+            "maxProperties": 3
+        }
+        self.assertSameAsValidate(schema, {"id": 1, "tags": ["a", 2], "extra": "long", "more": 1})
+        self.assertSameAsValidate({"additionalProperties": False}, {"a": 1})
+
+    def test_logic(self):
+        schema = {
+            "allOf": [{"type": "integer"}, {"minimum": 5}],
+            "oneOf": [{"multipleOf": 3}, {"multipleOf": 5}],
+            "anyOf": [{"maximum": 10}, {"minimum": 20}],
+            "not": {"const": 15}
+        }
+        for data in (6, 10, 15, 1, 13):
+            self.assertSameAsValidate(schema, data)
+
+    def test_discriminated_branches(self):
+        branches = [
+            {"properties": {"kind": {"const": "a"}, "v": {"type": "string"}}, "required": ["kind"]},
+            {"properties": {"kind": {"enum": ["b", "c"]}, "v": {"type": "integer"}}},
+            {"properties": {"kind": {"const": [1]}, "v": {"minimum": 0}}}
+        ]
+        documents = ({"kind": "a", "v": "x"}, {"kind": "a", "v": 1}, {"kind": "c", "v": 1}, {"kind": "b", "v": "x"},
+                     {"kind": [1], "v": 1}, {"kind": [1.0], "v": -1}, {"kind": "d"}, {"v": 1}, {}, [], "a")
+        for keyword in ("anyOf", "oneOf"):
+            for data in documents:
+                with self.subTest(keyword=keyword, data=data):
+                    self.assertSameAsValidate({keyword: branches}, data)
+
+    def test_discriminator_evaluates_one_branch(self):
+        branches = [{"properties": {"kind": {"const": index}}} for index in range(40)]
+        compiled = self.json_validator.compile({"oneOf": branches})
+        for engine in ENGINES:
+            tracer = RecordingTracer()
+            self.assertTrue(compiled.validate({"kind": 39}, self.json_map, tracer=tracer, engine=engine)["valid"])
+            schemas = [event["path"] for event in tracer.events if event["event"] == "schema"]
+            self.assertEqual(schemas, ["#/oneOf/39/properties/kind", "#/oneOf/39", "#"])
+
+    def test_memo_reuses_shared_subschemas(self):
+        schema = {
+            "$defs": {"code": {"type": "string", "pattern": "^[A-Z]+$"}},
+            "items": {
+                "allOf": [{"$ref": "#/$defs/code"}],
+                "anyOf": [{"$ref": "#/$defs/code"}, {"type": "integer"}],
+                "not": {"$ref": "#/$defs/code", "maxLength": 1}
+            }
+        }
+        compiled = self.json_validator.compile(schema)
+        for data in (["AB", "x", 3, "Q"], ["AB", "CD"]):
+            expected = compiled.validate(data, self.json_map)
+            for engine in ENGINES:
+                result = compiled.validate(data, self.json_map, engine=engine, memo_size=100)
+                self.assertEqual({**result, "memo": None}, {**expected, "memo": None})
+
+        for engine in ENGINES:
+            with self.subTest(engine=engine):
+                memo = compiled.validate(["AB", "x"], self.json_map, engine=engine, memo_size=100)["memo"]
+                self.assertEqual(memo, {"hits": 4, "misses": 7, "size": 7, "max_size": 100})
+
+    def test_memo_is_bounded(self):
+        schema = {"$defs": {"a": {"minimum": 0}}, "items": {"allOf": [{"$ref": "#/$defs/a"}], "not": {"$ref": "#/$defs/a"}}}
+        compiled = self.json_validator.compile(schema)
+        memo = compiled.validate(list(range(10)), self.json_map, memo_size=3)["memo"]
+        self.assertEqual(memo, {"hits": 10, "misses": 20, "size": 3, "max_size": 3})
+
+    def test_optimized_keywords(self):
+        schemas = [
+            {"allOf": [{}, {"allOf": [{"minimum": 2}, {"allOf": [{"multipleOf": 2}]}]}, {"title": "x"}]},
+            {"anyOf": [{"type": "string"}, {}]},
+            {"anyOf": [{"enum": []}, {"type": "string"}, {"type": "integer", "minimum": 3, "maximum": 1}]},
+            {"oneOf": [{"type": []}, {"minimum": 2}, {"multipleOf": 2}]},
+            {"not": {}},
+            {"not": {"enum": []}},
+            {"not": {"not": {"minimum": 2}}},
+            {"if": {}, "then": {"minimum": 2}, "else": {"maximum": 0}},
+            {"if": {"not": {}}, "then": {"minimum": 2}, "else": {"maximum": 0}}
+        ]
+        for schema in schemas:
+            for data in (1, 2, 4, "a", float("nan"), float("inf")):
+                with self.subTest(schema=schema, data=data):
+                    self.assertSameAsValidate(schema, data)
+
+    def test_flattened_all_of_skips_wrappers(self):
+        compiled = self.json_validator.compile({"allOf": [{}, {"allOf": [{"allOf": [{"minimum": 2}]}]}]})
+        for engine in ENGINES:
+            tracer = RecordingTracer()
+            result = compiled.validate(1, self.json_map, tracer=tracer, engine=engine)
+            self.assertEqual([error["path"] for error in result["errors"]], ["#/allOf/1/allOf/0/allOf/0/minimum"])
+            schemas = [event["path"] for event in tracer.events if event["event"] == "schema"]
+            self.assertEqual(schemas, ["#/allOf/1/allOf/0/allOf/0", "#"])
+
+    def test_diagnostics(self):
+        compiled = self.json_validator.compile({"items": {"type": "number", "minimum": 5, "maximum": 1}})
+        self.assertEqual(compiled.diagnostics, [
+            {"path": "#/items", "message": "minimum (5) and maximum (1) leave no valid number"}
+        ])
+        self.assertEqual(self.json_validator.compile({"minimum": 1}).diagnostics, [])
+
+    def test_numeric_arrays(self):
+        schema = {"type": "array", "items": {"type": "number", "minimum": 0, "maximum": 1, "multipleOf": 0.5}}
+        valid = [0.5 * (i % 3) for i in range(2000)]
+        for data in (valid, valid[:20], valid[:-1] + [1.5], valid[:20] + [-0.5, 0.3], valid[:5] + [True, "a", None]):
+            self.assertSameAsValidate(schema, data)
+
+        tracer = RecordingTracer()
+        self.json_validator.compile(schema).validate(valid[:20], self.json_map, tracer=tracer)
+        self.assertEqual(sum(event["path"] == "#/items" for event in tracer.events if event["event"] == "schema"), 20)
+
+    def test_if_then_else(self):
+        schema = {"if": {"minimum": 5}, "then": {"multipleOf": 2}, "else": {"multipleOf": 3}}
+        for data in (4, 6, 7, 9):
+            self.assertSameAsValidate(schema, data)
+
+    def test_non_finite_number(self):
+        result = self.assertSameAsValidate({"minimum": 3, "multipleOf": 2}, float("nan"))
+        self.assertEqual(result["errors"][0]["message"], "Data is not a valid finite number")
+
+    def test_flag_mode_stops_at_first_failure(self):
+        compiled = self.json_validator.compile({"items": {"type": "integer"}})
+        tracer = Mock(spec=Tracer)
+        result = compiled.validate(["a", "b"] + list(range(1000)), self.json_map, tracer=tracer, mode="flag")
+
+        self.assertEqual(result, {"valid": False, "errors": []})
+        self.assertEqual([c.args[1] for c in tracer.node_start.call_args_list], [(), ((), 0)])
+
+    def test_flag_mode_keeps_logic_results(self):
+        schema = {"anyOf": [{"type": "string", "minLength": 3}, {"minimum": 5}], "not": {"const": 7}}
+        for data in ("ab", "abc", 4, 5, 7):
+            expected = self.json_validator.validate(data, schema, "#", "", self.json_map)["valid"]
+            self.assertEqual(self.json_validator.compile(schema).validate(data, self.json_map, mode="flag"),
+                             {"valid": expected, "errors": []})
+
+    def test_max_errors(self):
+        compiled = self.json_validator.compile({"items": {"type": "integer"}, "maxItems": 1})
+        data = ["a", "b", "c"]
+        full = compiled.validate(data, self.json_map)
+        self.assertEqual(len(full["errors"]), 4)
+
+        for max_errors in (1, 2, 4, 10):
+            result = compiled.validate(data, self.json_map, max_errors=max_errors)
+            self.assertEqual(result["errors"], full["errors"][:max_errors])
+            result = compiled.validate(data, self.json_map, max_errors=max_errors, engine="iterative")
+            self.assertEqual(result["errors"], full["errors"][:max_errors])
+
+    def test_iterative_engine_flag_mode(self):
+        schema = {"items": {"anyOf": [{"items": {"type": "string"}}, {"items": {"minimum": 5}}]}}
+        compiled = self.json_validator.compile(schema)
+        for data in ([["a", 6]], [["a"], [5, 6]], [[], [1, "a"]]):
+            self.assertEqual(compiled.validate(data, self.json_map, mode="flag", engine="iterative"),
+                             compiled.validate(data, self.json_map, mode="flag"))
+
+    def test_iterative_engine_uses_bounded_stack(self):
+        schema, data = {"type": "integer"}, 1
+        for _ in range(200):
+            schema, data = {"type": "array", "items": schema}, [data]
+        compiled = self.json_validator.compile(schema)
+
+        limit = sys.getrecursionlimit()
+        self.addCleanup(sys.setrecursionlimit, limit)
+        sys.setrecursionlimit(len(inspect.stack()) + 100)
+        self.assertTrue(compiled.validate(data, self.json_map, engine="iterative")["valid"])
+        with self.assertRaises(RecursionError):
+            compiled.validate(data, self.json_map)
+
+    def test_invalid_mode(self):
+        compiled = self.json_validator.compile({})
+        with self.assertRaises(ValueError):
+            compiled.validate(1, self.json_map, mode="quick")
+        with self.assertRaises(ValueError):
+            compiled.validate(1, self.json_map, max_errors=0)
+        with self.assertRaises(ValueError):
+            compiled.validate(1, self.json_map, engine="fast")
+        with self.assertRaises(ValueError):
+            compiled.validate(1, self.json_map, memo_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+from collections import OrderedDict
+from unittest.mock import Mock
+
+from backend.app.validators.dispatcher import ValidatorDispatcher
+
+
+class TestValidatorDispatcher(unittest.TestCase):
+    def setUp(self):
+        self.object_validator = Mock()
+        self.number_validator = Mock()
+        self.dispatcher = ValidatorDispatcher()
+        self.dispatcher.register((dict,), lambda: self.object_validator)
+        self.dispatcher.register((int, float), lambda: self.number_validator)
+        self.dispatcher.register((bool, type(None)), None)
+
+    def test_exact_types(self):
+        self.assertIs(self.dispatcher.get_validator({}), self.object_validator)
+        self.assertIs(self.dispatcher.get_validator(1), self.number_validator)
+        self.assertIs(self.dispatcher.get_validator(1.5), self.number_validator)
+        self.assertEqual(self.dispatcher.data_types, (dict, int, float, bool, type(None)))
+
+    def test_bool_is_not_a_number(self):
+        self.assertIsNone(self.dispatcher.get_validator(True))
+        self.assertIsNone(self.dispatcher.get_validator(None))
+
+    def test_unregistered_and_subclassed_types(self):
+        self.assertIsNone(self.dispatcher.get_validator("a"))
+        self.assertNotIn(OrderedDict, self.dispatcher)
+        self.assertEqual(self.dispatcher.resolve_type(OrderedDict), dict)
+        self.assertIs(self.dispatcher.get_validator(OrderedDict()), self.object_validator)
+
+
+if __name__ == "__main__":
+    unittest.main()
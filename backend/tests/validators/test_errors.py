@@ -0,0 +1,34 @@
+import unittest
+from unittest.mock import Mock
+
+from backend.app.validators.errors import ErrorRecord, render_errors, truncate
+
+
+class TestErrorRecord(unittest.TestCase):
+    def test_truncate(self):
+        self.assertEqual(truncate(12), "12")
+        self.assertEqual(truncate("abcdef", limit=3), "abc... (6 characters)")
+
+    def test_message_is_rendered_lazily(self):
+        data = "x" * 1000
+        error = ErrorRecord("#/pattern", (), "String '{}' does not match pattern {}", (data, "^a"))
+
+        self.assertIs(error.values[0], data)
+        self.assertEqual(error.message, f"String '{'x' * 100}... (1000 characters)' does not match pattern ^a")
+
+    def test_render(self):
+        get_line = Mock(side_effect=lambda path_json: len(path_json))
+        detail = ErrorRecord("#/anyOf/0/minimum", ((), "a"), "Number ({}) is smaller than minimum ({})", (1, 2))
+        errors = [ErrorRecord("#/anyOf", ((), "a"), "Data does not match anyOf schemas", (), [detail])]
+
+        self.assertEqual(render_errors(errors, get_line), [{
+            "message": "Data does not match anyOf schemas",
+            "path": "#/anyOf",
+            "line": 2,
+            "details": [{"message": "Number (1) is smaller than minimum (2)", "path": "#/anyOf/0/minimum", "line": 2}]
+        }])
+        self.assertEqual(get_line.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
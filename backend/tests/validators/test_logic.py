@@ -1,178 +1,175 @@
 import unittest
-from unittest.mock import Mock, MagicMock
+from unittest.mock import patch
+from backend.app.dependencies import json_validator
+from backend.app.validators.base import Validator
 from backend.app.validators.logic import LogicValidator
-from backend.app.validators.main import JSONValidator
 
 class TestLogicValidator(unittest.TestCase):
     def setUp(self):
-        self.json_validator = Mock(spec=JSONValidator)
-        self.validator = LogicValidator(json_validator=self.json_validator)
-        self.validator.get_line = MagicMock(return_value=1)
-        
+        patcher = patch.object(Validator, "get_line", return_value=1)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.validator = json_validator.logic_validator
         self.path = "#"
         self.path_json = ""
         self.json_map = {}
-        self.data = "dummy_data"
 
     def test_allOf_valid(self):
         schema = {"allOf": [{"type": "string"}, {"minLength": 1}]}
-        self.json_validator.validate.side_effect = [
-            {"valid": True, "errors": []},
-            {"valid": True, "errors": []}
-        ]
 
-        result = self.validator.validate(self.data, schema, self.path, self.path_json, self.json_map)
+        result = self.validator.validate("dummy_data", schema, self.path, self.path_json, self.json_map)
         self.assertTrue(result["valid"])
         self.assertEqual(len(result["errors"]), 0)
 
     def test_allOf_invalid(self):
         schema = {"allOf": [{"type": "string"}, {"minLength": 1}]}
-        self.json_validator.validate.side_effect = [
-            {"valid": True, "errors": []},
-            {"valid": False, "errors": [{"message": "Error 2"}]}
-        ]
 
-        result = self.validator.validate(self.data, schema, self.path, self.path_json, self.json_map)
+        result = self.validator.validate("", schema, self.path, self.path_json, self.json_map)
         self.assertFalse(result["valid"])
         self.assertEqual(len(result["errors"]), 1)
-        self.assertEqual(result["errors"][0]["message"], "Error 2")
+        self.assertEqual(result["errors"][0]["message"], "String length (0) < minLength (1)")
+        self.assertEqual(result["errors"][0]["path"], self.path + "/allOf/1/minLength")
 
     def test_anyOf_valid(self):
         schema = {"anyOf": [{"type": "string"}, {"type": "integer"}]}
-        self.json_validator.validate.side_effect = [
-            {"valid": False, "errors": [{"message": "Not a string"}]},
-            {"valid": True, "errors": []}
-        ]
 
-        result = self.validator.validate(self.data, schema, self.path, self.path_json, self.json_map)
+        result = self.validator.validate(5, schema, self.path, self.path_json, self.json_map)
         self.assertTrue(result["valid"])
         self.assertEqual(len(result["errors"]), 0)
 
     def test_anyOf_invalid(self):
         schema = {"anyOf": [{"type": "string"}, {"type": "integer"}]}
-        self.json_validator.validate.side_effect = [
-            {"valid": False, "errors": [{"message": "Not a string"}]},
-            {"valid": False, "errors": [{"message": "Not an integer"}]}
-        ]
 
-        result = self.validator.validate(self.data, schema, self.path, self.path_json, self.json_map)
+        result = self.validator.validate(1.5, schema, self.path, self.path_json, self.json_map)
         self.assertFalse(result["valid"])
         self.assertEqual(len(result["errors"]), 1)
         self.assertIn("Data does not match anyOf schemas", result["errors"][0]["message"])
         self.assertEqual(result["errors"][0]["path"], self.path + "/anyOf")
+        self.assertEqual(len(result["errors"][0]["details"]), 2)
 
     def test_oneOf_valid(self):
         schema = {"oneOf": [{"type": "string"}, {"type": "integer"}]}
-        self.json_validator.validate.side_effect = [
-            {"valid": True, "errors": []},
-            {"valid": False, "errors": [{"message": "Not an integer"}]}
-        ]
 
-        result = self.validator.validate(self.data, schema, self.path, self.path_json, self.json_map)
+        result = self.validator.validate("dummy_data", schema, self.path, self.path_json, self.json_map)
         self.assertTrue(result["valid"])
         self.assertEqual(len(result["errors"]), 0)
 
     def test_oneOf_none_valid(self):
         schema = {"oneOf": [{"type": "string"}, {"type": "integer"}]}
-        self.json_validator.validate.side_effect = [
-            {"valid": False, "errors": []},
-            {"valid": False, "errors": []}
-        ]
 
-        result = self.validator.validate(self.data, schema, self.path, self.path_json, self.json_map)
+        result = self.validator.validate(1.5, schema, self.path, self.path_json, self.json_map)
         self.assertFalse(result["valid"])
         self.assertIn("Data does not match oneOf schemas", result["errors"][0]["message"])
         self.assertEqual(result["errors"][0]["path"], self.path + "/oneOf")
 
     def test_oneOf_multiple_valid(self):
         schema = {"oneOf": [{"type": "string"}, {"minLength": 1}]}
-        self.json_validator.validate.side_effect = [
-            {"valid": True, "errors": []},
-            {"valid": True, "errors": []}
-        ]
 
-        result = self.validator.validate(self.data, schema, self.path, self.path_json, self.json_map)
+        result = self.validator.validate("dummy_data", schema, self.path, self.path_json, self.json_map)
         self.assertFalse(result["valid"])
         self.assertIn("Data matches more than one oneOf schema", result["errors"][0]["message"])
         self.assertEqual(result["errors"][0]["path"], self.path + "/oneOf")
 
     def test_not_valid(self):
         schema = {"not": {"type": "string"}}
-        self.json_validator.validate.return_value = {"valid": False, "errors": [{"message": "Error"}]}
 
-        result = self.validator.validate(self.data, schema, self.path, self.path_json, self.json_map)
+        result = self.validator.validate(5, schema, self.path, self.path_json, self.json_map)
         self.assertTrue(result["valid"])
         self.assertEqual(len(result["errors"]), 0)
 
     def test_not_invalid(self):
         schema = {"not": {"type": "string"}}
-        self.json_validator.validate.return_value = {"valid": True, "errors": []}
 
-        result = self.validator.validate(self.data, schema, self.path, self.path_json, self.json_map)
+        result = self.validator.validate("dummy_data", schema, self.path, self.path_json, self.json_map)
         self.assertFalse(result["valid"])
         self.assertIn("Data matches not schema", result["errors"][0]["message"])
         self.assertEqual(result["errors"][0]["path"], self.path + "/not")
 
     def test_if_then_valid(self):
         schema = {
-            "if": {"const": "a"},
-            "then": {"const": "b"}
+            "if": {"type": "string"},
+            "then": {"minLength": 1}
         }
-        self.json_validator.validate.side_effect = [
-            {"valid": True, "errors": []},
-            {"valid": True, "errors": []}
-        ]
 
-        result = self.validator.validate(self.data, schema, self.path, self.path_json, self.json_map)
+        result = self.validator.validate("a", schema, self.path, self.path_json, self.json_map)
         self.assertTrue(result["valid"])
 
     def test_if_then_invalid(self):
         schema = {
-            "if": {"const": "a"},
-            "then": {"const": "b"}
+            "if": {"type": "string"},
+            "then": {"minLength": 1}
         }
-        self.json_validator.validate.side_effect = [
-            {"valid": True, "errors": []},
-            {"valid": False, "errors": [{"message": "Then failed"}]}
-        ]
 
-        result = self.validator.validate(self.data, schema, self.path, self.path_json, self.json_map)
+        result = self.validator.validate("", schema, self.path, self.path_json, self.json_map)
         self.assertFalse(result["valid"])
-        self.assertEqual(result["errors"][0]["message"], "Then failed")
+        self.assertEqual(result["errors"][0]["message"], "String length (0) < minLength (1)")
+        self.assertEqual(result["errors"][0]["path"], self.path + "/then/minLength")
 
     def test_if_else_valid(self):
         schema = {
-            "if": {"const": "a"},
-            "else": {"const": "c"}
+            "if": {"type": "string"},
+            "else": {"minimum": 0}
         }
-        self.json_validator.validate.side_effect = [
-            {"valid": False, "errors": []},
-            {"valid": True, "errors": []}
-        ]
 
-        result = self.validator.validate(self.data, schema, self.path, self.path_json, self.json_map)
+        result = self.validator.validate(5, schema, self.path, self.path_json, self.json_map)
         self.assertTrue(result["valid"])
 
     def test_if_else_invalid(self):
         schema = {
-            "if": {"const": "a"},
-            "else": {"const": "c"}
+            "if": {"type": "string"},
+            "else": {"minimum": 0}
         }
-        self.json_validator.validate.side_effect = [
-            {"valid": False, "errors": []},
-            {"valid": False, "errors": [{"message": "Else failed"}]}
-        ]
 
-        result = self.validator.validate(self.data, schema, self.path, self.path_json, self.json_map)
+        result = self.validator.validate(-1, schema, self.path, self.path_json, self.json_map)
         self.assertFalse(result["valid"])
-        self.assertEqual(result["errors"][0]["message"], "Else failed")
+        self.assertEqual(result["errors"][0]["message"], "Number (-1) is smaller than minimum (0)")
+        self.assertEqual(result["errors"][0]["path"], self.path + "/else/minimum")
 
     def test_if_false_no_else(self):
         schema = {"if": {"const": "a"}}
-        self.json_validator.validate.return_value = {"valid": False, "errors": []}
-        
-        result = self.validator.validate(self.data, schema, self.path, self.path_json, self.json_map)
+
+        result = self.validator.validate("b", schema, self.path, self.path_json, self.json_map)
         self.assertTrue(result["valid"])
 
+    def test_ref(self):
+        schema = {"$defs": {"positive": {"minimum": 0}}, "allOf": [{"$ref": "#/$defs/positive"}]}
+
+        result = self.validator.validate(-5, schema, self.path, self.path_json, self.json_map)
+        self.assertFalse(result["valid"])
+        self.assertEqual(result["errors"][0]["path"], self.path + "/$defs/positive/minimum")
+
+    def test_only_logic_keywords(self):
+        schema = {"type": "string", "minLength": 5, "not": {"const": "abc"}}
+
+        result = self.validator.validate("abc", schema, self.path, self.path_json, self.json_map)
+        self.assertEqual([error["path"] for error in result["errors"]], [self.path + "/not"])
+
+    def test_discriminator(self):
+        branches = [
+            {"properties": {"id": {"type": "integer"}, "kind": {"const": "a"}}},
+            {"properties": {"kind": {"enum": ["b", "c"]}}},
+            {"properties": {"kind": {"const": 1, "enum": [1, 2]}}}
+        ]
+        name, table = LogicValidator.discriminator(branches)
+        self.assertEqual(name, "kind")
+        self.assertEqual(LogicValidator.select_branch((name, table), {"kind": "c"}), 1)
+        self.assertEqual(LogicValidator.select_branch((name, table), {"kind": 1}), 2)
+        self.assertIsNone(LogicValidator.select_branch((name, table), {"kind": 2}))
+        self.assertIsNone(LogicValidator.select_branch((name, table), {"kind": True}))
+        self.assertIsNone(LogicValidator.select_branch((name, table), ["kind"]))
+
+    def test_no_discriminator(self):
+        self.assertIsNone(LogicValidator.discriminator([{"properties": {"kind": {"const": "a"}}}]))
+        self.assertIsNone(LogicValidator.discriminator([
+            {"properties": {"kind": {"const": "a"}}},
+            {"properties": {"kind": {"enum": ["a", "b"]}}}
+        ]))
+        self.assertIsNone(LogicValidator.discriminator([
+            {"properties": {"kind": {"const": "a"}}},
+            {"properties": {"kind": {"type": "string"}}}
+        ]))
+        self.assertIsNone(LogicValidator.discriminator([{"properties": {"kind": {"const": "a"}}}, True]))
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
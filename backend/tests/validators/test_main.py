@@ -1,102 +1,67 @@
 import unittest
-from unittest.mock import Mock
-from backend.app.validators.main import JSONValidator
+from unittest.mock import patch
+from backend.app.dependencies import json_validator
+from backend.app.validators.base import Validator
 
 class TestJSONValidator(unittest.TestCase):
     def setUp(self):
-        self.type_validator = Mock()
-        self.object_validator = Mock()
-        self.array_validator = Mock()
-        self.string_validator = Mock()
-        self.number_validator = Mock()
-        self.logic_validator = Mock()
-
-        self.validator = JSONValidator(
-            type_validator=self.type_validator,
-            object_validator=self.object_validator,
-            array_validator=self.array_validator,
-            string_validator=self.string_validator,
-            number_validator=self.number_validator,
-            logic_validator=self.logic_validator
-        )
-
-        self.type_validator.validate.return_value = {"valid": True, "errors": []}
-        self.object_validator.validate.return_value = {"valid": True, "errors": []}
-        self.array_validator.validate.return_value = {"valid": True, "errors": []}
-        self.string_validator.validate.return_value = {"valid": True, "errors": []}
-        self.number_validator.validate.return_value = {"valid": True, "errors": []}
-        self.logic_validator.validate.return_value = {"valid": True, "errors": []}
+        patcher = patch.object(Validator, "get_line", return_value=1)
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
+        self.validator = json_validator
         self.path = "#"
         self.path_json = ""
         self.json_map = {}
 
+    def paths(self, data, schema):
+        result = self.validator.validate(data, schema, self.path, self.path_json, self.json_map)
+        return [error["path"] for error in result["errors"]]
+
     def test_type_validation_failure_stops_execution(self):
-        self.type_validator.validate.return_value = {"valid": False, "errors": [{"message": "Type Error"}]}
-        
-        result = self.validator.validate({}, {}, self.path, self.path_json, self.json_map)
-        
-        self.assertFalse(result["valid"])
-        self.assertEqual(result["errors"][0]["message"], "Type Error")
+        result = self.validator.validate([], {"type": "object", "minItems": 1, "not": {}}, self.path, self.path_json,
+                                         self.json_map)
 
-        self.object_validator.validate.assert_not_called()
-        self.logic_validator.validate.assert_not_called()
+        self.assertFalse(result["valid"])
+        self.assertEqual(result["errors"][0]["message"], "Data does not match any of the allowed types")
+        self.assertEqual(len(result["errors"]), 1)
 
     def test_delegates_to_object_validator(self):
-        data = {"key": "value"}
-        self.validator.validate(data, {}, self.path, self.path_json, self.json_map)
-        
-        self.object_validator.validate.assert_called_once()
-        self.array_validator.validate.assert_not_called()
-        self.logic_validator.validate.assert_called_once()
+        self.assertEqual(self.paths({"key": "value"}, {"minProperties": 2, "minItems": 2}), ["#/minProperties"])
 
     def test_delegates_to_array_validator(self):
-        data = [1, 2]
-        self.validator.validate(data, {}, self.path, self.path_json, self.json_map)
-        
-        self.array_validator.validate.assert_called_once()
-        self.object_validator.validate.assert_not_called()
-        self.logic_validator.validate.assert_called_once()
+        self.assertEqual(self.paths([1, 2], {"minProperties": 3, "minItems": 3}), ["#/minItems"])
 
     def test_delegates_to_string_validator(self):
-        data = "test string"
-        self.validator.validate(data, {}, self.path, self.path_json, self.json_map)
-        
-        self.string_validator.validate.assert_called_once()
-        self.logic_validator.validate.assert_called_once()
+        self.assertEqual(self.paths("test string", {"minLength": 20, "minimum": 20}), ["#/minLength"])
 
     def test_delegates_to_number_validator(self):
-        data = 123
-        self.validator.validate(data, {}, self.path, self.path_json, self.json_map)
-        
-        self.number_validator.validate.assert_called_once()
-        self.logic_validator.validate.assert_called_once()
+        self.assertEqual(self.paths(123, {"minLength": 200, "minimum": 200}), ["#/minimum"])
 
     def test_boolean_does_not_trigger_number_validator(self):
-        data = True
-        self.validator.validate(data, {}, self.path, self.path_json, self.json_map)
-        
-        self.number_validator.validate.assert_not_called()
-        self.logic_validator.validate.assert_called_once()
+        self.assertEqual(self.paths(True, {"minimum": 5}), [])
 
     def test_aggregates_errors(self):
-        data = "bad string"
-        self.string_validator.validate.return_value = {
-            "valid": False, 
-            "errors": [{"message": "String Error"}]
-        }
-        self.logic_validator.validate.return_value = {
-            "valid": False, 
-            "errors": [{"message": "Logic Error"}]
-        }
+        result = self.validator.validate("bad string", {"minLength": 20, "not": {"type": "string"}}, self.path,
+                                         self.path_json, self.json_map)
 
-        result = self.validator.validate(data, {}, self.path, self.path_json, self.json_map)
-        
         self.assertFalse(result["valid"])
         self.assertEqual(len(result["errors"]), 2)
         messages = [e["message"] for e in result["errors"]]
-        self.assertIn("String Error", messages)
-        self.assertIn("Logic Error", messages)
+        self.assertIn("String length (10) < minLength (20)", messages)
+        self.assertIn("Data matches not schema", messages)
+
+    def test_ref(self):
+        schema = {"$defs": {"pos": {"minimum": 0}}, "properties": {"a": {"$ref": "#/$defs/pos"}}}
+        self.assertEqual(self.paths({"a": -5}, schema), ["#/$defs/pos/minimum"])
+        self.assertEqual(self.paths({"a": 5}, schema), [])
+
+    def test_modes(self):
+        schema = {"minLength": 20, "not": {"type": "string"}}
+        self.assertEqual(self.validator.validate("bad string", schema, self.path, self.path_json, self.json_map,
+                                                 mode="flag"), {"valid": False, "errors": []})
+        result = self.validator.validate("bad string", schema, self.path, self.path_json, self.json_map, max_errors=1)
+        self.assertEqual(len(result["errors"]), 1)
 
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
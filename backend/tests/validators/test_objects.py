@@ -1,16 +1,15 @@
 import unittest
-from unittest.mock import Mock, MagicMock
-from backend.app.validators.objects import ObjectValidator
-from backend.app.validators.main import JSONValidator
+from unittest.mock import patch
+from backend.app.dependencies import json_validator
+from backend.app.validators.base import Validator
 
 class TestObjectValidator(unittest.TestCase):
     def setUp(self):
-        self.json_validator = Mock(spec=JSONValidator)
-        self.json_validator.validate.return_value = {"valid": True, "errors": []}
+        patcher = patch.object(Validator, "get_line", return_value=1)
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
-        self.validator = ObjectValidator(json_validator=self.json_validator)
-        self.validator.get_line = MagicMock(return_value=1)
-        
+        self.validator = json_validator.object_validator
         self.path = "#"
         self.path_json = ""
         self.json_map = {}
@@ -65,17 +64,10 @@ class TestObjectValidator(unittest.TestCase):
         }
         data = {"age": "invalid"}
 
-        self.json_validator.validate.return_value = {
-            "valid": False, 
-            "errors": [{"message": "Type mismatch", "path": "#/properties/age"}]
-        }
-
         result = self.validator.validate(data, schema, self.path, self.path_json, self.json_map)
         self.assertFalse(result["valid"])
         self.assertEqual(len(result["errors"]), 1)
-        self.assertEqual(result["errors"][0]["message"], "Type mismatch")
-
-        self.json_validator.validate.assert_called()
+        self.assertEqual(result["errors"][0]["path"], "#/properties/age/type")
 
     def test_additional_properties_false(self):
         schema = {
@@ -95,12 +87,18 @@ class TestObjectValidator(unittest.TestCase):
         }
         data = {"extra": 123}
 
-        self.json_validator.validate.return_value = {"valid": False, "errors": [{"message": "Not a string"}]}
-
         result = self.validator.validate(data, schema, self.path, self.path_json, self.json_map)
         self.assertFalse(result["valid"])
         self.assertEqual(len(result["errors"]), 1)
-        self.assertEqual(result["errors"][0]["message"], "Not a string")
+        self.assertEqual(result["errors"][0]["message"], "Data does not match any of the allowed types")
+        self.assertEqual(result["errors"][0]["path"], self.path + "/additionalProperties/type")
+
+    def test_properties_ref(self):
+        schema = {"$defs": {"positive": {"minimum": 0}}, "properties": {"a": {"$ref": "#/$defs/positive"}}}
+
+        result = self.validator.validate({"a": -5}, schema, self.path, self.path_json, self.json_map)
+        self.assertFalse(result["valid"])
+        self.assertEqual(result["errors"][0]["path"], self.path + "/$defs/positive/minimum")
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
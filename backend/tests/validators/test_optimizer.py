@@ -0,0 +1,43 @@
+import unittest
+
+from backend.app.validators.optimizer import diagnose, flatten_all_of, is_trivial, is_unsatisfiable
+
+
+class TestOptimizer(unittest.TestCase):
+    def test_trivial(self):
+        for schema in ({}, {"title": "x", "$defs": {"a": {"type": "string"}}}, {"allOf": [{}, {"allOf": []}]}):
+            self.assertTrue(is_trivial(schema), schema)
+        for schema in ({"type": "string"}, {"required": []}, {"allOf": [{"minimum": 1}]}, {"$ref": "#"}, True):
+            self.assertFalse(is_trivial(schema), schema)
+
+    def test_unsatisfiable(self):
+        for schema in ({"enum": []}, {"type": []}, {"not": {}}, {"const": 1, "enum": [1.0]},
+                       {"type": "integer", "minimum": 3, "maximum": 1},
+                       {"type": ["integer", "number"], "exclusiveMinimum": 1, "maximum": 1},
+                       {"type": "string", "minLength": 2, "maxLength": 1},
+                       {"anyOf": [{"enum": []}, {"type": []}]}, {"oneOf": []}, {"allOf": [{}, {"not": {}}]}):
+            self.assertTrue(is_unsatisfiable(schema), schema)
+        for schema in ({}, {"minimum": 3, "maximum": 1}, {"type": ["integer", "string"], "minimum": 3, "maximum": 1},
+                       {"const": 1, "enum": [1, 2]}, {"anyOf": [{"enum": []}, {}]}, {"minimum": 1, "maximum": 1}):
+            self.assertFalse(is_unsatisfiable(schema), schema)
+
+    def test_diagnose(self):
+        self.assertEqual(diagnose({"minItems": 3, "maxItems": 2, "exclusiveMinimum": 2, "exclusiveMaximum": 2}), [
+            "minItems (3) is greater than maxItems (2)",
+            "exclusiveMinimum (2) and exclusiveMaximum (2) leave no valid number"
+        ])
+        self.assertEqual(diagnose({"enum": []}), ["enum is empty, no value can match"])
+        self.assertEqual(diagnose({"anyOf": [{"not": {}}]}), ["no value can match this schema"])
+        self.assertEqual(diagnose({"minimum": 1, "maximum": 2}), [])
+
+    def test_flatten_all_of_keeps_paths(self):
+        subschemas = [{"allOf": [{"minimum": 1}, {}, {"allOf": [{"maximum": 5}]}]}, {}, {"type": "integer"}]
+        self.assertEqual(list(flatten_all_of(subschemas, "#")), [
+            ({"minimum": 1}, "#/allOf/0/allOf/0"),
+            ({"maximum": 5}, "#/allOf/0/allOf/2/allOf/0"),
+            ({"type": "integer"}, "#/allOf/2")
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
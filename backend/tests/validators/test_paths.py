@@ -0,0 +1,27 @@
+import unittest
+
+from backend.app.validators.paths import ROOT, escape, from_pointer, segments, to_pointer, unescape
+
+
+class TestPaths(unittest.TestCase):
+    def test_escape(self):
+        self.assertEqual(escape("a/b~c"), "a~1b~0c")
+        self.assertEqual(escape(3), "3")
+        self.assertEqual(unescape("a~1b~0c"), "a/b~c")
+        self.assertEqual(unescape("~01"), "~1")
+
+    def test_segments(self):
+        path = (((ROOT, "items"), 2), "a/b")
+        self.assertEqual(segments(path), ["items", 2, "a/b"])
+        self.assertEqual(segments(ROOT), [])
+
+    def test_pointer_round_trip(self):
+        path = (((ROOT, "items"), 2), "a/b~")
+        self.assertEqual(to_pointer(path), "/items/2/a~1b~0")
+        self.assertEqual(to_pointer(ROOT), "")
+        self.assertEqual(segments(from_pointer("/items/2/a~1b~0")), ["items", "2", "a/b~"])
+        self.assertEqual(from_pointer(""), ROOT)
+
+
+if __name__ == "__main__":
+    unittest.main()
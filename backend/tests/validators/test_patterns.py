@@ -0,0 +1,38 @@
+import unittest
+
+from backend.app.validators.base import SchemaError
+from backend.app.validators.patterns import PatternRegistry
+
+
+class TestPatternRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = PatternRegistry(max_size=2)
+
+    def test_compiles_once(self):
+        first = self.registry.compile("^a+$", "#/pattern")
+        second = self.registry.compile("^a+$", "#/properties/x/pattern")
+
+        self.assertIs(first, second)
+        self.assertEqual(self.registry.stats()["compiles"], 1)
+        self.assertEqual(self.registry.stats()["hits"], 1)
+
+    def test_bounded(self):
+        for pattern in ("a", "b", "c", "a"):
+            self.registry.compile(pattern, "#/pattern")
+
+        stats = self.registry.stats()
+        self.assertEqual(stats["size"], 2)
+        self.assertEqual(stats["compiles"], 4)
+        self.assertEqual(stats["evictions"], 2)
+
+    def test_invalid_pattern(self):
+        with self.assertRaises(SchemaError) as context:
+            self.registry.compile("([a-z]", "#/properties/name/pattern")
+        self.assertIn("#/properties/name/pattern", str(context.exception))
+
+        with self.assertRaises(SchemaError):
+            self.registry.compile(["a"], "#/pattern")
+
+
+if __name__ == "__main__":
+    unittest.main()
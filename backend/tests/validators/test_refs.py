@@ -0,0 +1,99 @@
+import unittest
+from unittest.mock import patch
+
+from backend.app.dependencies import json_validator
+from backend.app.validators.base import SchemaError, Validator
+from backend.app.validators.refs import CompileSession
+from backend.app.validators.types import TypeValidator
+
+
+class TestRefs(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.object(Validator, "get_line", return_value=1)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.json_validator = json_validator
+        self.json_map = {}
+
+    def assertErrorPaths(self, compiled, data, paths):
+        for engine in ("recursive", "iterative"):
+            result = compiled.validate(data, self.json_map, engine=engine)
+            self.assertEqual([error["path"] for error in result["errors"]], paths)
+
+    def test_recursive_schema(self):
+        compiled = self.json_validator.compile({
+            "$defs": {"node": {
+                "required": ["value"],
+                "properties": {"value": {"type": "integer"}, "children": {"items": {"$ref": "#/$defs/node"}}}
+            }},
+            "$ref": "#/$defs/node"
+        })
+        data = {"value": 1, "children": [{"value": 2, "children": [{"value": "x"}]}, {"children": []}]}
+
+        self.assertErrorPaths(compiled, data, ["#/$defs/node/properties/value/type", "#/$defs/node/required"])
+        self.assertErrorPaths(compiled, {"value": 1, "children": [{"value": 2}]}, [])
+
+    def test_referenced_schema_is_compiled_once(self):
+        compile_keywords = TypeValidator.compile_keywords
+        with patch.object(TypeValidator, "compile_keywords", autospec=True, side_effect=compile_keywords) as spy:
+            compiled = self.json_validator.compile({
+                "definitions": {"id": {"type": "integer", "minimum": 1}},
+                "properties": {"a": {"$ref": "#/definitions/id"}, "b": {"$ref": "#/definitions/id"}}
+            })
+
+        paths = [call.args[2] for call in spy.call_args_list]
+        self.assertEqual(paths.count("#/definitions/id"), 1)
+        self.assertErrorPaths(compiled, {"a": 0, "b": "x"}, ["#/definitions/id/minimum", "#/definitions/id/type"])
+
+    def test_ref_next_to_other_keywords(self):
+        compiled = self.json_validator.compile({
+            "$defs": {"short": {"maxLength": 2}},
+            "type": "string",
+            "$ref": "#/$defs/short",
+            "pattern": "^a"
+        })
+        self.assertErrorPaths(compiled, "bcd", ["#/pattern", "#/$defs/short/maxLength"])
+
+    def test_escaped_pointers(self):
+        compiled = self.json_validator.compile({
+            "$defs": {"a/b": {"type": "string"}, "c d": {"type": "integer"}},
+            "items": {"$ref": "#/$defs/a~1b"},
+            "properties": {"x": {"$ref": "#/$defs/c%20d"}}
+        })
+        self.assertErrorPaths(compiled, [1], ["#/$defs/a~1b/type"])
+        self.assertErrorPaths(compiled, {"x": "1"}, ["#/$defs/c d/type"])
+
+    def test_invalid_refs(self):
+        for schema in ({"$ref": "#/$defs/missing"}, {"$ref": "other.json#/a"}, {"$ref": 1},
+                       {"$defs": {"a": 1}, "$ref": "#/$defs/a"}):
+            with self.assertRaises(SchemaError):
+                self.json_validator.compile(schema)
+
+    def test_circular_refs_without_descent(self):
+        for schema in ({"$ref": "#"},
+                       {"$defs": {"a": {"allOf": [{"$ref": "#/$defs/b"}]}, "b": {"not": {"$ref": "#/$defs/a"}}},
+                        "$ref": "#/$defs/a"},
+                       {"properties": {"a": {"$ref": "#"}}, "$ref": "#/properties/a"}):
+            with self.assertRaises(SchemaError):
+                self.json_validator.compile(schema)
+
+        compiled = self.json_validator.compile({"properties": {"a": {"$ref": "#"}}, "maxProperties": 1})
+        self.assertErrorPaths(compiled, {"a": {"a": {"a": 1, "b": 2}}}, ["#/maxProperties"])
+
+    def test_session_is_released_after_errors(self):
+        with self.assertRaises(SchemaError):
+            self.json_validator.compile({"$ref": "#/missing"})
+        self.assertTrue(self.json_validator.compile({"type": "integer"}).validate(1, self.json_map)["valid"])
+
+
+class TestCompileSession(unittest.TestCase):
+    def test_resolve(self):
+        session = CompileSession({"$defs": {"a~b": {"items": [{"type": "null"}]}}})
+        self.assertEqual(session.resolve("#/$defs/a~0b", "#/$ref"), ("#/$defs/a~0b", {"items": [{"type": "null"}]}))
+        self.assertEqual(session.resolve("#/$defs/a~0b/items/0", "#/$ref"), ("#/$defs/a~0b/items/0", {"type": "null"}))
+        self.assertEqual(session.resolve("#", "#/$ref")[0], "#")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,6 @@
 import unittest
 from unittest.mock import MagicMock
+from backend.app.validators.base import SchemaError
 from backend.app.validators.strings import StringValidator
 
 class TestStringValidator(unittest.TestCase):
@@ -69,5 +70,20 @@ class TestStringValidator(unittest.TestCase):
         self.assertIn("String length (3) < minLength (5)", messages)
         self.assertTrue(any("does not match pattern" in m for m in messages))
 
+    def test_pattern_statistics(self):
+        schema = {"pattern": r"^[a-z]+$"}
+        self.validator.validate("abc", schema, self.path, self.path_json, self.json_map)
+        self.validator.validate("ABC", schema, self.path, self.path_json, self.json_map)
+
+        stats = self.validator.pattern_registry.stats()
+        self.assertEqual(stats["compiles"], 1)
+        self.assertEqual(stats["searches"], 2)
+        self.assertEqual(stats["failures"], 1)
+
+    def test_invalid_pattern_rejected_before_validation(self):
+        with self.assertRaises(SchemaError):
+            self.validator.compile_keywords({"pattern": "(unclosed"}, self.path)
+
+
 if __name__ == "__main__":
     unittest.main()
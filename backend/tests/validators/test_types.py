@@ -55,5 +55,34 @@ class TestTypeValidator(unittest.TestCase):
         self.assertEqual(len(result["errors"]), 1)
         self.assertIn("Data does not match the const value", result["errors"][0]["message"])
 
+    def test_enum_is_type_strict(self):
+        schema = {"enum": [1, "1", None]}
+        for data in (1.0, True, "01", False):
+            result = self.validator.validate(data, schema, self.path, self.path_json, self.json_map)
+            self.assertFalse(result["valid"], data)
+        for data in (1, "1", None):
+            result = self.validator.validate(data, schema, self.path, self.path_json, self.json_map)
+            self.assertTrue(result["valid"], data)
+
+    def test_enum_with_objects_and_arrays(self):
+        schema = {"enum": [{"a": [1, {"b": 2}]}, [1, 2], "x"]}
+        self.assertTrue(self.validator.validate({"a": [1, {"b": 2}]}, schema, self.path, self.path_json, self.json_map)["valid"])
+        self.assertTrue(self.validator.validate([1, 2], schema, self.path, self.path_json, self.json_map)["valid"])
+        self.assertFalse(self.validator.validate([2, 1], schema, self.path, self.path_json, self.json_map)["valid"])
+        self.assertFalse(self.validator.validate({"a": [1]}, schema, self.path, self.path_json, self.json_map)["valid"])
+
+    def test_large_enum(self):
+        checks = self.validator.compile_keywords({"enum": [f"SKU-{i}" for i in range(10000)]}, self.path)
+        result = self.validator.run_checks(checks, "SKU-9999", self.path_json, self.json_map)
+        self.assertTrue(result["valid"])
+        result = self.validator.run_checks(checks, "SKU-10000", self.path_json, self.json_map)
+        self.assertFalse(result["valid"])
+
+    def test_const_is_type_strict(self):
+        schema = {"const": 0}
+        self.assertFalse(self.validator.validate(False, schema, self.path, self.path_json, self.json_map)["valid"])
+        self.assertFalse(self.validator.validate(0.0, schema, self.path, self.path_json, self.json_map)["valid"])
+        self.assertTrue(self.validator.validate(0, schema, self.path, self.path_json, self.json_map)["valid"])
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,50 @@
+import unittest
+from unittest.mock import patch
+
+from backend.app.validators import vectorized
+from backend.app.validators.vectorized import numeric_items_check
+
+
+class TestNumericItemsCheck(unittest.TestCase):
+    schema = {"type": "number", "minimum": 0, "exclusiveMaximum": 1, "multipleOf": 0.25}
+
+    def assertChecks(self, schema, valid, invalid):
+        for use_numpy in (True, False):
+            all_valid = numeric_items_check(schema, use_numpy)
+            with self.subTest(use_numpy=use_numpy):
+                for data in valid:
+                    self.assertTrue(all_valid(data), data[:3])
+                for data in invalid:
+                    self.assertFalse(all_valid(data), data[:3])
+
+    def test_only_numeric_schemas(self):
+        for schema in ({}, {"type": "string"}, {"type": ["number", "null"]}, {"minimum": 0, "minLength": 1},
+                       {"minimum": "0"}, {"multipleOf": 0}, {"items": {}}, {"minimum": True}):
+            self.assertIsNone(numeric_items_check(schema), schema)
+        self.assertIsNotNone(numeric_items_check({"minimum": 0}))
+
+    def test_bounds_and_multiple_of(self):
+        floats = [0.25 * (i % 4) for i in range(2000)]
+        self.assertChecks(self.schema, valid=[floats, floats[:20], [0, 0.5] * 10],
+                          invalid=[floats + [1.0], floats + [0.3], [-0.25] + floats, floats[:15]])
+
+    def test_types(self):
+        self.assertChecks({"type": "integer", "maximum": 2 ** 60}, valid=[list(range(100))],
+                          invalid=[list(range(99)) + [1.0], list(range(99)) + [True], list(range(99)) + [2 ** 60 + 1]])
+        self.assertChecks({"minimum": 0}, valid=[[0.5] * 2000, [1] * 20],
+                          invalid=[[0.5] * 1999 + [float("nan")], [0.5] * 19 + [float("inf")], [1] * 19 + ["a"]])
+
+    def test_unrepresentable_values_take_the_slow_path(self):
+        self.assertChecks({"type": "integer"}, valid=[[1] * 20], invalid=[[1] * 19 + [10 ** 400]])
+        self.assertChecks({"maximum": 2 ** 53 + 1}, valid=[], invalid=[[float(2 ** 53 + 2)] * 2000])
+        self.assertChecks({"type": "number"}, valid=[], invalid=[[1.7e308] * 20 + [10 ** 308]])
+
+    def test_without_numpy(self):
+        with patch.object(vectorized, "numpy", None):
+            all_valid = numeric_items_check(self.schema)
+            self.assertTrue(all_valid([0.5] * 2000))
+            self.assertFalse(all_valid([0.5] * 1999 + [0.6]))
+
+
+if __name__ == "__main__":
+    unittest.main()